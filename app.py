@@ -1,6 +1,6 @@
 import streamlit as st
 import asyncio
-from main import get_investment_report # Sadece bu fonksiyona ihtiyacımız var
+from main import stream_investment_report # Raporu akış halinde almak için
 
 # Streamlit'in asenkron fonksiyonlarla uyumlu çalışması için olay döngüsü ayarı
 # Bu, uygulamanın farklı ortamlarda sorunsuz çalışmasını sağlar.
@@ -34,37 +34,63 @@ with st.form(key='investment_form'):
     submit_button = st.form_submit_button(label='Analiz Et 🤖')
 
 
+def render_report(report: dict, final: bool = False):
+    """Raporu (kısmi veya tam) mevcut yer tutucuların içine çizer."""
+    placeholders["title"].subheader(f"Başlık: {report.get('title') or ('Başlık Bulunamadı' if final else '...')}")
+    if report.get("summary"):
+        placeholders["summary"].info(f"**Özet:** {report['summary']}")
+    if report.get("reasoning"):
+        with placeholders["reasoning"].container():
+            with st.expander("Detaylı Gerekçe ve Analiz Süreci", expanded=not final):
+                st.markdown(report["reasoning"])
+    if report.get("supports_section"):
+        with placeholders["supports_section"].container():
+            st.subheader("✅ Yararlanılabilecek Destek Unsurları")
+            st.markdown(report["supports_section"])
+    if report.get("conditions_section"):
+        with placeholders["conditions_section"].container():
+            st.subheader("📜 Özel Koşullar ve İstisnalar")
+            st.markdown(report["conditions_section"])
+
+
 async def run_analysis_and_store_report(query: str):
-    """Analiz sürecini çalıştırır ve sonucu session state'e kaydeder."""
-    with st.spinner('Analiz yapılıyor... Bu işlem 1-2 dakika sürebilir. Lütfen bekleyin.'):
-        # get_investment_report fonksiyonu bize bir sözlük (dictionary) döndürür.
-        report_data = await get_investment_report(query)
-        st.session_state.report = report_data
+    """Analizi akış halinde çalıştırır; ilerlemeyi ve rapor bölümlerini geldikçe gösterir."""
+    with progress_area.status("Analiz yapılıyor...", expanded=True) as status:
+        async for event in stream_investment_report(query):
+            if event["type"] == "node_start":
+                st.write(f"⏳ {event['label']}...")
+            elif event["type"] == "report_partial":
+                status.update(label="Rapor yazılıyor...")
+                render_report(event["report"])
+            elif event["type"] == "final":
+                st.session_state.report = event["report"]
+                status.update(label="Analiz tamamlandı.", state="complete", expanded=False)
+            elif event["type"] == "error":
+                st.session_state.report = {"error": event["error"]}
+                status.update(label="Analiz tamamlanamadı.", state="error")
+
 
+# --- Rapor Gösterim Alanı ---
+# Bölümler için yer tutucular: akış sırasında kısmi rapor, bittiğinde tam rapor bunların içine çizilir.
+progress_area = st.container()
+st.markdown("---")
+report_header = st.empty()
+placeholders = {section: st.empty() for section in ["title", "summary", "reasoning", "supports_section", "conditions_section"]}
 
 if submit_button and user_query:
     # 'Analiz Et' butonuna basıldığında asenkron analizi çalıştır
+    st.session_state.report = None
+    report_header.header("📈 Yatırım Teşvik Analiz Raporu")
     loop.run_until_complete(run_analysis_and_store_report(user_query))
-    
-# --- Rapor Gösterim Alanı ---
+
 # Analiz tamamlandıysa ve session state'de bir rapor varsa, onu ekrana yazdır.
 if st.session_state.report:
     report = st.session_state.report
-    st.markdown("---")
-    st.header("📈 Yatırım Teşvik Analiz Raporu")
-    st.markdown("---")
-
-    st.subheader(f"Başlık: {report.get('title', 'Başlık Bulunamadı')}")
-    st.info(f"**Özet:** {report.get('summary', 'Özet bulunamadı.')}")
-    
-    with st.expander("Detaylı Gerekçe ve Analiz Süreci"):
-        st.markdown(report.get('reasoning', 'Gerekçe detayı bulunamadı.'))
-
-    st.subheader("✅ Yararlanılabilecek Destek Unsurları")
-    st.markdown(report.get('supports_section', 'Destek unsurları bulunamadı.'))
-
-    st.subheader("📜 Özel Koşullar ve İstisnalar")
-    st.markdown(report.get('conditions_section', 'Özel koşul bulunamadı.'))
+    if report.get("error"):
+        st.error(report["error"])
+    else:
+        report_header.header("📈 Yatırım Teşvik Analiz Raporu")
+        render_report(report, final=True)
 
 
 # --- Yan Menü ---
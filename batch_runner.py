@@ -0,0 +1,233 @@
+# batch_runner.py
+"""
+Toplu analiz modu: Bir CSV/JSONL dosyasındaki (veya senaryo üreticisinden
+gelen) yatırım senaryolarını sınırlı eşzamanlılıkla çalıştırır ve her
+senaryonun nihai raporunu bir JSONL dosyasına yazar.
+
+- Her satır ya serbest bir `query` metni, ya da yapılandırılmış
+  `il`/`sektor`/`tutar`/`tarih` (veya `region`/`topic`/`amount`/`date`) alanları içerir.
+- Çıktı dosyası aynı zamanda kontrol noktasıdır: yeniden çalıştırıldığında,
+  başarıyla tamamlanmış `id`'ler atlanır ve kalanlardan devam edilir.
+- Rate limit (429) hatalarında üstel geri çekilme (backoff) ile yeniden denenir.
+  Düğümler bu hataları varsayılan yanıta düşürmeden grafik dışına iletir
+  (graph/core/llm.py), böylece eksik raporlar başarılı diye kaydedilmez.
+- Tüm senaryolar aynı süreçte çalıştığı için LLM, embedding ve vektör
+  veritabanı önbellekleri senaryolar arasında paylaşılır.
+
+Kullanım:
+    python batch_runner.py senaryolar.csv -o sonuclar.jsonl --concurrency 8
+    python batch_runner.py --generate 50 --seed 42 -o sonuclar.jsonl
+"""
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import os
+import random
+import time
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from langchain_community.callbacks import get_openai_callback
+
+from graph.core.instrumentation import percentile
+from graph.core.llm import is_rate_limit_error
+from main import get_investment_report
+from sunum_yardimcisi import senaryo_listesi, senaryo_sorusu
+
+MAX_RETRIES = 5
+BACKOFF_BASE_SECONDS = 2.0
+BACKOFF_MAX_SECONDS = 60.0
+
+
+def _first(row: Dict[str, Any], *keys: str) -> Any:
+    for key in keys:
+        value = row.get(key)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def _parse_date(value: Any) -> Optional[date]:
+    if value in (None, ""):
+        return None
+    if isinstance(value, date):
+        return value
+    for fmt in ("%Y-%m-%d", "%d.%m.%Y", "%d-%m-%Y"):
+        try:
+            return datetime.strptime(str(value).strip(), fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Tanınmayan tarih biçimi: {value!r}")
+
+
+def row_to_query(row: Dict[str, Any]) -> str:
+    """Bir senaryo satırını asistana sorulacak metne çevirir."""
+    query = _first(row, "query", "soru")
+    if query:
+        return str(query)
+
+    il = _first(row, "il", "region")
+    sektor = _first(row, "sektor", "topic")
+    tutar = _first(row, "tutar", "amount")
+    if not il or not sektor or tutar is None:
+        raise ValueError("Satırda 'query' veya 'il', 'sektor' ve 'tutar' alanları bulunmalıdır.")
+    return senaryo_sorusu(il, sektor, int(float(tutar)), _parse_date(_first(row, "tarih", "date")))
+
+
+def load_scenarios(path: str) -> List[Dict[str, Any]]:
+    """CSV veya JSONL dosyasındaki senaryoları, her birine bir `id` vererek okur."""
+    with open(path, "r", encoding="utf-8") as f:
+        if path.lower().endswith(".csv"):
+            rows = list(csv.DictReader(f))
+        else:
+            rows = [json.loads(line) for line in f if line.strip()]
+    for index, row in enumerate(rows):
+        row.setdefault("id", str(index))
+        row["id"] = str(row["id"])
+    return rows
+
+
+def generated_scenarios(count: int, seed: Optional[int]) -> List[Dict[str, Any]]:
+    """sunum_yardimcisi senaryo üreticisinden senaryo listesi oluşturur."""
+    return [
+        {"id": f"gen-{index}", "query": senaryo["soru"], "il": senaryo["il"], "sektor": senaryo["sektor"],
+         "tutar": senaryo["tutar"], "tarih": senaryo["tarih"].isoformat()}
+        for index, senaryo in enumerate(senaryo_listesi(count, seed=seed))
+    ]
+
+
+def completed_ids(output_path: str) -> set:
+    """Çıktı dosyasında başarıyla tamamlanmış senaryoların id'lerini döndürür."""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Çökme sırasında yarım yazılmış son satır olabilir.
+                continue
+            if record.get("status") == "ok":
+                done.add(str(record.get("id")))
+    return done
+
+
+async def run_scenario(row: Dict[str, Any], semaphore: asyncio.Semaphore, max_retries: int) -> Dict[str, Any]:
+    """Tek bir senaryoyu çalıştırır; rate limit hatalarında geri çekilerek yeniden dener."""
+    record: Dict[str, Any] = {"id": row["id"], "input": row}
+    try:
+        query = row_to_query(row)
+    except ValueError as e:
+        return {**record, "status": "error", "error": str(e), "attempts": 0}
+    record["query"] = query
+
+    async with semaphore:
+        for attempt in range(1, max_retries + 1):
+            start = time.perf_counter()
+            try:
+                # Token sayacı her görevin kendi context'inde tutulduğu için eşzamanlı görevler karışmaz.
+                with get_openai_callback() as usage:
+                    report = await get_investment_report(query)
+                latency = time.perf_counter() - start
+                tokens = {
+                    "prompt": usage.prompt_tokens,
+                    "completion": usage.completion_tokens,
+                    "total": usage.total_tokens,
+                    "cost_usd": usage.total_cost,
+                }
+                status = "error" if report.get("error") else "ok"
+                return {**record, "status": status, "report": report, "latency_s": latency,
+                        "tokens": tokens, "attempts": attempt, "error": report.get("error")}
+            except Exception as e:
+                if is_rate_limit_error(e) and attempt < max_retries:
+                    delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** (attempt - 1))
+                    delay *= random.uniform(0.5, 1.5)
+                    logging.warning(f"   > [{row['id']}] Rate limit; {delay:.1f} sn sonra tekrar denenecek (deneme {attempt}).")
+                    await asyncio.sleep(delay)
+                    continue
+                logging.error(f"   > [{row['id']}] Analiz başarısız: {e}")
+                return {**record, "status": "error", "error": str(e), "attempts": attempt,
+                        "latency_s": time.perf_counter() - start}
+    return {**record, "status": "error", "error": "Yeniden deneme sınırı aşıldı.", "attempts": max_retries}
+
+
+async def run_batch(rows: Iterable[Dict[str, Any]], output_path: str, concurrency: int,
+                    max_retries: int = MAX_RETRIES) -> Dict[str, Any]:
+    """Senaryoları çalıştırır, sonuçları geldikçe çıktı dosyasına ekler ve özet döndürür."""
+    done = completed_ids(output_path)
+    pending = [row for row in rows if row["id"] not in done]
+    if done:
+        print(f"Kontrol noktası: {len(done)} senaryo zaten tamamlanmış, {len(pending)} senaryo çalıştırılacak.")
+
+    semaphore = asyncio.Semaphore(concurrency)
+    results: List[Dict[str, Any]] = []
+    start = time.perf_counter()
+
+    with open(output_path, "a", encoding="utf-8") as out:
+        tasks = [asyncio.create_task(run_scenario(row, semaphore, max_retries)) for row in pending]
+        for finished, task in enumerate(asyncio.as_completed(tasks), 1):
+            result = await task
+            results.append(result)
+            out.write(json.dumps(result, ensure_ascii=False, default=str) + "\n")
+            # Çökme durumunda kaybolmaması için her sonuç hemen diske yazılır.
+            out.flush()
+            print(f"[{finished}/{len(pending)}] {result['id']}: {result['status']}")
+
+    wall = time.perf_counter() - start
+    latencies = [r["latency_s"] for r in results if r["status"] == "ok"]
+    tokens = [r.get("tokens") or {} for r in results]
+    return {
+        "scenarios": len(results),
+        "succeeded": len(latencies),
+        "failed": len(results) - len(latencies),
+        "skipped_from_checkpoint": len(done),
+        "wall_seconds": wall,
+        "throughput_per_minute": (len(results) / wall * 60) if wall else 0.0,
+        "latency_p50_s": percentile(latencies, 50),
+        "latency_p95_s": percentile(latencies, 95),
+        "prompt_tokens": sum(t.get("prompt", 0) for t in tokens),
+        "completion_tokens": sum(t.get("completion", 0) for t in tokens),
+        "total_tokens": sum(t.get("total", 0) for t in tokens),
+        "cost_usd": sum(t.get("cost_usd", 0.0) for t in tokens),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Yatırım senaryolarını toplu olarak analiz eder.")
+    parser.add_argument("input", nargs="?", help="Senaryo dosyası (.csv veya .jsonl).")
+    parser.add_argument("-o", "--output", default="batch_results.jsonl", help="Sonuçların yazılacağı JSONL dosyası (kontrol noktası).")
+    parser.add_argument("--concurrency", type=int, default=4, help="Aynı anda çalışacak analiz sayısı.")
+    parser.add_argument("--max-retries", type=int, default=MAX_RETRIES, help="Rate limit hatalarında en fazla deneme sayısı.")
+    parser.add_argument("--generate", type=int, help="Dosya yerine senaryo üreticisinden bu kadar senaryo kullan.")
+    parser.add_argument("--seed", type=int, help="Senaryo üreticisi için tohum değeri (tekrarlanabilir listeler).")
+    args = parser.parse_args()
+
+    if args.generate:
+        rows = generated_scenarios(args.generate, args.seed)
+    elif args.input:
+        rows = load_scenarios(args.input)
+    else:
+        parser.error("Bir senaryo dosyası veya --generate belirtilmelidir.")
+
+    if os.name == 'nt':
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    summary = asyncio.run(run_batch(rows, args.output, args.concurrency, args.max_retries))
+
+    print("\n" + "=" * 60)
+    print(" TOPLU ANALİZ ÖZETİ")
+    print("=" * 60)
+    print(f"Senaryo          : {summary['scenarios']} (başarılı {summary['succeeded']}, hatalı {summary['failed']}, "
+          f"kontrol noktasından atlanan {summary['skipped_from_checkpoint']})")
+    print(f"Süre             : {summary['wall_seconds']:.1f} sn")
+    print(f"Verim            : {summary['throughput_per_minute']:.2f} analiz/dk")
+    print(f"Gecikme p50 / p95: {summary['latency_p50_s']:.1f} sn / {summary['latency_p95_s']:.1f} sn")
+    print(f"Token            : {summary['total_tokens']:,} (prompt {summary['prompt_tokens']:,}, "
+          f"completion {summary['completion_tokens']:,}), tahmini maliyet ${summary['cost_usd']:.4f}")
+
+
+if __name__ == "__main__":
+    main()
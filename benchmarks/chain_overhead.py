@@ -0,0 +1,85 @@
+# benchmarks/chain_overhead.py
+"""
+Mikro benchmark: Bir analiz isteğinde düğümlerin zincirlerini elde etme
+maliyeti, zincir kaydıyla (graph/core/chain_registry.py) ve kayıt olmadan.
+
+"Kayıtsız" ölçümde her fabrika çağrısından önce kayıt boşaltılır; böylece
+her düğüm eskisi gibi yeni bir ChatOpenAI oluşturur, şemayı yeniden bağlar ve
+prompt'u yeniden zincirler. Ölçümler, düğümlerin çalıştığı gibi bir olay
+döngüsü içinde yapılır. Ağa hiç gidilmez; OPENAI_API_KEY tanımlı değilse
+sahte bir değer kullanılır (istemci oluşturmak için gereklidir).
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.chain_overhead --requests 50
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from typing import Callable, Dict, List
+
+
+def request_factories() -> List[Callable]:
+    """Bir analiz isteğinde (odaklanmış arama dahil) çağrılan zincir fabrikaları."""
+    from graph.chains.condition_analyzer import get_condition_analyzer_chain
+    from graph.chains.detail_extractor import get_detail_extractor_chain
+    from graph.chains.entity_extractor import get_entity_extractor_chain
+    from graph.chains.final_response_synthesizer import get_final_response_synthesizer_chain
+    from graph.chains.focused_query_generator import get_focused_query_generator_chain
+    from graph.chains.investment_type_analyzer import get_investment_type_analyzer_chain
+    from graph.chains.region_resolver import get_region_resolver_chain
+    from graph.chains.support_analyzer import get_support_analyzer_chain
+
+    return [
+        get_entity_extractor_chain, get_detail_extractor_chain, get_region_resolver_chain,
+        get_investment_type_analyzer_chain, get_focused_query_generator_chain,
+        get_condition_analyzer_chain, get_support_analyzer_chain, get_final_response_synthesizer_chain,
+    ]
+
+
+async def measure(requests: int, cached: bool) -> Dict[str, float]:
+    """İstek başına zincir edinme süresini (ms) ölçer."""
+    from graph.core.chain_registry import get_chain_registry
+
+    registry = get_chain_registry()
+    registry.clear()
+    factories = request_factories()
+    builds_before = registry.builds
+    durations = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        for factory in factories:
+            if not cached:
+                registry.clear()
+            factory()
+        durations.append((time.perf_counter() - start) * 1000)
+    return {
+        "mean_ms": statistics.mean(durations),
+        "median_ms": statistics.median(durations),
+        # İlk istek, kayıt dolarken ödenen tek seferlik maliyettir.
+        "first_ms": durations[0],
+        "builds": registry.builds - builds_before,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Zincir kaydının istek başına kazandırdığı süre.")
+    parser.add_argument("--requests", type=int, default=50, help="Simüle edilecek istek sayısı.")
+    args = parser.parse_args()
+
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+    async def run():
+        return await measure(args.requests, cached=False), await measure(args.requests, cached=True)
+
+    uncached, cached = asyncio.run(run())
+    print(f"{args.requests} istek, istek başına {len(request_factories())} zincir")
+    print("                      ort.(ms)   medyan(ms)   ilk(ms)   oluşturulan nesne")
+    for label, result in (("Kayıtsız", uncached), ("Kayıtlı", cached)):
+        print(f"{label:<20} {result['mean_ms']:>9.3f} {result['median_ms']:>12.3f} {result['first_ms']:>9.3f} {result['builds']:>12}")
+    print(f"\nİstek başına kazanç (medyan): {uncached['median_ms'] - cached['median_ms']:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# benchmarks/concurrency_benchmark.py
+"""
+Eşzamanlılık benchmark'ı: Aynı süreçte 1, 10 ve 100 analiz aynı anda
+çalıştırıldığında grafiğin verimini (analiz/saniye) ölçer.
+
+LLM ve vektör deposu yerine sabit gecikmeli yerel stub'lar kullanılır
+(bkz. benchmarks/fakes.py), böylece ölçüm OpenAI'a gitmeden yapılır.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.concurrency_benchmark --latency 0.5 --levels 1 10 100
+    python -m benchmarks.concurrency_benchmark --sync   # thread havuzlu senkron karşılaştırma
+"""
+import argparse
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from benchmarks.fakes import install_stubs
+
+DEFAULT_QUERY = "Bursa'da 50 milyon TL'lik bir tekstil fabrikası kurmak istiyorum, hangi teşviklerden yararlanabilirim?"
+CONFIG = {"recursion_limit": 50}
+
+
+async def run_async_level(app, concurrency: int) -> Dict[str, float]:
+    """`concurrency` adet analizi aynı olay döngüsünde `ainvoke` ile eşzamanlı çalıştırır."""
+    latencies: List[float] = []
+
+    async def one():
+        start = time.perf_counter()
+        await app.ainvoke({"query": DEFAULT_QUERY}, config=CONFIG)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(concurrency)))
+    return _summary(concurrency, time.perf_counter() - start, latencies)
+
+
+def run_sync_level(app, concurrency: int, max_workers: int) -> Dict[str, float]:
+    """Aynı yükü senkron `invoke` ile sınırlı bir thread havuzunda çalıştırır."""
+    latencies: List[float] = []
+
+    def one():
+        start = time.perf_counter()
+        app.invoke({"query": DEFAULT_QUERY}, config=CONFIG)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        list(pool.map(lambda _: one(), range(concurrency)))
+    return _summary(concurrency, time.perf_counter() - start, latencies)
+
+
+def _summary(concurrency: int, wall: float, latencies: List[float]) -> Dict[str, float]:
+    latencies = sorted(latencies)
+    return {
+        "concurrency": concurrency,
+        "wall_seconds": wall,
+        "throughput_per_second": concurrency / wall if wall else 0.0,
+        "mean_latency": sum(latencies) / len(latencies),
+        "max_latency": latencies[-1],
+    }
+
+
+def _print(label: str, result: Dict[str, float]) -> None:
+    print(
+        f"{label:>6} | eşzamanlı={result['concurrency']:>4} | süre={result['wall_seconds']:7.2f}s | "
+        f"verim={result['throughput_per_second']:7.2f} analiz/s | ort. gecikme={result['mean_latency']:6.2f}s | "
+        f"maks={result['max_latency']:6.2f}s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grafik eşzamanlılık benchmark'ı (yerel stub model ile).")
+    parser.add_argument("--latency", type=float, default=0.5, help="Stub LLM çağrısı başına gecikme (saniye).")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 10, 100], help="Ölçülecek eşzamanlılık seviyeleri.")
+    parser.add_argument("--sync", action="store_true", help="Senkron invoke + thread havuzu ile karşılaştırma da yap.")
+    parser.add_argument("--workers", type=int, default=8, help="Senkron karşılaştırmada thread havuzu boyutu.")
+    args = parser.parse_args()
+
+    # Düğüm logları ölçümü boğmasın
+    logging.disable(logging.INFO)
+
+    install_stubs(llm_latency=args.latency)
+    from graph.graph import create_graph
+    app = create_graph()
+
+    print(f"Stub LLM gecikmesi: {args.latency}s")
+    for level in args.levels:
+        _print("async", asyncio.run(run_async_level(app, level)))
+        if args.sync:
+            _print("sync", run_sync_level(app, level, args.workers))
+
+
+if __name__ == "__main__":
+    main()
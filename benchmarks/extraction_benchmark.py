@@ -0,0 +1,153 @@
+# benchmarks/extraction_benchmark.py
+"""
+Sorgu çıkarım aşamasının karşılaştırması: Birleşik tek çağrı (query_extractor)
+ile eski üç ayrı zincir (entity_extractor, detail_extractor, region_resolver).
+
+Her senaryo sorgusu için çıkarım aşaması iki modda da çalıştırılır
+("separate" modunda üç düğüm, grafikteki gibi paralel). Ölçülenler:
+- Modele gidiş-dönüş (round-trip) sayısı
+- Prompt ve yanıt token'ları
+- Aşamanın duvar saati gecikmesi
+
+Varsayılan olarak OpenAI'a gidilmez (bkz. benchmarks/fakes.py); token'lar,
+modele gönderilen metin ve fonksiyon şemasının uzunluğundan yaklaşık olarak
+(4 karakter ~ 1 token) hesaplanır. `--live` ile gerçek model çağrılır ve
+sayılar API'nin bildirdiği kullanımdan (graph/core/instrumentation.py) alınır.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.extraction_benchmark --scenarios 20
+    python -m benchmarks.extraction_benchmark --live --scenarios 5 -o cikarim.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+from typing import Any, Dict, List
+
+from sunum_yardimcisi import senaryo_listesi
+
+MODES = ("separate", "unified")
+# Tokenizer bağımlılığı olmadan kaba token tahmini.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, round(len(text) / CHARS_PER_TOKEN))
+
+
+def _schema_json(schema) -> str:
+    # RegionInfo pydantic v1, diğer şemalar v2 modelidir.
+    to_schema = getattr(schema, "model_json_schema", None) or schema.schema
+    return json.dumps(to_schema(), ensure_ascii=False)
+
+
+def _output_json(output) -> str:
+    return output.model_dump_json() if hasattr(output, "model_dump_json") else output.json()
+
+
+async def run_stage(mode: str, query: str) -> Dict[str, Any]:
+    """Çıkarım aşamasını verilen modda bir sorgu için çalıştırır; state güncellemesini döndürür."""
+    if mode == "unified":
+        from graph.nodes.query_extractor import aquery_extractor_node
+        return await aquery_extractor_node({"query": query})
+
+    from graph.nodes.detail_extractor import adetail_extractor_node
+    from graph.nodes.entity_extractor import aentity_extractor_node
+    from graph.nodes.region_resolver import aregion_resolver_node
+
+    state = {"query": query}
+    results = await asyncio.gather(aentity_extractor_node(state), adetail_extractor_node(state), aregion_resolver_node(state))
+    merged: Dict[str, Any] = {}
+    for result in results:
+        merged.update(result)
+    return merged
+
+
+async def measure_stub(mode: str, queries: List[str], model) -> Dict[str, List[float]]:
+    """Stub modelin çağrı kaydından gidiş-dönüş ve tahmini token sayılarını toplar."""
+    samples: Dict[str, List[float]] = {"round_trips": [], "prompt_tokens": [], "completion_tokens": [], "latency_ms": []}
+    for query in queries:
+        model.calls.clear()
+        start = time.perf_counter()
+        await run_stage(mode, query)
+        samples["latency_ms"].append((time.perf_counter() - start) * 1000)
+        samples["round_trips"].append(len(model.calls))
+        # Yapılandırılmış çıktıda şema, fonksiyon tanımı olarak her çağrıda prompt'a eklenir.
+        samples["prompt_tokens"].append(sum(
+            estimate_tokens(call["prompt"]) + estimate_tokens(_schema_json(call["schema"]))
+            for call in model.calls
+        ))
+        samples["completion_tokens"].append(sum(estimate_tokens(_output_json(call["output"])) for call in model.calls))
+    return samples
+
+
+async def measure_live(mode: str, queries: List[str]) -> Dict[str, List[float]]:
+    """Gerçek model çağrılarını istek izinden (API'nin bildirdiği kullanım) okur."""
+    from graph.core.instrumentation import trace_request
+
+    samples: Dict[str, List[float]] = {"round_trips": [], "prompt_tokens": [], "completion_tokens": [], "latency_ms": []}
+    for query in queries:
+        with trace_request(query) as trace:
+            start = time.perf_counter()
+            await run_stage(mode, query)
+            samples["latency_ms"].append((time.perf_counter() - start) * 1000)
+        record = trace.to_dict()
+        samples["round_trips"].append(record["llm_calls"])
+        samples["prompt_tokens"].append(record["prompt_tokens"])
+        samples["completion_tokens"].append(record["completion_tokens"])
+    return samples
+
+
+def summarize(samples: Dict[str, List[float]]) -> Dict[str, float]:
+    summary = {f"{name}_mean": statistics.mean(values) for name, values in samples.items() if values}
+    if samples["latency_ms"]:
+        summary["latency_ms_median"] = statistics.median(samples["latency_ms"])
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Birleşik ve ayrı sorgu çıkarımının karşılaştırması.")
+    parser.add_argument("--scenarios", type=int, default=20, help="Senaryo (sorgu) sayısı.")
+    parser.add_argument("--seed", type=int, default=42, help="Senaryo üretimi için seed.")
+    parser.add_argument("--latency", type=float, default=0.5, help="Stub LLM çağrısı başına gecikme (sn).")
+    parser.add_argument("--live", action="store_true", help="Stub yerine gerçek modeli çağır (OPENAI_API_KEY gerekir).")
+    parser.add_argument("-o", "--output", help="Sonuçların yazılacağı JSON dosyası.")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    queries = [senaryo["soru"] for senaryo in senaryo_listesi(args.scenarios, seed=args.seed)]
+
+    model = None
+    if not args.live:
+        from benchmarks.fakes import install_stubs
+        model = install_stubs(llm_latency=args.latency)
+
+    async def run():
+        results = {}
+        for mode in MODES:
+            samples = await (measure_live(mode, queries) if args.live else measure_stub(mode, queries, model))
+            results[mode] = summarize(samples)
+        return results
+
+    results = asyncio.run(run())
+    source = "gerçek model" if args.live else f"stub model, {args.latency:.2f} sn gecikme, tahmini token"
+    print(f"{len(queries)} sorgu ({source})")
+    print("              gidiş-dönüş   prompt tok.   yanıt tok.   gecikme ort.(ms)   medyan(ms)")
+    for mode in MODES:
+        r = results[mode]
+        print(f"{mode:<12} {r['round_trips_mean']:>12.2f} {r['prompt_tokens_mean']:>13.0f} {r['completion_tokens_mean']:>12.0f}"
+              f" {r['latency_ms_mean']:>18.1f} {r['latency_ms_median']:>12.1f}")
+    separate, unified = results["separate"], results["unified"]
+    print(f"\nİstek başına kazanç: {separate['round_trips_mean'] - unified['round_trips_mean']:.2f} gidiş-dönüş, "
+          f"{separate['prompt_tokens_mean'] - unified['prompt_tokens_mean']:.0f} prompt token'ı")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"queries": len(queries), "live": args.live, "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"\nSonuçlar '{args.output}' dosyasına yazıldı.")
+
+
+if __name__ == "__main__":
+    main()
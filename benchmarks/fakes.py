@@ -0,0 +1,244 @@
+# benchmarks/fakes.py
+"""
+Benchmark'lar için OpenAI'a hiç gitmeyen yerel yer tutucular (stub).
+
+- `StubChatModel`: Sabit bir gecikmeyle (ağ çağrısını taklit ederek) yanıt
+  veren sohbet modeli. `with_structured_output` ile bağlandığında zincirlerin
+  beklediği Pydantic şemalarına uygun, sabit nesneler döndürür.
+- `HashEmbeddings`: Kelimeleri özet (hash) ile sabit boyutlu vektörlere
+  dağıtan, deterministik ve ağ gerektirmeyen embedding modeli.
+- `StubVectorStore`: Benzerlik aramasına sabit dokümanlarla yanıt veren vektör deposu.
+- `build_temp_faiss_index()` / `build_temp_native_index()`: Mevzuat
+  dokümanlarından HashEmbeddings ile geçici bir eski biçimli FAISS veya yerel
+  biçimli index oluşturur (gerçek arama maliyetini ölçmek için).
+- `install_stubs()`: Bu yer tutucuları graph.chains modüllerine ve
+  paylaşılan vektör deposu yöneticisine yerleştirir.
+"""
+import asyncio
+import hashlib
+import importlib
+import json
+import math
+import re
+import time
+from typing import Any, Callable, Dict, List, Optional, Type
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import RunnableLambda
+
+# get_llm_client'ı kullanan zincir modülleri
+CHAIN_MODULES = [
+    "graph.chains.entity_extractor",
+    "graph.chains.detail_extractor",
+    "graph.chains.region_resolver",
+    "graph.chains.query_extractor",
+    "graph.chains.investment_type_analyzer",
+    "graph.chains.focused_query_generator",
+    "graph.chains.condition_analyzer",
+    "graph.chains.support_analyzer",
+    "graph.chains.final_response_synthesizer",
+]
+
+
+def _stub_payloads() -> Dict[str, Callable[[], Any]]:
+    """Şema adı -> şemaya uygun sabit nesne üreten fonksiyon."""
+    from graph.chains.condition_analyzer import ConditionItem, SpecialConditions
+    from graph.chains.detail_extractor import ExtractedDetails
+    from graph.chains.entity_extractor import ExtractedEntities
+    from graph.chains.final_response_synthesizer import FinalReport
+    from graph.chains.focused_query_generator import FocusedQuery
+    from graph.chains.investment_type_analyzer import InvestmentTypeAnalysis
+    from graph.chains.query_extractor import ExtractedQuery
+    from graph.chains.region_resolver import RegionInfo
+    from graph.chains.support_analyzer import SupportAnalysis, SupportItem
+
+    return {
+        "ExtractedEntities": lambda: ExtractedEntities(
+            investment_topic="tekstil fabrikası", investment_sector_code="13",
+            investment_region="Bursa", investment_amount=50_000_000,
+        ),
+        "ExtractedDetails": lambda: ExtractedDetails(reference_date=None, reasoning="Sorguda tarih belirtilmemiş."),
+        "RegionInfo": lambda: RegionInfo(il="Bursa", teşvik_bölgesi=2, reasoning="Bursa 2. bölgededir."),
+        "ExtractedQuery": lambda: ExtractedQuery(
+            investment_topic="tekstil fabrikası", investment_sector_code="13",
+            investment_region="Bursa", investment_amount=50_000_000,
+            reference_date=None, date_reasoning="Sorguda tarih belirtilmemiş.",
+            province="Bursa", region_number=1,
+        ),
+        "InvestmentTypeAnalysis": lambda: InvestmentTypeAnalysis(
+            investment_type="Bölgesel Teşvik", reasoning="Sektör bölgede desteklenmektedir.", legal_basis="EK-2A",
+        ),
+        "FocusedQuery": lambda: FocusedQuery(query="2. bölge bölgesel teşvik destek oranları ve süreleri tablosu"),
+        "SpecialConditions": lambda: SpecialConditions(
+            conditions=[ConditionItem(description="Asgari yatırım tutarı şartı.", legal_basis="Madde 10")],
+            reasoning="Bölgesel teşvik asgari tutar şartına tabidir.",
+        ),
+        "SupportAnalysis": lambda: SupportAnalysis(supports=[
+            SupportItem(support_name="KDV İstisnası", description="Makine ve teçhizat alımında KDV istisnası.", legal_basis="Madde 12"),
+            SupportItem(support_name="Vergi İndirimi", yatirima_katki_orani="%25", vergi_indirim_orani="%60",
+                        description="Kurumlar vergisi indirimi.", legal_basis="Madde 15"),
+        ]),
+        "FinalReport": lambda: FinalReport(
+            title="Bursa Tekstil Yatırımı Teşvik Analizi", summary="Yatırım bölgesel teşvikten yararlanabilir.",
+            reasoning="Stub rapor.", supports_section="KDV İstisnası, Vergi İndirimi.",
+            conditions_section="Asgari yatırım tutarı.", legal_references=["Madde 12", "Madde 15"],
+        ),
+    }
+
+
+class StubChatModel(BaseChatModel):
+    """Sabit gecikmeli, deterministik yanıt veren yerel sohbet modeli."""
+
+    latency: float = 0.5
+    # Yapılandırılmış çağrıların kaydı: şema adı, gönderilen prompt ve dönen nesne.
+    calls: List[Dict[str, Any]] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub-chat"
+
+    def _result(self) -> ChatResult:
+        # Serbest metin yanıtı bekleyen tek zincir odaklanmış sorgu üreticisidir.
+        content = json.dumps({"query": "bölgesel teşvik destek oranları ve süreleri"}, ensure_ascii=False)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self.latency)
+        return self._result()
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return self._result()
+
+    def with_structured_output(self, schema: Type, **kwargs: Any):
+        factory = _stub_payloads()[schema.__name__]
+        latency = self.latency
+        calls = self.calls
+
+        def _respond(_input):
+            output = factory()
+            prompt = _input.to_string() if hasattr(_input, "to_string") else str(_input)
+            calls.append({"schema": schema, "prompt": prompt, "output": output})
+            return output
+
+        def _invoke(_input):
+            time.sleep(latency)
+            return _respond(_input)
+
+        async def _ainvoke(_input):
+            await asyncio.sleep(latency)
+            return _respond(_input)
+
+        return RunnableLambda(_invoke, afunc=_ainvoke)
+
+
+class HashEmbeddings(Embeddings):
+    """
+    Her kelimeyi özetinden (blake2b) türetilen bir boyuta +/-1 olarak ekleyen
+    (feature hashing) embedding modeli. Aynı metin her zaman aynı vektörü
+    verir; ortak kelime içeren metinler birbirine yakın düşer.
+    """
+
+    def __init__(self, dimensions: int = 256):
+        self.dimensions = dimensions
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimensions
+        for word in re.findall(r"\w+", text.lower()):
+            digest = hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            vector[value % self.dimensions] += 1.0 if (value >> 63) & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+
+class StubVectorStore:
+    """Benzerlik aramasına sabit gecikme ve sabit dokümanlarla yanıt veren depo."""
+
+    def __init__(self, latency: float = 0.02, documents: Optional[List[Document]] = None):
+        self.latency = latency
+        self.documents = documents or [
+            Document(page_content=f"Bölgesel teşvik destek unsurları, madde {i}.",
+                     metadata={"source": "karar_2012_3305_son_versiyon.json", "detay": f"Madde {i}"})
+            for i in range(1, 11)
+        ]
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs) -> List[Document]:
+        time.sleep(self.latency)
+        return self.documents[:k]
+
+    async def asimilarity_search(self, query: str, k: int = 4, **kwargs) -> List[Document]:
+        await asyncio.sleep(self.latency)
+        return self.documents[:k]
+
+
+def build_temp_faiss_index(folder: str, embeddings: Optional[Embeddings] = None):
+    """
+    data/ klasöründeki tüm mevzuat parçalarından, verilen klasörde HashEmbeddings ile
+    bir FAISS index'i oluşturur ve yüklü vektör deposunu döndürür.
+    """
+    from langchain_community.vectorstores.faiss import FAISS
+    from vector_db_builder import DATA_PATH, iter_corpus_chunks
+
+    documents = list(iter_corpus_chunks(DATA_PATH))
+    store = FAISS.from_documents(documents, embeddings or HashEmbeddings())
+    store.save_local(folder)
+    return store
+
+
+def build_temp_native_index(folder: str, embeddings: Optional[Embeddings] = None):
+    """
+    data/ klasöründeki tüm mevzuat parçalarından, verilen klasörde HashEmbeddings ile
+    yerel biçimde (bkz. graph/native_index.py) bir index oluşturur ve yüklü depoyu döndürür.
+    """
+    from graph.native_index import NativeVectorStore, write_native_index
+    from vector_db_builder import DATA_PATH, iter_corpus_chunks
+
+    embeddings = embeddings or HashEmbeddings()
+    documents = list(iter_corpus_chunks(DATA_PATH))
+    vectors = embeddings.embed_documents([doc.page_content for doc in documents])
+    write_native_index(folder, documents, vectors, embedding_model="hash")
+    return NativeVectorStore(folder, embeddings)
+
+
+def install_stubs(llm_latency: float = 0.5, retrieval_latency: float = 0.02,
+                  faiss_folder: Optional[str] = None, native_folder: Optional[str] = None) -> StubChatModel:
+    """
+    Zincir modüllerindeki `get_llm_client` referanslarını stub modelle değiştirir
+    ve paylaşılan vektör deposu yöneticisine bir depo yerleştirir. `faiss_folder`
+    veya `native_folder` verilirse sabit stub yerine bu klasörde oluşturulan
+    gerçek bir index (HashEmbeddings ile) kullanılır.
+    """
+    import graph.vector_store as vector_store_module
+    from graph.core.chain_registry import get_chain_registry
+
+    model = StubChatModel(latency=llm_latency)
+    for module_name in CHAIN_MODULES:
+        module = importlib.import_module(module_name)
+        module.get_llm_client = lambda *args, **kwargs: model
+    # Stub'lardan önce oluşturulmuş (gerçek istemcili) zincirler kayıtta kalmasın.
+    get_chain_registry().clear()
+
+    manager = vector_store_module.vector_store_manager
+    if faiss_folder or native_folder:
+        embeddings = HashEmbeddings()
+        vector_store_module.get_embeddings = lambda: embeddings
+        if native_folder:
+            manager._store = build_temp_native_index(native_folder, embeddings)
+        else:
+            manager._store = build_temp_faiss_index(faiss_folder, embeddings)
+    else:
+        manager._store = StubVectorStore(latency=retrieval_latency)
+    # Diskteki gerçek index'in stub'ın yerine yüklenmesini engelle.
+    manager.check_interval = float("inf")
+    return model
@@ -0,0 +1,105 @@
+# benchmarks/import_report.py
+"""
+Soğuk başlangıç raporu: Bir modülün temiz bir Python sürecinde içe aktarılma
+süresini `python -X importtime` çıktısından paket paket döküm halinde verir.
+
+Ölçülenler (her biri ayrı, temiz bir alt süreçte):
+- `import main` süresi ve bu sürede yüklenen en pahalı üst düzey paketler
+- İlk `main.get_app()` çağrısının (grafik derlemesi ve ertelenmiş importlar) süresi
+- Kendi başına (alt modülleri hariç) en yavaş yüklenen modüller
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.import_report
+    python -m benchmarks.import_report --module graph.graph --top 15 -o import.json
+"""
+import argparse
+import json
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Any, Dict, List
+
+# İlk grafik derlemesini ölçen kod; süre stdout'un son satırına yazılır.
+FIRST_USE_CODE = (
+    "import time, {module} as m; s = time.perf_counter(); "
+    "m.get_app(); print(time.perf_counter() - s)"
+)
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """`-X importtime` satırlarını (modül, kendi süresi, kümülatif süre, derinlik) listesine çevirir."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        # Ayırıcıdan sonraki tek boşluğun ardından her derinlik seviyesi iki boşlukla girintilenir.
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append({"module": name.strip(), "self_ms": int(self_us) / 1000,
+                     "cumulative_ms": int(cumulative_us) / 1000, "depth": depth})
+    return rows
+
+
+def measure_import(module: str) -> Dict[str, Any]:
+    """Modülü temiz bir süreçte içe aktarır; toplam süreyi ve paket dökümünü döndürür."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"'{module}' içe aktarılamadı:\n{result.stderr.strip().splitlines()[-1]}")
+    rows = parse_importtime(result.stderr)
+
+    # Bir modülün alt içe aktarmaları, çıktıda kendisinden hemen önce ve bir seviye içeride yer alır.
+    end = max(i for i, row in enumerate(rows) if row["depth"] == 0 and row["module"] == module)
+    start = max((i for i, row in enumerate(rows[:end]) if row["depth"] == 0), default=-1) + 1
+    # Ölçülen modülün doğrudan içe aktardıkları, kök paketlerine göre toplanır.
+    by_package: Dict[str, float] = defaultdict(float)
+    for row in rows[start:end]:
+        if row["depth"] == 1:
+            by_package[row["module"].split(".")[0]] += row["cumulative_ms"]
+    rows = rows[start:end + 1]
+    return {
+        "module": module,
+        "total_ms": rows[-1]["cumulative_ms"],
+        "packages": dict(sorted(by_package.items(), key=lambda item: -item[1])),
+        "slowest_modules": sorted(rows, key=lambda row: -row["self_ms"]),
+    }
+
+
+def measure_first_use(module: str) -> float:
+    """`get_app()` ilk çağrısının süresi (ms); modül içe aktarıldıktan sonra ölçülür."""
+    result = subprocess.run([sys.executable, "-c", FIRST_USE_CODE.format(module=module)],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"'{module}.get_app()' çalıştırılamadı:\n{result.stderr.strip().splitlines()[-1]}")
+    return float(result.stdout.strip().splitlines()[-1]) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="İçe aktarma süresi (soğuk başlangıç) dökümü.")
+    parser.add_argument("--module", default="main", help="Ölçülecek modül (varsayılan: main).")
+    parser.add_argument("--top", type=int, default=10, help="Listelenecek paket/modül sayısı.")
+    parser.add_argument("-o", "--output", help="Sonuçların yazılacağı JSON dosyası.")
+    args = parser.parse_args()
+
+    report = measure_import(args.module)
+    print(f"import {args.module}: {report['total_ms']:.1f} ms")
+    print("\nPaket                          kümülatif(ms)")
+    for package, ms in list(report["packages"].items())[:args.top]:
+        print(f"{package:<30} {ms:>12.1f}")
+    print("\nModül (kendi süresi)                               ms")
+    for row in report["slowest_modules"][:args.top]:
+        print(f"{row['module']:<45} {row['self_ms']:>8.1f}")
+
+    if args.module == "main":
+        report["first_get_app_ms"] = measure_first_use(args.module)
+        print(f"\nİlk get_app() (grafik derlemesi + ertelenmiş importlar): {report['first_get_app_ms']:.1f} ms")
+
+    if args.output:
+        report["slowest_modules"] = report["slowest_modules"][:args.top]
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\nSonuçlar '{args.output}' dosyasına yazıldı.")
+
+
+if __name__ == "__main__":
+    main()
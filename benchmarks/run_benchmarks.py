@@ -0,0 +1,268 @@
+# benchmarks/run_benchmarks.py
+"""
+Çevrimdışı regresyon benchmark'ı: `create_graph()` ile oluşturulan tam
+uygulamayı, sabit bir senaryo kümesi üzerinde OpenAI'a hiç gitmeden çalıştırır.
+
+LLM yerine şemaya uygun sabit nesneler döndüren stub model, embedding yerine
+deterministik HashEmbeddings kullanılır (bkz. benchmarks/fakes.py). Böylece
+ölçülen süreler ağdan bağımsızdır ve iki commit arasında karşılaştırılabilir.
+
+Ölçülenler:
+- `import graph.graph` süresi (temiz bir alt süreçte) ve `create_graph()` süresi
+- Düğüm başına duvar saati süreleri (ortalama, p50, p95, toplam)
+- Uçtan uca analiz gecikmesi yüzdelikleri (p50, p90, p95, p99)
+- Bellek: tracemalloc tepe değeri ve sürecin maksimum RSS'i
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.run_benchmarks -o sonuc.json
+    python -m benchmarks.run_benchmarks --vector-store native --latency 0.01
+    python -m benchmarks.run_benchmarks -o yeni.json --compare onceki.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from benchmarks.fakes import install_stubs
+from graph.core.instrumentation import percentile
+from sunum_yardimcisi import senaryo_listesi
+
+CONFIG = {"recursion_limit": 50}
+# Karşılaştırmada bu orandan (yüzde) fazla kötüleşen metrikler işaretlenir.
+REGRESSION_THRESHOLD = 10.0
+
+
+class NodeTimer(BaseCallbackHandler):
+    """LangGraph düğümlerinin başlangıç/bitiş olaylarından düğüm başına süre toplar."""
+
+    # Olay döngüsünde thread havuzuna gönderilmeden çalışsın; zaman damgaları kaymasın.
+    run_inline = True
+
+    def __init__(self):
+        self._started: Dict[UUID, tuple] = {}
+        self.durations: Dict[str, List[float]] = defaultdict(list)
+
+    def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, **kwargs) -> None:
+        node = (metadata or {}).get("langgraph_node")
+        # Düğümün içindeki zincirler de aynı metadata'yı taşır; sadece düğümün kendisi sayılır.
+        if node and kwargs.get("name") == node:
+            self._started[run_id] = (node, time.perf_counter())
+
+    def _finish(self, run_id: UUID) -> None:
+        started = self._started.pop(run_id, None)
+        if started:
+            node, start = started
+            self.durations[node].append(time.perf_counter() - start)
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs) -> None:
+        self._finish(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs) -> None:
+        self._finish(run_id)
+
+
+def measure_import_time() -> float:
+    """`graph.graph` modülünün temiz bir Python sürecinde içe aktarılma süresi (saniye)."""
+    code = "import time; s = time.perf_counter(); import graph.graph; print(time.perf_counter() - s)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def max_rss_mb() -> Optional[float]:
+    """Sürecin maksimum yerleşik bellek (RSS) kullanımı; platform desteklemiyorsa None."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux'ta KB, macOS'ta bayt cinsindendir.
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_corpus(app, queries: List[str], concurrency: int) -> Dict[str, Any]:
+    """Senaryoları çalıştırır; uçtan uca gecikmeleri ve düğüm sürelerini döndürür."""
+    timer = NodeTimer()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one(query: str):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await app.ainvoke({"query": query}, config={**CONFIG, "callbacks": [timer]})
+            except Exception as e:
+                errors += 1
+                logging.error(f"   > Senaryo başarısız: {e}")
+                return
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(query) for query in queries))
+    wall = time.perf_counter() - start
+
+    return {
+        "wall_seconds": wall,
+        "errors": errors,
+        "e2e": {
+            "count": len(latencies),
+            "mean": sum(latencies) / len(latencies) if latencies else 0.0,
+            "p50": percentile(latencies, 50),
+            "p90": percentile(latencies, 90),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": max(latencies, default=0.0),
+        },
+        "nodes": {
+            node: {
+                "count": len(values),
+                "mean": sum(values) / len(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "total": sum(values),
+            }
+            for node, values in sorted(timer.durations.items())
+        },
+    }
+
+
+def run(args) -> Dict[str, Any]:
+    import_seconds = measure_import_time()
+
+    with tempfile.TemporaryDirectory() as index_folder:
+        tracemalloc.start()
+        install_stubs(llm_latency=args.latency, retrieval_latency=args.retrieval_latency,
+                      faiss_folder=index_folder if args.vector_store == "faiss" else None,
+                      native_folder=index_folder if args.vector_store == "native" else None)
+
+        from graph.graph import create_graph
+        start = time.perf_counter()
+        app = create_graph()
+        startup_seconds = time.perf_counter() - start
+
+        queries = [senaryo["soru"] for senaryo in senaryo_listesi(args.scenarios, seed=args.seed)]
+        results = asyncio.run(run_corpus(app, queries, args.concurrency))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scenarios": args.scenarios,
+            "seed": args.seed,
+            "concurrency": args.concurrency,
+            "llm_latency": args.latency,
+            "retrieval_latency": args.retrieval_latency,
+            "vector_store": args.vector_store,
+        },
+        "startup": {"import_seconds": import_seconds, "create_graph_seconds": startup_seconds},
+        "memory": {"tracemalloc_peak_mb": peak / (1024 * 1024), "max_rss_mb": max_rss_mb()},
+        **results,
+    }
+
+
+def _flatten(report: Dict[str, Any]) -> Dict[str, float]:
+    """Karşılaştırılacak sayısal metrikleri 'bölüm.alt.metrik' anahtarlarıyla düzleştirir."""
+    metrics = {}
+    for key, value in report.get("startup", {}).items():
+        metrics[f"startup.{key}"] = value
+    for key, value in report.get("memory", {}).items():
+        if value is not None:
+            metrics[f"memory.{key}"] = value
+    for key in ("mean", "p50", "p95", "p99"):
+        metrics[f"e2e.{key}"] = report.get("e2e", {}).get(key, 0.0)
+    for node, stats in report.get("nodes", {}).items():
+        metrics[f"nodes.{node}.mean"] = stats["mean"]
+    return metrics
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """İki benchmark sonucundaki ortak metriklerin farklarını döndürür (tüm metriklerde düşük = iyi)."""
+    before, after = _flatten(baseline), _flatten(current)
+    rows = []
+    for key in sorted(before.keys() & after.keys()):
+        old, new = before[key], after[key]
+        change = (new - old) / old * 100 if old else 0.0
+        rows.append({"metric": key, "baseline": old, "current": new, "change_pct": change,
+                     "regression": change > REGRESSION_THRESHOLD})
+    return rows
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    startup, memory, e2e = report["startup"], report["memory"], report["e2e"]
+    print(f"İçe aktarma       : {startup['import_seconds'] * 1000:8.1f} ms")
+    print(f"create_graph()    : {startup['create_graph_seconds'] * 1000:8.1f} ms")
+    print(f"Bellek (tepe)     : {memory['tracemalloc_peak_mb']:8.1f} MB tracemalloc"
+          + (f", {memory['max_rss_mb']:.1f} MB RSS" if memory["max_rss_mb"] is not None else ""))
+    print(f"Senaryo           : {e2e['count']} başarılı, {report['errors']} hatalı, {report['wall_seconds']:.2f} sn")
+    print(f"Uçtan uca gecikme : p50={e2e['p50']:.3f}s p90={e2e['p90']:.3f}s p95={e2e['p95']:.3f}s p99={e2e['p99']:.3f}s")
+    print("\nDüğüm                          adet    ort.(ms)   p95(ms)  toplam(s)")
+    for node, stats in report["nodes"].items():
+        print(f"{node:<30} {stats['count']:>5} {stats['mean'] * 1000:>10.2f} {stats['p95'] * 1000:>9.2f} {stats['total']:>10.2f}")
+
+
+def _print_comparison(rows: List[Dict[str, Any]]) -> None:
+    print("\nMetrik                                      önceki      şimdiki    değişim")
+    for row in rows:
+        flag = "  <-- KÖTÜLEŞME" if row["regression"] else ""
+        print(f"{row['metric']:<40} {row['baseline']:>10.4f} {row['current']:>12.4f} {row['change_pct']:>+9.1f}%{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Çevrimdışı (stub LLM + hash embedding) grafik benchmark'ı.")
+    parser.add_argument("-o", "--output", help="Sonuçların yazılacağı JSON dosyası.")
+    parser.add_argument("--compare", help="Karşılaştırılacak önceki bir benchmark JSON dosyası.")
+    parser.add_argument("--scenarios", type=int, default=20, help="Çalıştırılacak senaryo sayısı.")
+    parser.add_argument("--seed", type=int, default=42, help="Senaryo kümesinin tohum değeri (sabit küme için).")
+    parser.add_argument("--concurrency", type=int, default=1, help="Aynı anda çalışacak analiz sayısı.")
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub LLM çağrısı başına gecikme (saniye).")
+    parser.add_argument("--retrieval-latency", type=float, default=0.005, help="Stub vektör deposu gecikmesi (saniye).")
+    parser.add_argument("--vector-store", choices=["stub", "faiss", "native"], default="stub",
+                        help="'faiss'/'native': mevzuat metinlerinden HashEmbeddings ile geçici bir "
+                             "eski biçimli FAISS veya yerel biçimli index kurulur.")
+    args = parser.parse_args()
+
+    # Düğüm logları ölçümü boğmasın
+    logging.disable(logging.INFO)
+
+    report = run(args)
+    _print_report(report)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        report["comparison"] = {"baseline": args.compare, "rows": compare(baseline, report)}
+        _print_comparison(report["comparison"]["rows"])
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\nSonuçlar '{args.output}' dosyasına yazıldı.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# benchmarks/support_calculator_benchmark.py
+"""
+Mikro benchmark: Destek hesaplama motorunun (graph/support_calculator.py)
+tutar varyantı sayısına göre maliyeti.
+
+Aynı yatırım için N farklı tutar, `evaluate` ile tek bir dizi olarak ve
+tutar başına ayrı çağrılarla hesaplanır. Vektörel hesaplamada N=1000 için
+süre, N=1 süresine yakın kalmalıdır. Ağa veya modele gidilmez.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.support_calculator_benchmark --variants 1000
+"""
+import argparse
+import statistics
+import time
+from datetime import date
+
+import numpy as np
+
+
+def _median_ms(func, repeat: int) -> float:
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - start) * 1000)
+    return statistics.median(durations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Destek hesaplama motorunun vektörel ve döngüsel maliyeti.")
+    parser.add_argument("--variants", type=int, default=1000, help="Hesaplanacak tutar varyantı sayısı.")
+    parser.add_argument("--region", default="5", help="Teşvik bölgesi (1-6).")
+    parser.add_argument("--type", default="Bölgesel Teşvik", help="Yatırım türü.")
+    parser.add_argument("--repeat", type=int, default=20, help="Ölçüm tekrarı.")
+    args = parser.parse_args()
+
+    from graph.support_calculator import evaluate, plan_for
+
+    plan = plan_for(args.type, args.region, date.today())
+    if plan is None:
+        parser.error(f"'{args.type}' türü, '{args.region}' bölgesi için oran tablolarıyla hesaplanamıyor.")
+    amounts = np.linspace(1_000_000, 500_000_000, args.variants)
+
+    single = _median_ms(lambda: evaluate(amounts[:1], plan), args.repeat)
+    vectorized = _median_ms(lambda: evaluate(amounts, plan), args.repeat)
+    looped = _median_ms(lambda: [evaluate(amount, plan) for amount in amounts], max(1, args.repeat // 5))
+
+    print(f"{args.type}, {plan.support_region}. bölge, {args.variants} tutar varyantı")
+    print(f"1 tutar                     {single:>10.3f} ms")
+    print(f"{args.variants} tutar (vektörel)     {vectorized:>10.3f} ms  ({vectorized / single:.1f}x)")
+    print(f"{args.variants} tutar (döngü)        {looped:>10.3f} ms  ({looped / single:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
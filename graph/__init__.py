@@ -4,9 +4,18 @@ ve bu grafiği oluşturan tüm bileşenleri (düğümler, zincirler, durum) içe
 
 Bu paketin ana çıktısı, `create_graph` fonksiyonu tarafından oluşturulan
 derlenmiş LangGraph uygulamasıdır.
+
+`create_graph` ilk erişimde içe aktarılır: `graph.core.text` gibi hafif bir alt
+modülü kullanan kod, langgraph ve tüm zincir modüllerini yüklemek zorunda kalmaz.
 """
-from .graph import create_graph
 
 # Bu, dışarıdan `from graph import create_graph` şeklinde
 # kolayca erişim sağlanabilmesi için __all__ listesine eklenir.
 __all__ = ['create_graph']
+
+
+def __getattr__(name):
+    if name == "create_graph":
+        from .graph import create_graph
+        return create_graph
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
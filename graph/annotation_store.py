@@ -0,0 +1,181 @@
+# graph/annotation_store.py
+"""
+annotations.json'daki zamana bağlı mevzuat değişikliklerini bir kez yükleyip
+tarih ekseninde indeksleyen modül.
+
+Tüm kuralların `effective_date` ve `end_date` sınırları sıralı bir listeye
+konur; ardışık iki sınır arasındaki her aralık (elementer aralık) için o
+aralıkta yürürlükte olan kurallar ve henüz yürürlüğe girmemiş kuralların
+"geçmiş durum" direktifleri önceden hesaplanır. "D tarihinde hangi kurallar
+geçerli?" sorusu böylece tek bir `bisect` çağrısına iner.
+
+Dosya değiştiğinde (mtime/boyut) indeks bir sonraki sorguda yeniden oluşturulur.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+ANNOTATIONS_FILE = "annotations.json"
+# Dosyanın değişip değişmediği en fazla bu sıklıkta (saniye) kontrol edilir.
+RELOAD_CHECK_INTERVAL = 5.0
+# Dosyada hem YYYY-MM-DD hem DD-MM-YYYY biçimleri kullanılıyor. Son biçim,
+# ay/gün yeri karışmış kayıtlar (örn: '2013-30-05') için son çaredir.
+DATE_FORMATS = ("%Y-%m-%d", "%d-%m-%Y", "%d.%m.%Y", "%Y-%d-%m")
+
+
+class AnnotationRule(NamedTuple):
+    """annotations.json'daki tek bir mevzuat değişikliği."""
+    change_id: str
+    description: str
+    legal_source: str
+    effective_date: date
+    end_date: Optional[date]
+    directive: Optional[str]
+    past_state_directive: Optional[str]
+
+
+class DirectiveSet(NamedTuple):
+    """Belirli bir tarih aralığında geçerli olan kurallar."""
+    active: Tuple[AnnotationRule, ...]
+    # Henüz yürürlüğe girmemiş kurallar; bunlar için 'past_state_directive' uygulanır.
+    pending: Tuple[AnnotationRule, ...]
+
+
+def parse_annotation_date(value) -> Optional[date]:
+    """Desteklenen biçimlerden birindeki tarihi `date` nesnesine çevirir; boşsa None döner."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, date):
+        return value
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(str(value).strip(), fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Tanınmayan tarih biçimi: {value!r}")
+
+
+class AnnotationStore:
+    """annotations.json için tarih aralığı indeksli, kendini güncelleyen depo."""
+
+    def __init__(self, path: str = ANNOTATIONS_FILE, check_interval: float = RELOAD_CHECK_INTERVAL):
+        self.path = path
+        self.check_interval = check_interval
+        self.rules: Tuple[AnnotationRule, ...] = ()
+        self.error: Optional[str] = None
+        # (sıralı tarih sınırları, segmentler) çifti tek bir atama ile değiştirilir.
+        self._index: Tuple[List[date], List[DirectiveSet]] = ([], [DirectiveSet((), ())])
+        self._signature: Optional[Tuple[int, int]] = None
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+        self._refresh(force=True)
+
+    def _read_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _refresh(self, force: bool = False) -> None:
+        """Dosya değiştiyse indeksi yeniden oluşturur; başarısız olursa eski indeks korunur."""
+        now = time.monotonic()
+        if not force and now - self._last_check < self.check_interval:
+            return
+        with self._lock:
+            self._last_check = now
+            signature = self._read_signature()
+            if not force and signature == self._signature:
+                return
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    raw = json.load(f)
+                rules = self._parse_rules(raw)
+            except (FileNotFoundError, json.JSONDecodeError, TypeError) as e:
+                self.error = f"Annotations dosyası okunamadı: {e}"
+                logging.error(f"   > HATA: {self.error}")
+                self._signature = signature
+                return
+
+            self._index = self._build_index(rules)
+            self.rules = rules
+            self.error = None
+            self._signature = signature
+            logging.info(f"   > {len(rules)} zamansal kural yüklendi ({len(self._index[0])} tarih sınırı).")
+
+    @staticmethod
+    def _parse_rules(raw: List[Dict]) -> Tuple[AnnotationRule, ...]:
+        rules = []
+        for item in raw:
+            change_id = item.get("change_id", "N/A")
+            try:
+                effective_date = parse_annotation_date(item.get("effective_date"))
+                end_date = parse_annotation_date(item.get("end_date"))
+            except ValueError as e:
+                logging.warning(f"   > '{change_id}' kuralı atlandı: {e}")
+                continue
+            if effective_date is None:
+                logging.warning(f"   > '{change_id}' kuralının yürürlük tarihi yok, atlandı.")
+                continue
+            if end_date is not None and end_date < effective_date:
+                logging.warning(f"   > '{change_id}' kuralının bitiş tarihi yürürlük tarihinden önce, atlandı.")
+                continue
+            rules.append(AnnotationRule(
+                change_id=change_id,
+                description=item.get("description", ""),
+                legal_source=item.get("legal_source", "N/A"),
+                effective_date=effective_date,
+                end_date=end_date,
+                directive=item.get("directive"),
+                past_state_directive=item.get("past_state_directive"),
+            ))
+        rules.sort(key=lambda rule: (rule.effective_date, rule.change_id))
+        return tuple(rules)
+
+    @staticmethod
+    def _build_index(rules: Tuple[AnnotationRule, ...]) -> Tuple[List[date], List[DirectiveSet]]:
+        """Elementer aralıkları ve her aralıkta geçerli kural kümelerini hesaplar."""
+        boundaries = set()
+        for rule in rules:
+            boundaries.add(rule.effective_date)
+            if rule.end_date is not None:
+                # end_date dahil kabul edilir; kural ertesi gün düşer.
+                boundaries.add(rule.end_date + timedelta(days=1))
+        boundaries = sorted(boundaries)
+
+        # Segment i, [boundaries[i-1], boundaries[i]) aralığıdır; segment 0 ilk sınırdan öncesidir.
+        starts = [date.min] + boundaries
+        segments = []
+        for start in starts:
+            active = tuple(
+                rule for rule in rules
+                if rule.effective_date <= start and (rule.end_date is None or start <= rule.end_date)
+            )
+            pending = tuple(rule for rule in rules if rule.effective_date > start)
+            segments.append(DirectiveSet(active, pending))
+        return boundaries, segments
+
+    def rules_on(self, on_date: date) -> DirectiveSet:
+        """Verilen tarihte yürürlükte olan ve henüz yürürlüğe girmemiş kuralları döndürür."""
+        self._refresh()
+        boundaries, segments = self._index
+        return segments[bisect_right(boundaries, on_date)]
+
+
+_store: Optional[AnnotationStore] = None
+_lock = threading.Lock()
+
+
+def get_annotation_store() -> AnnotationStore:
+    """Süreç genelinde paylaşılan annotation deposunu döndürür."""
+    global _store
+    if _store is None:
+        with _lock:
+            if _store is None:
+                _store = AnnotationStore()
+    return _store
@@ -3,6 +3,7 @@ from langchain.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field, conlist
 from typing import List, Optional
+from graph.core.chain_registry import registered_chain
 from graph.core.llm import get_llm_client
 
 class ConditionItem(BaseModel):
@@ -54,6 +55,7 @@ Kullanıcı Sorgusu ve Çıkarılan Varlıklar: {entities}
     ]
 )
 
+@registered_chain
 def get_condition_analyzer_chain():
     """
     Özel koşul analiz zincirini oluşturur ve döndürür.
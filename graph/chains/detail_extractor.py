@@ -3,6 +3,7 @@ from langchain_core.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import date
+from graph.core.chain_registry import registered_chain
 from graph.core.llm import get_llm_client
 
 class ExtractedDetails(BaseModel):
@@ -39,6 +40,7 @@ Kullanıcı Sorgusu: {query}
     ]
 )
 
+@registered_chain
 def get_detail_extractor_chain():
     """
     Detay çıkarıcı zincirini oluşturur ve döndürür.
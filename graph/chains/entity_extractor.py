@@ -4,6 +4,7 @@ from langchain.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field, conint, confloat
 from typing import Optional
+from graph.core.chain_registry import registered_chain
 from graph.core.llm import get_llm_client
 
 class ExtractedEntities(BaseModel):
@@ -39,6 +40,7 @@ Bu bilgileri sağlanan JSON şemasına göre çıkar. Eğer bir bilgi mevcut de
     ]
 )
 
+@registered_chain
 def get_entity_extractor_chain():
     """
     Varlık çıkarma zincirini oluşturur ve döndürür.
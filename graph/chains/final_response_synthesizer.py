@@ -3,6 +3,7 @@ from langchain_core.output_parsers import PydanticOutputParser
 from langchain_core.pydantic_v1 import BaseModel, Field
 from typing import List
 
+from graph.core.chain_registry import registered_chain
 from graph.core.llm import get_llm_client
 
 prompt = ChatPromptTemplate.from_messages(
@@ -49,9 +50,12 @@ class FinalReport(BaseModel):
     legal_references: List[str] = Field(description="Analizde kullanılan tüm kanun, madde ve eklerin tam listesi.")
 
 
+@registered_chain
 def get_final_response_synthesizer_chain():
     """Nihai cevap oluşturma zincirini döndürür."""
-    llm = get_llm_client(temperature=0.7) # Daha yaratıcı ve akıcı bir metin için sıcaklığı biraz artır
+    # Daha yaratıcı ve akıcı bir metin için sıcaklığı biraz artır.
+    # Bu sıcaklıkta yanıtlar deterministik olmadığından yanıt önbelleği kullanılmaz.
+    llm = get_llm_client(temperature=0.7, use_cache=False)
     
     # LLM'i, Pydantic modeline uygun bir JSON çıktısı üretmesi için yapılandır.
     structured_llm = llm.with_structured_output(FinalReport, method="json_mode")
@@ -2,6 +2,7 @@ from langchain.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field
 
+from graph.core.chain_registry import registered_chain
 from graph.core.llm import get_llm_client
 
 # LLM istemcisini burada oluşturma, import sırasında hataya neden oluyor.
@@ -38,6 +39,7 @@ Formatlama Talimatları:
     ]
 ).partial(format_instructions=parser.get_format_instructions())
 
+@registered_chain
 def get_focused_query_generator_chain():
     """
     Spesifik arama sorguları üreten LangChain zincirini döndürür.
@@ -1,5 +1,6 @@
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.pydantic_v1 import BaseModel, Field
+from graph.core.chain_registry import registered_chain
 from graph.core.llm import get_llm_client
 
 class FocusedQuery(BaseModel):
@@ -37,6 +38,7 @@ Oluşturduğun sorguyu `query` alanına yaz.
     ]
 )
 
+@registered_chain
 def get_focused_retriever_chain():
     """
     Odaklanmış arama sorgusu oluşturan zinciri döndürür.
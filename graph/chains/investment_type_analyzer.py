@@ -4,6 +4,7 @@ from pydantic import BaseModel, Field
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import PydanticOutputParser
 from langchain_openai import ChatOpenAI
+from graph.core.chain_registry import registered_chain
 from graph.core.llm import get_llm_client
 
 class InvestmentTypeAnalysis(BaseModel):
@@ -67,6 +68,7 @@ prompt_template = ChatPromptTemplate.from_messages(
     ]
 )
 
+@registered_chain
 def get_investment_type_analyzer_chain():
     """
     Yatırım türü analiz zincirini oluşturur ve döndürür.
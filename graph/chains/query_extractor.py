@@ -0,0 +1,103 @@
+# graph/chains/query_extractor.py
+"""
+Birleşik sorgu çıkarımı: Varlıkları (entity_extractor), referans tarihini
+(detail_extractor) ve il/teşvik bölgesini (region_resolver) tek bir
+yapılandırılmış LLM çağrısıyla çıkarır.
+
+Üç ayrı zincir aynı kullanıcı sorgusunu üç kez modele gönderir. Birleşik
+şema, sonuçları mevcut state anahtarlarının beklediği nesnelere
+(`ExtractedEntities`, `ExtractedDetails`, `RegionInfo`) böler; böylece sonraki
+düğümler değişmez.
+"""
+from datetime import date
+from typing import Optional
+
+from langchain.prompts import ChatPromptTemplate
+from pydantic import BaseModel, Field, confloat, conint
+
+from graph.chains.detail_extractor import ExtractedDetails
+from graph.chains.entity_extractor import ExtractedEntities
+from graph.chains.region_resolver import RegionInfo
+from graph.core.chain_registry import registered_chain
+from graph.core.llm import get_llm_client
+
+
+class ExtractedQuery(BaseModel):
+    """Kullanıcı sorgusundan tek seferde çıkarılan varlıklar, tarih ve il bilgisi."""
+    investment_topic: Optional[str] = Field(
+        description="Yatırımın ana konusu veya sektörü (örn: 'tekstil fabrikası', 'büyükbaş hayvancılık', 'otel')."
+    )
+    investment_sector_code: Optional[str] = Field(
+        description="Yatırım konusuna karşılık gelen ve mevzuatta kullanılan sektör kodu/numarası. Örnek: 'Otel yatırımı' -> '50', 'Makine imalatı' -> '27', 'Gıda ürünleri imalatı' -> '10'."
+    )
+    investment_region: Optional[str] = Field(
+        description="Yatırımın yapılacağı il (şehir) veya özel bölge, sorguda geçtiği şekliyle (örn: 'Bursa', 'Trakya Serbest Bölgesi')."
+    )
+    investment_amount: Optional[confloat(ge=0)] = Field(
+        description="Yatırımın sayısal tutarı. Eğer belirtilmemişse boş bırak."
+    )
+    reference_date: Optional[date] = Field(
+        description="Sorguda belirtilen genel referans tarihi (YYYY-MM-DD). Gün yoksa ayın 1'i, ay yoksa Ocak kullanılır. Örn: 'Mayıs 2023' -> 2023-05-01. Tarih yoksa null."
+    )
+    date_reasoning: str = Field(
+        description="Tarihin sorgudan nasıl çıkarıldığını (veya neden çıkarılamadığını) açıklayan kısa gerekçe."
+    )
+    province: Optional[str] = Field(
+        description="Yatırım yerinin yazım hataları düzeltilmiş, standart il adı (örn: 'Istanbul' -> 'İstanbul', 'Antep' -> 'Gaziantep'). İl yoksa null."
+    )
+    region_number: Optional[conint(ge=1, le=6)] = Field(
+        description="İlin 2012/3305 sayılı Karar'a göre bulunduğu teşvik bölgesi (1-6 arası). Bilinmiyorsa null."
+    )
+
+    def to_entities(self) -> ExtractedEntities:
+        return ExtractedEntities(
+            investment_topic=self.investment_topic,
+            investment_sector_code=self.investment_sector_code,
+            investment_region=self.investment_region,
+            investment_amount=self.investment_amount,
+        )
+
+    def to_details(self) -> ExtractedDetails:
+        return ExtractedDetails(reference_date=self.reference_date, reasoning=self.date_reasoning)
+
+    def to_region_info(self) -> Optional[RegionInfo]:
+        """LLM'in il/bölge tespitini RegionInfo'ya çevirir; il bulunamadıysa None döner."""
+        if not self.province:
+            return None
+        return RegionInfo(
+            il=self.province,
+            teşvik_bölgesi=self.region_number,
+            reasoning=f"İl ve teşvik bölgesi, birleşik sorgu çıkarımında '{self.province}' olarak belirlendi.",
+        )
+
+
+prompt = ChatPromptTemplate.from_messages(
+    [
+        (
+            "system",
+            """
+Sen, yatırım teşvikleri hakkındaki kullanıcı sorgularından yapılandırılmış bilgi çıkaran, dikkatli bir hukuki metin analiz uzmanısın. Sorguyu bir kez okuyup aşağıdaki bilgilerin tamamını sağlanan JSON şemasına göre çıkar:
+
+1.  **Yatırım Konusu** (`investment_topic`): Sorguda bahsedilen ana yatırım faaliyeti (örn: 'tekstil', 'hayvancılık', 'otel', 'enerji santrali').
+2.  **Sektör Kodu** (`investment_sector_code`): Bu yatırım konusuna karşılık gelen mevzuat sektör kodu (örn: Otelcilik için '50', Gıda imalatı için '10').
+3.  **Yatırım Bölgesi** (`investment_region`): Yatırımın yapılacağı il (şehir), sorguda geçtiği şekliyle.
+4.  **Yatırım Tutarı** (`investment_amount`): Sorguda sayısal bir yatırım tutarı belirtilmişse bu sayı.
+5.  **Referans Tarihi** (`reference_date`, `date_reasoning`): Yatırımın planlandığı, başladığı veya belge alındığı tarihe dair ifadeyi (örn: "15 mayıs 2017'de başvurdum", "2023 mayısında tesis kurmak istiyorum", "2016 sonlarında") `YYYY-MM-DD` biçimine çevir. Gün yoksa ayın 1'ini, ay yoksa Ocak ayını kullan; sadece tek bir genel tarih çıkar. Çıkarımı `date_reasoning` alanında kısaca gerekçelendir.
+6.  **İl ve Teşvik Bölgesi** (`province`, `region_number`): İl adının yazım hatalarını düzelt ve ilin 2012/3305 sayılı Karar'a göre hangi teşvik bölgesinde (1'den 6'ya kadar) yer aldığını belirle.
+
+Bir bilgi sorguda yoksa o alanı boş (`null`) bırak. Asla tarih, tutar veya il uydurma.
+""",
+        ),
+        ("human", "{query}"),
+    ]
+)
+
+
+@registered_chain
+def get_query_extractor_chain():
+    """
+    Birleşik sorgu çıkarma zincirini oluşturur ve döndürür.
+    """
+    llm = get_llm_client(temperature=0)
+    structured_llm = llm.with_structured_output(ExtractedQuery)
+    return prompt | structured_llm
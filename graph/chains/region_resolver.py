@@ -3,6 +3,7 @@ from pydantic import BaseModel, Field
 from typing import Optional
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.pydantic_v1 import BaseModel, Field
+from graph.core.chain_registry import registered_chain
 from graph.core.llm import get_llm_client
 
 # İl -> Bölge Numarası haritası
@@ -22,7 +23,9 @@ CITY_ALIASES = {
     "Urfa": "Şanlıurfa",
     "Maraş": "Kahramanmaraş",
     "Afyon": "Afyonkarahisar",
-    "İçel": "Mersin"
+    "İçel": "Mersin",
+    "İzmit": "Kocaeli",
+    "Adapazarı": "Sakarya",
 }
 
 class RegionInfo(BaseModel):
@@ -46,34 +49,49 @@ prompt = ChatPromptTemplate.from_messages(
 def resolve_region_from_name(region_name: str) -> RegionInfo:
     """
     Verilen bir bölge adını (il) analiz eder, düzeltir ve teşvik bölge numarasını bulur.
-    Bu fonksiyon API çağrısı yapmaz.
+    Bu fonksiyon API çağrısı yapmaz; takma ad, Türkçe harf katlama ve yazım
+    hatası toleranslı eşleştirme için graph/region_matcher.py'yi kullanır.
     """
-    # Girdiyi standartlaştır: boşlukları temizle ve baş harfleri büyüt (örn: "  ANTEP " -> "Antep")
-    # Türkçe karakterler için case-insensitive eşleştirme yapmak karmaşık olduğundan title() kullanıyoruz.
-    standardized_name = region_name.strip().title()
+    # Döngüsel importu önlemek için yerel import
+    from graph.region_matcher import get_province_resolver
 
-    # Önce takma adlar sözlüğünde ara
-    corrected_name = CITY_ALIASES.get(standardized_name, standardized_name)
-    
-    # Bölge numarasını ana haritadan al
-    region_number = CITY_TO_REGION.get(corrected_name)
+    match = get_province_resolver().find_in_text(region_name)
 
-    if region_number:
-        reasoning = f"'{region_name}' girdisi, '{corrected_name}' olarak standartlaştırıldı ve mevzuat haritasında {region_number}. bölge olarak bulundu."
-        return RegionInfo(
-            corrected_name=corrected_name,
-            region_number=region_number,
-            reasoning=reasoning
-        )
+    if match and match.region_number:
+        reasoning = f"'{region_name}' girdisi, '{match.name}' olarak standartlaştırıldı ve mevzuat haritasında {match.region_number}. bölge olarak bulundu."
+        # Model alanları alias ile tanımlandığı için nesne alias adlarıyla oluşturulur.
+        return RegionInfo(il=match.name, teşvik_bölgesi=match.region_number, reasoning=reasoning)
     else:
         # Eşleşme bulunamazsa
         reasoning = f"'{region_name}' girdisi için teşvik bölgeleri haritasında bir eşleşme bulunamadı."
-        return RegionInfo(
-            corrected_name=region_name,
-            region_number=None,
-            reasoning=reasoning
-        )
+        return RegionInfo(il=region_name, teşvik_bölgesi=None, reasoning=reasoning)
+
+def resolve_region_from_query(query: str) -> Optional[RegionInfo]:
+    """
+    Sorgudaki il adını LLM'e gitmeden çözmeyi dener. Eşleşme yeterince
+    güvenilir değilse None döner. Hızlı yol sayaçlarını güncellemez; LLM
+    çağrısının gerçekten atlandığı yerde çağıran kaydeder.
+    """
+    from graph.region_matcher import CONFIDENCE_THRESHOLD, get_province_resolver
+
+    match = get_province_resolver().find_in_text(query)
+    if not match or not match.region_number or match.confidence < CONFIDENCE_THRESHOLD:
+        return None
+    return RegionInfo(
+        il=match.name,
+        teşvik_bölgesi=match.region_number,
+        reasoning=f"Sorgudaki '{match.token}' ifadesi, '{match.name}' iline eşleştirildi ({match.method}, güven {match.confidence:.2f})."
+    )
+
+def unknown_region_info() -> RegionInfo:
+    """İl adı bulunamadığında veya okunamadığında kullanılan varsayılan bölge bilgisi."""
+    return RegionInfo(
+        il="Bilinmiyor",
+        teşvik_bölgesi=None,
+        reasoning="Girdide il adı bulunamadığı veya okunamadığı için bölge çözümlenemedi."
+    )
 
+@registered_chain
 def get_region_resolver_chain():
     """Bölge çözümleyici zincirini döndürür."""
     llm = get_llm_client()
@@ -2,6 +2,7 @@ from langchain.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field, conlist
 from typing import List, Optional, Literal
+from graph.core.chain_registry import registered_chain
 from graph.core.llm import get_llm_client
 
 class SupportItem(BaseModel):
@@ -28,6 +29,10 @@ class SupportItem(BaseModel):
         default=None,
         description="Uygulanacak Kurumlar/Gelir Vergisi İndirim Oranı (örn: '%80'). Sadece 'Vergi İndirimi' desteği için bu alanı doldur."
     )
+    yatirima_katki_tutari: Optional[float] = Field(
+        default=None,
+        description="Yatırıma katkı tutarı (TL), yatırım tutarı x yatırıma katkı oranı. Hesaplama motoru doldurur; boş bırak."
+    )
 
     # --- Faiz Desteği için Özel Alanlar ---
     tl_kredi_faiz_destegi_puani: Optional[str] = Field(
@@ -42,12 +47,20 @@ class SupportItem(BaseModel):
         default=None,
         description="Faiz desteğinin parasal üst limiti (örn: '1.8 Milyon TL'). Sadece 'Faiz Desteği' için bu alanı doldur."
     )
+    faiz_destegi_ust_limiti_tl: Optional[float] = Field(
+        default=None,
+        description="Faiz desteği üst limitinin sayısal değeri (TL). Hesaplama motoru doldurur; boş bırak."
+    )
 
     # --- Sigorta Primi Desteği için Özel Alanlar ---
     sigorta_primi_destegi_suresi: Optional[str] = Field(
         default=None,
         description="Sigorta primi işveren hissesi desteğinin süresi (örn: '7 Yıl'). Sadece 'Sigorta Primi İşveren Hissesi Desteği' için bu alanı doldur."
     )
+    destek_suresi_yil: Optional[int] = Field(
+        default=None,
+        description="Süreli desteklerde (sigorta primi, gelir vergisi stopajı) destek süresi, yıl olarak. Hesaplama motoru doldurur; boş bırak."
+    )
 
     # --- Ortak Alanlar ---
     description: str = Field(
@@ -57,11 +70,23 @@ class SupportItem(BaseModel):
         description="Bu desteğin ve oranlarının dayandığı spesifik mevzuat maddesi, tablo referansı veya kural ID'si (örn: '2012/3305 sayılı Karar, EK-2A Tablosu, 5. Bölge Sütunu')."
     )
 
+class CashFlowYear(BaseModel):
+    """Destek unsurlarının bir yıl içinde yatırımcıya sağladığı tahmini tutarlar (TL)."""
+    year: int = Field(description="Yatırımın faaliyete geçmesinden itibaren yıl (1'den başlar).")
+    vergi_indirimi: float = Field(description="İndirimli vergi uygulamasıyla ödenmeyen vergi.")
+    faiz_destegi: float = Field(description="Bakanlıkça karşılanan kredi faizi.")
+    sigorta_primi_destegi: float = Field(description="Bakanlıkça karşılanan sigorta primi işveren hissesi.")
+    toplam: float = Field(description="Yılın toplam destek tutarı.")
+
 class SupportAnalysis(BaseModel):
     """Yatırım için uygun olan tüm destek unsurlarının detaylı listesi."""
     supports: Optional[List[SupportItem]] = Field(
         description="Belirlenen yatırım türü ve koşullara göre uygun bulunan tüm destek unsurlarının, tüm detaylarıyla birlikte listesi."
     )
+    cash_flow: Optional[List[CashFlowYear]] = Field(
+        default=None,
+        description="Yıllara göre tahmini destek nakit akışı. Hesaplama motoru doldurur; boş bırak."
+    )
 
 prompt = ChatPromptTemplate.from_messages(
     [
@@ -103,6 +128,7 @@ Bu liste kesindir ve asla aşılamaz.
     ]
 )
 
+@registered_chain
 def get_support_analyzer_chain():
     """
     Destek unsurları analiz zincirini oluşturur ve döndürür.
@@ -0,0 +1,224 @@
+# graph/context_packer.py
+"""
+Analiz zincirlerine gönderilen mevzuat metinlerini token bütçesine sığdıran
+bağlam paketleyici.
+
+Vektör aramasından dönen dokümanlar (karar maddeleri ve ekler) bazen birkaç
+KB uzunluğundadır ve aynı metin üç ayrı LLM çağrısına tam olarak gider.
+Paketleyici her zinciri için şunları yapar:
+
+1. Dokümanları paragraflara (pasajlara) böler; ana ve odaklanmış aramadan
+   gelen aynı metinleri tekilleştirir.
+2. Pasajları, zincirin amacını anlatan anahtar kelimeler ve sorgu
+   varlıklarıyla (konu, il, yatırım türü) BM25 ile puanlar.
+3. En ilgili pasajları zincirin token bütçesi dolana kadar seçer ve
+   dokümandaki özgün sıralarıyla, kaynak başlıklarıyla birlikte yazar.
+
+Pasajlara bölme ve paketlenmiş metin önbelleklenir; aynı istekte aynı
+doküman kümesi için bağlam bir kez oluşturulur.
+"""
+import hashlib
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from langchain_core.documents import Document
+
+from graph.core.text import tokenize, turkish_casefold
+
+# Türkçe mevzuat metninde bir token ortalama bu kadar karakterdir (kaba tahmin; tokenizer çağrısından kaçınmak için).
+CHARS_PER_TOKEN = 3.5
+# Zincir başına mevzuat bağlamı bütçesi (token)
+CHAIN_BUDGETS: Dict[str, int] = {
+    "investment_type": 2500,
+    "condition": 2500,
+    "support": 3500,
+}
+DEFAULT_BUDGET = 3000
+# Zincirin amacını tarif eden, pasaj puanlamasında sorguya eklenen kelimeler
+CHAIN_FOCUS_TERMS: Dict[str, str] = {
+    "investment_type": "genel bölgesel öncelikli stratejik büyük ölçekli yatırım teşvik sistemi kapsam "
+                       "teşvik edilmeyecek sektör asgari tutar bölge",
+    "condition": "şart koşul asgari kapasite tutar istihdam süre istisna kazanılmış hak başvuru "
+                 "tamamlama vize müracaat",
+    "support": "destek unsur KDV istisnası gümrük vergisi muafiyeti vergi indirimi yatırıma katkı oranı "
+               "sigorta primi işveren hissesi faiz desteği yatırım yeri tahsisi gelir vergisi stopajı süre oran",
+}
+# Bu uzunluğu (karakter) aşan paragraflar cümle sınırlarından bölünür.
+MAX_PASSAGE_CHARS = 1200
+# Bundan kısa ardışık paragraflar (tablo satırları, bent numaraları) tek pasajda birleştirilir.
+MIN_PASSAGE_CHARS = 400
+NO_DOCUMENTS_TEXT = "İlgili doküman bulunamadı."
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_PARAGRAPH_SPLIT = re.compile(r"\n\s*\n|\n(?=\s*(?:[a-zçğıöşü]\)|\(\d+\)|\d+[.)]\s))")
+_SENTENCE_SPLIT = re.compile(r"(?<=[.;:])\s+")
+
+
+class Passage(NamedTuple):
+    """Bir dokümanın puanlanabilir parçası."""
+    doc_index: int
+    position: int
+    text: str
+    tokens: Tuple[str, ...]
+
+
+def estimate_tokens(text: str) -> int:
+    """Metnin yaklaşık token sayısı."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def document_label(doc: Document) -> str:
+    """
+    Dokümanın madde/ek etiketini döndürür. vector_db_builder 'detay' anahtarını
+    yazar; eski index'lerdeki 'madde_ek' anahtarı da kabul edilir.
+    """
+    return doc.metadata.get("detay") or doc.metadata.get("madde_ek") or "Bilinmiyor"
+
+
+def document_header(doc: Document) -> str:
+    return f"Kaynak: {doc.metadata.get('source', 'Bilinmiyor')} - Madde/Ek: {document_label(doc)}"
+
+
+def _fingerprint(text: str) -> str:
+    return hashlib.sha1(" ".join(turkish_casefold(text).split()).encode("utf-8")).hexdigest()
+
+
+def unique_documents(*groups: Iterable[Document]) -> List[Document]:
+    """Birden fazla doküman listesini, içerik bazında tekrarsız birleştirir."""
+    seen = set()
+    result = []
+    for group in groups:
+        for doc in group or []:
+            key = doc.page_content.strip()
+            if key not in seen:
+                seen.add(key)
+                result.append(doc)
+    return result
+
+
+@lru_cache(maxsize=2048)
+def _split_passages(content: str) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+    """Doküman metnini paragraflara böler ve her birini tokenize eder (doküman başına bir kez)."""
+    pieces = []
+    for paragraph in _PARAGRAPH_SPLIT.split(content):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= MAX_PASSAGE_CHARS:
+            pieces.append(paragraph)
+            continue
+        current = ""
+        for sentence in _SENTENCE_SPLIT.split(paragraph):
+            if current and len(current) + len(sentence) + 1 > MAX_PASSAGE_CHARS:
+                pieces.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}".strip()
+        if current:
+            pieces.append(current)
+    merged: List[str] = []
+    for piece in pieces:
+        if merged and len(merged[-1]) < MIN_PASSAGE_CHARS and len(merged[-1]) + len(piece) + 2 <= MAX_PASSAGE_CHARS:
+            merged[-1] = f"{merged[-1]}\n\n{piece}"
+        else:
+            merged.append(piece)
+    return tuple((piece, tuple(tokenize(piece))) for piece in merged)
+
+
+def _score(passages: Sequence[Passage], query_terms: Sequence[str]) -> List[float]:
+    """Pasajları sorgu kelimelerine göre BM25 ile puanlar."""
+    if not passages:
+        return []
+    avg_length = sum(len(p.tokens) for p in passages) / len(passages) or 1.0
+    document_frequency = Counter(term for p in passages for term in set(p.tokens))
+    query = Counter(query_terms)
+    scores = []
+    for passage in passages:
+        frequencies = Counter(passage.tokens)
+        length_norm = BM25_K1 * (1 - BM25_B + BM25_B * len(passage.tokens) / avg_length)
+        score = 0.0
+        for term, weight in query.items():
+            tf = frequencies.get(term)
+            if not tf:
+                continue
+            df = document_frequency[term]
+            idf = math.log(1 + (len(passages) - df + 0.5) / (df + 0.5))
+            score += weight * idf * tf * (BM25_K1 + 1) / (tf + length_norm)
+        scores.append(score)
+    return scores
+
+
+@lru_cache(maxsize=256)
+def _pack(chain: str, documents: Tuple[Tuple[str, str], ...], query: str, budget: int) -> str:
+    # documents: (başlık, içerik) çiftleri; lru_cache için hashlenebilir biçimde.
+    passages = [
+        Passage(doc_index, position, text, tokens)
+        for doc_index, (_, content) in enumerate(documents)
+        for position, (text, tokens) in enumerate(_split_passages(content))
+    ]
+    # Farklı maddelerde birebir tekrar eden paragraflar (tablo başlıkları vb.) bir kez alınır.
+    seen, unique = set(), []
+    for passage in passages:
+        key = _fingerprint(passage.text)
+        if key not in seen:
+            seen.add(key)
+            unique.append(passage)
+
+    query_terms = tokenize(f"{CHAIN_FOCUS_TERMS.get(chain, '')} {query}")
+    scores = _score(unique, query_terms)
+    # Eşit puanlarda vektör aramasının sıralaması (önce gelen doküman) korunur.
+    ranked = sorted(range(len(unique)), key=lambda i: (-scores[i], unique[i].doc_index, unique[i].position))
+
+    remaining = budget
+    selected: List[Passage] = []
+    opened = set()
+    for i in ranked:
+        passage = unique[i]
+        # Bir dokümandan ilk pasaj seçildiğinde kaynak başlığının maliyeti de düşülür.
+        cost = estimate_tokens(passage.text)
+        if passage.doc_index not in opened:
+            cost += estimate_tokens(documents[passage.doc_index][0])
+        if cost <= remaining:
+            selected.append(passage)
+            opened.add(passage.doc_index)
+            remaining -= cost
+        elif not selected:
+            # Hiçbir pasaj sığmıyorsa en ilgili pasajın baş kısmı kırpılarak alınır.
+            limit = max(0, int((remaining - estimate_tokens(documents[passage.doc_index][0])) * CHARS_PER_TOKEN))
+            selected.append(passage._replace(text=passage.text[:limit].rstrip() + " [...]"))
+            break
+
+    by_document: Dict[int, List[Passage]] = {}
+    for passage in sorted(selected, key=lambda p: (p.doc_index, p.position)):
+        by_document.setdefault(passage.doc_index, []).append(passage)
+
+    sections = []
+    for doc_index, doc_passages in by_document.items():
+        header = documents[doc_index][0]
+        body = "\n\n".join(p.text for p in doc_passages)
+        sections.append(f"{header}\n\n{body}")
+    return "\n\n---\n\n".join(sections)
+
+
+def pack_documents(chain: str, *groups: Sequence[Document], query: str = "", budget: Optional[int] = None) -> str:
+    """
+    Doküman listelerini (örn: ana arama ve odaklanmış arama sonuçları)
+    tekilleştirip, `chain` zincirinin token bütçesine sığacak şekilde en ilgili
+    pasajları seçerek tek bir metne dönüştürür.
+    """
+    documents = unique_documents(*groups)
+    if not documents:
+        return NO_DOCUMENTS_TEXT
+    key = tuple((document_header(doc), doc.page_content) for doc in documents)
+    return _pack(chain, key, query or "", budget or CHAIN_BUDGETS.get(chain, DEFAULT_BUDGET))
+
+
+def entity_query(entities, *extra: Optional[str]) -> str:
+    """Pasaj puanlaması için varlıklardan (konu, il) ve ek ifadelerden sorgu metni oluşturur."""
+    parts = [getattr(entities, "investment_topic", None), getattr(entities, "investment_region", None), *extra]
+    return " ".join(str(part) for part in parts if part)
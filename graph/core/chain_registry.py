@@ -0,0 +1,98 @@
+# graph/core/chain_registry.py
+"""
+LLM istemcileri ve zincirler için süreç genelinde paylaşılan kayıt (registry).
+
+Düğümler her çalıştırmada `get_*_chain()` fabrikalarını çağırır. Kayıt
+olmadan her çağrı yeni bir ChatOpenAI nesnesi oluşturur, şemayı
+`with_structured_output` ile yeniden bağlar ve prompt'u yeniden zincirler.
+Kayıt, her nesneyi anahtarı başına (LLM için model/sıcaklık/önbellek, zincir
+için fabrikanın kendisi, yani model/sıcaklık/şema) bir kez oluşturur.
+
+Asenkron HTTP istemcisi olay döngüsüne bağlı olduğundan (bkz. graph/core/llm.py),
+bir olay döngüsü içinde oluşturulan nesneler o döngüye özel tutulur; döngü
+kapanıp çöp toplandığında onlar da bırakılır. Döngü dışında (senkron)
+oluşturulanlar ayrı ve kalıcı bir tabloda tutulur.
+"""
+import asyncio
+import functools
+import threading
+import weakref
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class ChainRegistry:
+    """Anahtar -> nesne önbelleği; olay döngüsü içinde oluşturulanlar döngü başına tutulur."""
+
+    def __init__(self):
+        self._sync: Dict[Hashable, Any] = {}
+        self._per_loop: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, Any]]" = weakref.WeakKeyDictionary()
+        self._lock = threading.RLock()
+        self.builds = 0
+        self.hits = 0
+
+    def _table(self) -> Dict[Hashable, Any]:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return self._sync
+        with self._lock:
+            table = self._per_loop.get(loop)
+            if table is None:
+                table = self._per_loop[loop] = {}
+            return table
+
+    def get_or_build(self, key: Hashable, builder: Callable[[], Any]) -> Any:
+        """`key` için kayıtlı nesneyi döndürür; yoksa `builder()` ile bir kez oluşturur."""
+        table = self._table()
+        value = table.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+        # RLock: Zincir fabrikası içinde get_llm_client da kayda başvurur.
+        with self._lock:
+            value = table.get(key)
+            if value is None:
+                value = builder()
+                table[key] = value
+                self.builds += 1
+            else:
+                self.hits += 1
+            return value
+
+    def clear(self) -> None:
+        """Tüm kayıtlı nesneleri bırakır (örn: benchmark stub'ları yerleştirildikten sonra)."""
+        with self._lock:
+            self._sync.clear()
+            self._per_loop.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"builds": self.builds, "hits": self.hits}
+
+
+_registry: Optional[ChainRegistry] = None
+_lock = threading.Lock()
+
+
+def get_chain_registry() -> ChainRegistry:
+    """Süreç genelinde paylaşılan zincir kaydını döndürür."""
+    global _registry
+    if _registry is None:
+        with _lock:
+            if _registry is None:
+                _registry = ChainRegistry()
+    return _registry
+
+
+def registered_chain(factory: Callable[[], Any]) -> Callable[[], Any]:
+    """
+    Parametresiz bir zincir fabrikasını, sonucunu kayıtta saklayan bir
+    fonksiyonla sarar. Kayıt dışı (her seferinde yeni) bir zincir için
+    `factory.__wrapped__()` çağrılabilir.
+    """
+    key = ("chain", factory.__module__, factory.__qualname__)
+
+    @functools.wraps(factory)
+    def wrapper():
+        return get_chain_registry().get_or_build(key, factory)
+
+    return wrapper
@@ -0,0 +1,253 @@
+# graph/core/embedding_cache.py
+"""
+Sorgu ve doküman embedding'leri için iki katmanlı, kalıcı önbellek.
+
+- 1. katman: Süreç içi LRU (OrderedDict), en sık kullanılan vektörler.
+- 2. katman: Diskte SQLite; vektörler float32 BLOB olarak saklanır ve
+  süreçler/yeniden başlatmalar arasında paylaşılır.
+
+Anahtar, model adı ile normalize edilmiş metnin özetidir. Böylece aynı
+konu/bölge çiftleri tekrar tekrar ağ çağrısına gitmez ve index yeniden
+oluşturulurken sadece değişen dokümanlar embed edilir.
+"""
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+from langchain_core.embeddings import Embeddings
+
+from graph.core.instrumentation import record_cache_hit
+
+# Sabitler
+EMBEDDING_CACHE_PATH = os.path.join("cache", "embeddings.sqlite3")
+MEMORY_CACHE_SIZE = 4096
+MAX_DISK_ENTRIES = 200_000
+
+
+def normalize_text(text: str) -> str:
+    """Metni önbellek anahtarı için normalize eder (Unicode NFC + tek boşluk)."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def make_cache_key(model: str, text: str) -> str:
+    """Model adı ve normalize edilmiş metinden önbellek anahtarı üretir."""
+    return hashlib.sha256(f"{model}\x00{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Bellek içi LRU katmanı ve SQLite disk katmanından oluşan embedding önbelleği."""
+
+    def __init__(self, db_path: str = EMBEDDING_CACHE_PATH,
+                 memory_size: int = MEMORY_CACHE_SIZE,
+                 max_disk_entries: int = MAX_DISK_ENTRIES):
+        self.db_path = db_path
+        self.memory_size = memory_size
+        self.max_disk_entries = max_disk_entries
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key TEXT PRIMARY KEY, model TEXT NOT NULL, vector BLOB NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_access ON embeddings(last_access)")
+        self._conn.commit()
+        self._disk_count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[List[float]]]:
+        """Anahtarlara karşılık gelen vektörleri döndürür; bulunamayanlar None olur."""
+        results: List[Optional[List[float]]] = [None] * len(keys)
+        with self._lock:
+            disk_lookup: Dict[str, List[int]] = {}
+            for i, key in enumerate(keys):
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    results[i] = vector
+                else:
+                    disk_lookup.setdefault(key, []).append(i)
+
+            if disk_lookup:
+                found = {}
+                lookup_keys = list(disk_lookup)
+                # SQLite parametre limitine takılmamak için parçalar halinde sorgula
+                for start in range(0, len(lookup_keys), 500):
+                    chunk = lookup_keys[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = self._conn.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                    ).fetchall()
+                    for key, blob in rows:
+                        found[key] = array("f", blob).tolist()
+
+                if found:
+                    now = time.time()
+                    self._conn.executemany(
+                        "UPDATE embeddings SET last_access = ? WHERE key = ?",
+                        [(now, key) for key in found],
+                    )
+                    self._conn.commit()
+
+                for key, positions in disk_lookup.items():
+                    vector = found.get(key)
+                    if vector is None:
+                        self.misses += len(positions)
+                        continue
+                    self.disk_hits += len(positions)
+                    self._remember(key, vector)
+                    for i in positions:
+                        results[i] = vector
+        return results
+
+    def put_many(self, model: str, keys: Sequence[str], vectors: Sequence[List[float]]) -> None:
+        """Vektörleri her iki katmana yazar ve disk sınırı aşıldıysa en eski kayıtları siler."""
+        if not keys:
+            return
+        now = time.time()
+        with self._lock:
+            rows = []
+            for key, vector in zip(keys, vectors):
+                vector = list(vector)
+                self._remember(key, vector)
+                rows.append((key, model, array("f", vector).tobytes(), now))
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, vector, last_access) VALUES (?, ?, ?, ?)", rows
+            )
+            self._conn.commit()
+            self._disk_count += self._conn.total_changes - before
+            if self._disk_count > self.max_disk_entries:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Disk katmanını, en uzun süredir kullanılmayan kayıtları silerek sınır içinde tutar."""
+        self._disk_count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        overflow = self._disk_count - self.max_disk_entries
+        if overflow <= 0:
+            return
+        self._conn.execute(
+            "DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings ORDER BY last_access LIMIT ?)",
+            (overflow,),
+        )
+        self._conn.commit()
+        self._disk_count -= overflow
+        logging.info(f"   > Embedding önbelleğinden {overflow} eski kayıt silindi.")
+
+    def stats(self) -> Dict[str, int]:
+        """İsabet/ıska sayaçlarını ve katman doluluklarını döndürür."""
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "memory_entries": len(self._memory),
+            "disk_entries": self._disk_count,
+        }
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Herhangi bir LangChain embedding modelini önbellek katmanıyla saran sınıf.
+    Sadece önbellekte bulunamayan metinler alttaki modele (tek bir toplu çağrı ile) gönderilir.
+    """
+
+    def __init__(self, underlying: Embeddings, cache: EmbeddingCache, model_name: Optional[str] = None):
+        self.underlying = underlying
+        self.cache = cache
+        self.model_name = model_name or getattr(underlying, "model", None) or type(underlying).__name__
+
+    def _split(self, texts: List[str]):
+        keys = [make_cache_key(self.model_name, text) for text in texts]
+        vectors = self.cache.get_many(keys)
+        # Listede aynı metin birden fazla kez geçiyorsa modele sadece bir kez gönder
+        missing: Dict[str, List[int]] = {}
+        for i, vector in enumerate(vectors):
+            if vector is None:
+                missing.setdefault(keys[i], []).append(i)
+        record_cache_hit("embedding", sum(vector is not None for vector in vectors))
+        return keys, vectors, [positions[0] for positions in missing.values()], missing
+
+    def _fill(self, vectors, missing, new_vectors) -> List[List[float]]:
+        self.cache.put_many(self.model_name, list(missing), new_vectors)
+        for positions, vector in zip(missing.values(), new_vectors):
+            for i in positions:
+                vectors[i] = list(vector)
+        return vectors
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        _, vectors, to_embed, missing = self._split(texts)
+        if missing:
+            logging.info(f"   > {len(texts)} metnin {len(to_embed)} tanesi için embedding hesaplanıyor (diğerleri önbellekten).")
+            new_vectors = self.underlying.embed_documents([texts[i] for i in to_embed])
+            vectors = self._fill(vectors, missing, new_vectors)
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        _, vectors, _, missing = self._split([text])
+        if missing:
+            vectors = self._fill(vectors, missing, [self.underlying.embed_query(text)])
+        return vectors[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        _, vectors, to_embed, missing = self._split(texts)
+        if missing:
+            new_vectors = await self.underlying.aembed_documents([texts[i] for i in to_embed])
+            vectors = self._fill(vectors, missing, new_vectors)
+        return vectors
+
+    async def aembed_query(self, text: str) -> List[float]:
+        _, vectors, _, missing = self._split([text])
+        if missing:
+            vectors = self._fill(vectors, missing, [await self.underlying.aembed_query(text)])
+        return vectors[0]
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+_embeddings: Optional[CachedEmbeddings] = None
+_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Süreç genelinde paylaşılan embedding önbelleğini döndürür."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        with _lock:
+            if _embedding_cache is None:
+                _embedding_cache = EmbeddingCache()
+    return _embedding_cache
+
+
+def get_embeddings() -> CachedEmbeddings:
+    """
+    Tüm süreç boyunca paylaşılan, önbellekli embedding modelini döndürür.
+    Hem retriever düğümleri hem de vektör veritabanı oluşturucu bunu kullanır.
+    """
+    global _embeddings
+    if _embeddings is None:
+        cache = get_embedding_cache()
+        with _lock:
+            if _embeddings is None:
+                from langchain_openai import OpenAIEmbeddings
+                _embeddings = CachedEmbeddings(OpenAIEmbeddings(), cache)
+    return _embeddings
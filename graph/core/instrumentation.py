@@ -0,0 +1,446 @@
+# graph/core/instrumentation.py
+"""
+Grafik düğümleri için yapılandırılmış ölçüm (instrumentation) katmanı.
+
+Her analiz isteği bir `RequestTrace` içinde çalışır (`trace_request()`).
+İz, bir ContextVar üzerinden düğümlere, LLM çağrılarına ve HTTP isteklerine
+taşınır; LangGraph'ın paralel dallar için açtığı görevler ve thread'ler
+context'i kopyaladığı için hepsi aynı ize yazar. Düğüm başına toplananlar:
+
+- Duvar saati süresi, hata, döndürülen doküman sayısı (`instrument_node`)
+- LLM çağrı sayısı, prompt/completion token'ları ve tahmini maliyet (`TraceCallbackHandler`)
+- HTTP istek ve yeniden deneme sayısı (httpx olay kancaları, `record_http_response`)
+- Önbellek isabetleri: LLM yanıtı, embedding, yerel bölge çözümü (`record_cache_hit`)
+
+İstek bittiğinde iz `logs/traces.jsonl` dosyasına tek satır olarak yazılır ve
+süreç geneli toplamlara eklenir. Toplamlar Prometheus metin biçiminde
+`logs/metrics.prom` dosyasına yazılır; `METRICS_PORT` ortam değişkeni
+verilirse yerel bir HTTP uç noktasından da (`/metrics`) sunulur.
+"""
+import json
+import logging
+import math
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.runnables import RunnableLambda
+from langchain_core.tracers.context import register_configure_hook
+
+# Sabitler
+TRACES_PATH = os.path.join("logs", "traces.jsonl")
+METRICS_TEXTFILE_PATH = os.path.join("logs", "metrics.prom")
+# İz kaydında sorgunun en fazla bu kadar karakteri saklanır.
+MAX_QUERY_CHARS = 300
+# OpenAI istemcisinin yeniden denediği HTTP durum kodları
+RETRIABLE_STATUS_CODES = {408, 409, 429}
+# 1M token başına (prompt, completion) USD fiyatları
+MODEL_PRICES = {
+    "gpt-4-turbo": (10.0, 30.0),
+    "gpt-4o": (2.5, 10.0),
+    "gpt-4o-mini": (0.15, 0.6),
+    "gpt-3.5-turbo": (0.5, 1.5),
+}
+# Uçtan uca gecikme histogramının kova sınırları (saniye)
+LATENCY_BUCKETS = (5, 10, 20, 30, 45, 60, 90, 120, 180, 300)
+
+
+def _model_price(model: Optional[str]):
+    if not model:
+        return None
+    # Tarihli model adları ('gpt-4o-2024-08-06') en uzun ön eke göre eşleştirilir.
+    for name in sorted(MODEL_PRICES, key=len, reverse=True):
+        if model.startswith(name):
+            return MODEL_PRICES[name]
+    return None
+
+
+class NodeRecord:
+    """Tek bir istekte bir düğüm için toplanan ölçümler."""
+
+    __slots__ = ("calls", "wall_seconds", "errors", "documents", "llm_calls", "prompt_tokens",
+                 "completion_tokens", "cost_usd", "http_requests", "retries", "cache_hits")
+
+    def __init__(self):
+        self.calls = 0
+        self.wall_seconds = 0.0
+        self.errors = 0
+        self.documents = 0
+        self.llm_calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost_usd = 0.0
+        self.http_requests = 0
+        self.retries = 0
+        self.cache_hits: Dict[str, int] = {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class RequestTrace:
+    """Bir analiz isteğinin düğüm bazında iz kaydı."""
+
+    def __init__(self, query: str = ""):
+        self.trace_id = uuid.uuid4().hex
+        self.query = query
+        self.started_at = datetime.now()
+        self._start = time.perf_counter()
+        self.wall_seconds = 0.0
+        self.status = "ok"
+        self.nodes: Dict[str, NodeRecord] = {}
+        self._lock = threading.Lock()
+
+    def update(self, node: Optional[str], **values: float) -> None:
+        """Düğüm kaydındaki sayaçları artırır (paralel dallardan güvenle çağrılabilir)."""
+        with self._lock:
+            record = self.nodes.setdefault(node or "(grafik dışı)", NodeRecord())
+            for name, value in values.items():
+                setattr(record, name, getattr(record, name) + value)
+
+    def add_cache_hit(self, node: Optional[str], kind: str, count: int) -> None:
+        with self._lock:
+            record = self.nodes.setdefault(node or "(grafik dışı)", NodeRecord())
+            record.cache_hits[kind] = record.cache_hits.get(kind, 0) + count
+
+    def finish(self, status: str) -> None:
+        self.wall_seconds = time.perf_counter() - self._start
+        self.status = status
+
+    def to_dict(self) -> Dict[str, Any]:
+        nodes = {name: record.to_dict() for name, record in self.nodes.items()}
+        totals = {key: sum(node[key] for node in nodes.values())
+                  for key in ("llm_calls", "prompt_tokens", "completion_tokens", "cost_usd", "http_requests", "retries")}
+        cache_hits: Dict[str, int] = {}
+        for node in nodes.values():
+            for kind, count in node["cache_hits"].items():
+                cache_hits[kind] = cache_hits.get(kind, 0) + count
+        slowest = max(nodes.items(), key=lambda item: item[1]["wall_seconds"], default=(None, None))[0]
+        return {
+            "trace_id": self.trace_id,
+            "timestamp": self.started_at.isoformat(timespec="seconds"),
+            "query": self.query[:MAX_QUERY_CHARS],
+            "status": self.status,
+            "wall_seconds": self.wall_seconds,
+            "slowest_node": slowest,
+            **totals,
+            "cache_hits": cache_hits,
+            "nodes": nodes,
+        }
+
+
+_current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("current_trace", default=None)
+_current_node: ContextVar[Optional[str]] = ContextVar("current_node", default=None)
+
+
+def current_trace() -> Optional[RequestTrace]:
+    """Çalışan isteğin izini döndürür; bir istek içinde değilse None."""
+    return _current_trace.get()
+
+
+# --- Kayıt Kancaları (önbellekler ve HTTP istemcisi tarafından çağrılır) ---
+
+def record_cache_hit(kind: str, count: int = 1) -> None:
+    """Çalışan düğüm için bir önbellek isabeti kaydeder ('llm', 'embedding', 'region_local' ...)."""
+    trace = _current_trace.get()
+    if trace is not None and count:
+        trace.add_cache_hit(_current_node.get(), kind, count)
+
+
+def record_http_response(response) -> None:
+    """httpx yanıt kancası: İstek sayısını ve yeniden denenecek yanıtları sayar."""
+    trace = _current_trace.get()
+    if trace is None:
+        return
+    status = response.status_code
+    retried = status in RETRIABLE_STATUS_CODES or status >= 500
+    trace.update(_current_node.get(), http_requests=1, retries=int(retried))
+
+
+async def arecord_http_response(response) -> None:
+    """`record_http_response` kancasının httpx.AsyncClient için versiyonu."""
+    record_http_response(response)
+
+
+# --- LLM Token Sayacı ---
+
+class TraceCallbackHandler(BaseCallbackHandler):
+    """
+    LLM çağrılarını, çağrının yapıldığı düğüme (metadata'daki `langgraph_node`)
+    göre gruplayarak çağrı sayısını, token'ları ve maliyeti ize yazar.
+    """
+
+    # Olay döngüsünde thread havuzuna gönderilmeden çalışsın.
+    run_inline = True
+
+    def __init__(self, trace: RequestTrace):
+        self.trace = trace
+        self._runs: Dict[uuid.UUID, tuple] = {}
+
+    def _start(self, run_id, metadata, kwargs) -> None:
+        params = kwargs.get("invocation_params") or {}
+        model = params.get("model_name") or params.get("model")
+        self._runs[run_id] = ((metadata or {}).get("langgraph_node"), model)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs) -> None:
+        self._start(run_id, metadata, kwargs)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, metadata=None, **kwargs) -> None:
+        self._start(run_id, metadata, kwargs)
+
+    def on_llm_end(self, response, *, run_id, **kwargs) -> None:
+        node, model = self._runs.pop(run_id, (None, None))
+        prompt_tokens = completion_tokens = 0
+        # Akış (streaming) modunda kullanım bilgisi mesajın usage_metadata alanında gelir.
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                prompt_tokens += usage.get("input_tokens", 0)
+                completion_tokens += usage.get("output_tokens", 0)
+        if not prompt_tokens and not completion_tokens:
+            usage = (response.llm_output or {}).get("token_usage") or {}
+            prompt_tokens = usage.get("prompt_tokens", 0)
+            completion_tokens = usage.get("completion_tokens", 0)
+
+        price = _model_price(model or (response.llm_output or {}).get("model_name"))
+        cost = (prompt_tokens * price[0] + completion_tokens * price[1]) / 1_000_000 if price else 0.0
+        self.trace.update(node, llm_calls=1, prompt_tokens=prompt_tokens,
+                          completion_tokens=completion_tokens, cost_usd=cost)
+
+    def on_llm_error(self, error, *, run_id, **kwargs) -> None:
+        node, _ = self._runs.pop(run_id, (None, None))
+        self.trace.update(node, llm_calls=1, errors=1)
+
+
+_trace_handler: ContextVar[Optional[TraceCallbackHandler]] = ContextVar("trace_callback_handler", default=None)
+# Bu ContextVar'da bir handler varken başlatılan tüm çalıştırmalara handler otomatik eklenir.
+register_configure_hook(_trace_handler, inheritable=True)
+
+
+# --- Düğüm Sarmalayıcı ---
+
+def _record_node(name: str, trace: RequestTrace, start: float, result: Any, failed: bool) -> None:
+    documents = result.get("documents") if isinstance(result, dict) else None
+    trace.update(name, calls=1, wall_seconds=time.perf_counter() - start,
+                 errors=int(failed), documents=len(documents) if documents else 0)
+
+
+def instrument_node(name: str, func, afunc=None) -> RunnableLambda:
+    """
+    Bir düğüm fonksiyonunu (ve varsa asenkron versiyonunu) süre, hata ve
+    doküman sayısını ize yazacak şekilde sarar. Bir istek izi yokken
+    fonksiyonlar olduğu gibi çalışır.
+    """
+    def wrapped(state):
+        trace = _current_trace.get()
+        if trace is None:
+            return func(state)
+        token = _current_node.set(name)
+        start, result, failed = time.perf_counter(), None, True
+        try:
+            result = func(state)
+            failed = False
+            return result
+        finally:
+            _current_node.reset(token)
+            _record_node(name, trace, start, result, failed)
+
+    async def awrapped(state):
+        trace = _current_trace.get()
+        if trace is None:
+            return await afunc(state)
+        token = _current_node.set(name)
+        start, result, failed = time.perf_counter(), None, True
+        try:
+            result = await afunc(state)
+            failed = False
+            return result
+        finally:
+            _current_node.reset(token)
+            _record_node(name, trace, start, result, failed)
+
+    # Sarmalayıcıya düğüm adı verilmez: LangGraph düğümün kendi çalıştırmasını zaten bu adla
+    # yayınlar; aynı ad iç çalıştırmaya da verilirse düğüm olayları (on_chain_start/end) iki kez gelir.
+    return RunnableLambda(wrapped, afunc=awrapped if afunc else None)
+
+
+# --- Süreç Geneli Toplamlar ---
+
+def percentile(values: List[float], q: float) -> float:
+    """En yakın sıra (nearest-rank) yöntemiyle yüzdelik değer."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class MetricsRegistry:
+    """Tamamlanan isteklerin düğüm bazında toplamlarını tutar ve Prometheus biçiminde sunar."""
+
+    NODE_COUNTERS = ("calls", "wall_seconds", "errors", "documents", "llm_calls", "prompt_tokens",
+                     "completion_tokens", "cost_usd", "http_requests", "retries")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests: Dict[str, int] = {}
+        self.request_seconds = 0.0
+        self.request_cost_usd = 0.0
+        self.latency_buckets = [0] * len(LATENCY_BUCKETS)
+        self.nodes: Dict[str, Dict[str, float]] = {}
+        self.cache_hits: Dict[tuple, int] = {}
+        self.events: Dict[tuple, int] = {}
+
+    def count_event(self, name: str, **labels: str) -> None:
+        """Düğüm toplamlarına girmeyen, etiketli bir olay sayacını artırır (örn: kural / LLM karar yolu)."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.events[key] = self.events.get(key, 0) + 1
+
+    def observe(self, trace: RequestTrace) -> None:
+        with self._lock:
+            self.requests[trace.status] = self.requests.get(trace.status, 0) + 1
+            self.request_seconds += trace.wall_seconds
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if trace.wall_seconds <= bound:
+                    self.latency_buckets[i] += 1
+            for name, record in trace.nodes.items():
+                totals = self.nodes.setdefault(name, dict.fromkeys(self.NODE_COUNTERS, 0))
+                for counter in self.NODE_COUNTERS:
+                    totals[counter] += getattr(record, counter)
+                self.request_cost_usd += record.cost_usd
+                for kind, count in record.cache_hits.items():
+                    self.cache_hits[(name, kind)] = self.cache_hits.get((name, kind), 0) + count
+
+    def render_prometheus(self) -> str:
+        """Toplamları Prometheus metin (exposition) biçiminde döndürür."""
+        with self._lock:
+            lines: List[str] = []
+            total = sum(self.requests.values())
+            lines += ["# HELP tesvik_requests_total Tamamlanan analiz istekleri.", "# TYPE tesvik_requests_total counter"]
+            lines += [f'tesvik_requests_total{{status="{status}"}} {count}' for status, count in sorted(self.requests.items())]
+            lines += ["# HELP tesvik_request_seconds Uçtan uca analiz süresi.", "# TYPE tesvik_request_seconds histogram"]
+            lines += [f'tesvik_request_seconds_bucket{{le="{bound}"}} {count}'
+                      for bound, count in zip(LATENCY_BUCKETS, self.latency_buckets)]
+            lines += [f'tesvik_request_seconds_bucket{{le="+Inf"}} {total}',
+                      f"tesvik_request_seconds_sum {self.request_seconds}", f"tesvik_request_seconds_count {total}"]
+            lines += ["# HELP tesvik_request_cost_usd_total Tahmini toplam LLM maliyeti.",
+                      "# TYPE tesvik_request_cost_usd_total counter", f"tesvik_request_cost_usd_total {self.request_cost_usd}"]
+            for counter in self.NODE_COUNTERS:
+                metric = f"tesvik_node_{counter}_total"
+                lines += [f"# TYPE {metric} counter"]
+                lines += [f'{metric}{{node="{name}"}} {totals[counter]}' for name, totals in sorted(self.nodes.items())]
+            lines += ["# TYPE tesvik_node_cache_hits_total counter"]
+            lines += [f'tesvik_node_cache_hits_total{{node="{name}",kind="{kind}"}} {count}'
+                      for (name, kind), count in sorted(self.cache_hits.items())]
+            for name in sorted({name for name, _ in self.events}):
+                lines += [f"# TYPE tesvik_{name}_total counter"]
+                for (event, labels), count in sorted(self.events.items()):
+                    if event == name:
+                        label_text = ",".join(f'{key}="{value}"' for key, value in labels)
+                        lines += [f"tesvik_{name}_total{{{label_text}}} {count}"]
+            return "\n".join(lines) + "\n"
+
+
+_registry = MetricsRegistry()
+_write_lock = threading.Lock()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Süreç genelinde paylaşılan metrik toplamlarını döndürür."""
+    return _registry
+
+
+def _export(trace: RequestTrace) -> None:
+    """İzi JSONL dosyasına ekler ve Prometheus metin dosyasını günceller."""
+    record = trace.to_dict()
+    text = _registry.render_prometheus()
+    try:
+        with _write_lock:
+            os.makedirs(os.path.dirname(TRACES_PATH), exist_ok=True)
+            with open(TRACES_PATH, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            # Okuyucular (node_exporter) yarım dosya görmesin diye geçici dosya + rename
+            tmp_path = METRICS_TEXTFILE_PATH + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, METRICS_TEXTFILE_PATH)
+    except OSError as e:
+        logging.warning(f"   > İz kaydı yazılamadı: {e}")
+
+    logging.info(
+        f"   > İz {trace.trace_id[:8]}: {trace.wall_seconds:.1f} sn, {record['llm_calls']} LLM çağrısı, "
+        f"{record['prompt_tokens'] + record['completion_tokens']} token, ${record['cost_usd']:.4f} "
+        f"(en yavaş düğüm: {record['slowest_node']})"
+    )
+
+
+@contextmanager
+def trace_request(query: str = "") -> Iterator[RequestTrace]:
+    """
+    Blok içinde çalışan grafik çağrısını tek bir istek izi olarak kaydeder.
+    Blok bittiğinde iz dışa aktarılır ve süreç geneli toplamlara eklenir.
+    """
+    trace = RequestTrace(query)
+    trace_token = _current_trace.set(trace)
+    handler_token = _trace_handler.set(TraceCallbackHandler(trace))
+    status = "error"
+    try:
+        yield trace
+        # Çağıran, istisna olmadan biten ama başarısız sayılan istekleri `trace.status` ile işaretleyebilir.
+        status = trace.status
+    finally:
+        _trace_handler.reset(handler_token)
+        _current_trace.reset(trace_token)
+        trace.finish(status)
+        _registry.observe(trace)
+        _export(trace)
+
+
+# --- Yerel Metrik Uç Noktası ---
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") not in ("", "/metrics"):
+            self.send_error(404)
+            return
+        body = _registry.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Her kazıma (scrape) isteği konsola yazılmasın
+        pass
+
+
+_server: Optional[ThreadingHTTPServer] = None
+
+
+def start_metrics_server(port: Optional[int] = None, host: str = "127.0.0.1") -> Optional[ThreadingHTTPServer]:
+    """
+    Metrikleri `http://host:port/metrics` adresinden sunan arka plan sunucusunu
+    başlatır. Port verilmezse `METRICS_PORT` ortam değişkeni okunur; o da yoksa
+    sunucu başlatılmaz.
+    """
+    global _server
+    port = port or int(os.getenv("METRICS_PORT", "0") or 0)
+    if not port or _server is not None:
+        return _server
+    try:
+        _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as e:
+        logging.warning(f"   > Metrik sunucusu başlatılamadı ({host}:{port}): {e}")
+        return None
+    threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+    logging.info(f"   > Metrikler http://{host}:{port}/metrics adresinden sunuluyor.")
+    return _server
@@ -1,11 +1,129 @@
+import asyncio
+import atexit
+import logging
 import os
+import threading
+import weakref
+from typing import Optional
+
+import httpx
 from langchain_openai import ChatOpenAI
 
-def get_llm_client(temperature=0.0, model="gpt-4-turbo"):
+from graph.core.chain_registry import get_chain_registry
+from graph.core.instrumentation import arecord_http_response, record_http_response
+from graph.core.llm_cache import get_llm_cache
+
+# --- PAYLAŞILAN HTTP BAĞLANTI HAVUZU ---
+# Her istemci kendi bağlantı havuzunu açmak yerine, süreç genelindeki tek bir
+# havuzu kullanır. Böylece eşzamanlı analizler TLS el sıkışmalarını ve açık
+# bağlantıları paylaşır.
+HTTP_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=50)
+HTTP_TIMEOUT = httpx.Timeout(600.0, connect=5.0)
+
+_http_client: Optional[httpx.Client] = None
+# httpx.AsyncClient bağlantıları oluşturuldukları olay döngüsüne bağlıdır.
+# Streamlit her yeniden çalıştırmada yeni bir döngü açabildiği için havuz döngü başına tutulur.
+_async_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_http_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.Client:
+    """Senkron çağrılar için süreç genelinde paylaşılan HTTP istemcisini döndürür."""
+    global _http_client
+    if _http_client is None:
+        with _http_lock:
+            if _http_client is None:
+                _http_client = httpx.Client(
+                    limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT,
+                    # İstek ve yeniden deneme (429/5xx) sayıları çalışan düğümün izine yazılır.
+                    event_hooks={"response": [record_http_response]},
+                )
+    return _http_client
+
+
+def get_async_http_client() -> Optional[httpx.AsyncClient]:
+    """
+    Çalışan olay döngüsü için paylaşılan asenkron HTTP istemcisini döndürür.
+    Bir olay döngüsü içinde çağrılmıyorsa None döner (istemci varsayılanı kullanılır).
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+    with _http_lock:
+        client = _async_http_clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(
+                limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT,
+                event_hooks={"response": [arecord_http_response]},
+            )
+            _async_http_clients[loop] = client
+    return client
+
+
+def close_http_clients() -> None:
+    """
+    Paylaşılan HTTP bağlantı havuzlarını kapatır. Süreç sonlanırken (atexit)
+    otomatik çağrılır. Döngüsü hâlâ çalışan veya kapanmış asenkron istemciler
+    atlanır; bunların bağlantıları döngüyle birlikte kapanır.
+    """
+    global _http_client
+    with _http_lock:
+        client, _http_client = _http_client, None
+        async_clients = list(_async_http_clients.items())
+        _async_http_clients.clear()
+    if client is not None:
+        client.close()
+    for loop, async_client in async_clients:
+        if loop.is_closed() or loop.is_running():
+            continue
+        try:
+            loop.run_until_complete(async_client.aclose())
+        except Exception as e:
+            logging.debug(f"   > Asenkron HTTP istemcisi kapatılamadı: {e}")
+    get_chain_registry().clear()
+
+
+atexit.register(close_http_clients)
+
+
+def get_llm_client(temperature=0.0, model="gpt-4-turbo", use_cache=True):
     """
     OpenAI dil modelini başlatan ve yapılandıran merkezi fonksiyon.
     API anahtarını ortam değişkenlerinden okur ve istemciye doğrudan sağlar.
+
+    `use_cache=True` iken, aynı prompt ve model ayarlarıyla yapılan çağrılar
+    kalıcı yanıt önbelleğinden (graph/core/llm_cache.py) karşılanır. Yaratıcı
+    (yüksek sıcaklıklı) zincirler `use_cache=False` ile önbellekten çıkabilir.
+
+    İstemci (model, sıcaklık, önbellek) anahtarı başına bir kez oluşturulur ve
+    zincir kaydında (graph/core/chain_registry.py) paylaşılır.
     """
+    return get_chain_registry().get_or_build(
+        ("llm", model, float(temperature), use_cache),
+        lambda: _create_llm_client(temperature, model, use_cache),
+    )
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Hatanın bir rate limit (HTTP 429) hatası olup olmadığını belirler."""
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    return status == 429 or type(error).__name__ == "RateLimitError" or "rate limit" in str(error).lower()
+
+
+def raise_if_rate_limited(error: Exception) -> None:
+    """
+    Düğümlerin hata yakalayıcılarında çağrılır. İstemcinin kendi yeniden
+    denemeleri (max_retries) tükendikten sonra gelen rate limit hataları
+    varsayılan yanıta düşürülmez, grafiğin dışına iletilir; böylece eksik
+    bir rapor başarılı sayılmaz ve çağıran (örn. batch_runner.py) geri
+    çekilerek yeniden deneyebilir.
+    """
+    if is_rate_limit_error(error):
+        raise error
+
+
+def _create_llm_client(temperature: float, model: str, use_cache: bool) -> ChatOpenAI:
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise ValueError(
@@ -17,11 +135,19 @@ def get_llm_client(temperature=0.0, model="gpt-4-turbo"):
         model=model,
         api_key=api_key, # API anahtarını doğrudan istemciye ver
         streaming=True,
+        # Akış modunda da token kullanımının döndürülmesini iste (graph/core/instrumentation.py).
+        stream_usage=True,
         # --- RATE LIMIT HATASI İÇİN GECE 1 ÇÖZÜMÜ ---
         # Eğer API rate limit'e takılırsak (429 Hatası),
         # sistemin çökmesini engelle ve 5 kereye kadar tekrar denemesini sağla.
         max_retries=5,
         # --- TOKEN LİMİTİ HATASI İÇİN KALICI ÇÖZÜM ---
         # Detaylı raporların yarıda kesilmesini önlemek için maksimum token limitini artır.
-        max_tokens=4096
-    ) 
\ No newline at end of file
+        max_tokens=4096,
+        # --- YANIT ÖNBELLEĞİ ---
+        # False verildiğinde global bir önbellek tanımlı olsa bile kullanılmaz.
+        cache=get_llm_cache() if use_cache else False,
+        # --- BAĞLANTI HAVUZU ---
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client(),
+    )
@@ -0,0 +1,214 @@
+# graph/core/llm_cache.py
+"""
+Zincirlerin LLM yanıtları için kalıcı, birebir eşleşmeli (exact-match) önbellek.
+
+Zincirlerin çoğu temperature=0 ile çalıştığından, aynı prompt aynı model
+ayarlarıyla tekrar gönderildiğinde aynı yanıt beklenir. Bu önbellek, yanıtı
+prompt ve model yapılandırmasının (llm_string: model adı, sıcaklık, bağlı
+şema/araçlar vb.) özetiyle anahtarlar; bellek içi LRU katmanının arkasında
+SQLite üzerinde TTL'li olarak saklar.
+
+LangChain'in `BaseCache` arayüzünü uyguladığı için `get_llm_client` üzerinden
+her ChatOpenAI istemcisine takılır ve farklı bir uygulama ile değiştirilebilir.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence
+
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+from langchain_core.outputs import Generation
+
+from graph.core.instrumentation import record_cache_hit
+
+# Sabitler
+LLM_CACHE_PATH = os.path.join("cache", "llm_responses.sqlite3")
+LLM_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+MEMORY_CACHE_SIZE = 1024
+MAX_DISK_ENTRIES = 50_000
+# Süresi dolmuş kayıtlar her yazmada değil, bu kadar yazmada bir temizlenir.
+EVICT_EVERY_WRITES = 500
+
+
+def make_cache_key(prompt: str, llm_string: str) -> str:
+    """Prompt ve model yapılandırmasından önbellek anahtarı üretir."""
+    return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+
+def _as_cache_hit(generations: Sequence[Generation]) -> Sequence[Generation]:
+    """
+    İsabeti ölçüm katmanına bildirir ve yanıtları token kullanımı olmadan
+    döndürür; önbellekten gelen yanıt token harcamadığı için maliyete yazılmamalıdır.
+    """
+    record_cache_hit("llm")
+    stripped = []
+    for generation in generations:
+        message = getattr(generation, "message", None)
+        if getattr(message, "usage_metadata", None):
+            generation = generation.model_copy(update={"message": message.model_copy(update={"usage_metadata": None})})
+        stripped.append(generation)
+    return stripped
+
+
+class PersistentLLMCache(BaseCache):
+    """Bellek içi LRU + SQLite disk katmanlı, TTL destekli LLM yanıt önbelleği."""
+
+    def __init__(self, db_path: str = LLM_CACHE_PATH,
+                 ttl_seconds: float = LLM_CACHE_TTL_SECONDS,
+                 memory_size: int = MEMORY_CACHE_SIZE,
+                 max_disk_entries: int = MAX_DISK_ENTRIES):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.memory_size = memory_size
+        self.max_disk_entries = max_disk_entries
+        # anahtar -> (oluşturulma zamanı, Generation listesi)
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_responses ("
+            " key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_responses_last_access ON llm_responses(last_access)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_responses_created_at ON llm_responses(created_at)")
+        self._conn.commit()
+        # Disk sınırı her yazmada COUNT(*) ile değil, bu sayaçla izlenir; temizlikte yeniden sayılır.
+        self._disk_count = self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+        self._writes_since_evict = 0
+
+    def _remember(self, key: str, created_at: float, generations: Sequence[Generation]) -> None:
+        self._memory[key] = (created_at, generations)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return now - created_at > self.ttl_seconds
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+        """Önbellekte geçerli (süresi dolmamış) bir yanıt varsa döndürür."""
+        key = make_cache_key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, generations = entry
+                if not self._is_expired(created_at, now):
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return _as_cache_hit(generations)
+                del self._memory[key]
+
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            response, created_at = row
+            if self._is_expired(created_at, now):
+                self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self._disk_count -= 1
+                self.misses += 1
+                return None
+
+            try:
+                generations = [loads(item) for item in json.loads(response)]
+            except Exception as e:
+                logging.warning(f"   > LLM önbellek kaydı çözümlenemedi, yok sayılıyor: {e}")
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE llm_responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self._remember(key, created_at, generations)
+            self.hits += 1
+            return _as_cache_hit(generations)
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        """Yeni bir yanıtı her iki katmana yazar."""
+        key = make_cache_key(prompt, llm_string)
+        now = time.time()
+        try:
+            response = json.dumps([dumps(generation) for generation in return_val])
+        except Exception as e:
+            logging.warning(f"   > LLM yanıtı önbelleğe yazılamadı: {e}")
+            return
+        with self._lock:
+            self._remember(key, now, return_val)
+            before = self._conn.total_changes
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, response, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, response, now, now),
+            )
+            self._conn.commit()
+            self._disk_count += self._conn.total_changes - before
+            self._writes_since_evict += 1
+            if self._writes_since_evict >= EVICT_EVERY_WRITES or self._disk_count > self.max_disk_entries:
+                self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        """Süresi dolmuş kayıtları ve disk sınırını aşan en eski kayıtları siler."""
+        self._writes_since_evict = 0
+        self._conn.execute("DELETE FROM llm_responses WHERE created_at < ?", (now - self.ttl_seconds,))
+        self._disk_count = self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+        overflow = self._disk_count - self.max_disk_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM llm_responses WHERE key IN (SELECT key FROM llm_responses ORDER BY last_access LIMIT ?)",
+                (overflow,),
+            )
+            self._disk_count -= overflow
+        self._conn.commit()
+
+    def clear(self, **kwargs: Any) -> None:
+        """Önbelleği tamamen temizler."""
+        with self._lock:
+            self._memory.clear()
+            self._conn.execute("DELETE FROM llm_responses")
+            self._conn.commit()
+            self._disk_count = 0
+            self._writes_since_evict = 0
+
+    def stats(self) -> Dict[str, int]:
+        """İsabet/ıska sayaçlarını döndürür."""
+        return {"hits": self.hits, "misses": self.misses, "memory_entries": len(self._memory)}
+
+
+_llm_cache: Optional[BaseCache] = None
+_lock = threading.Lock()
+
+
+def get_llm_cache() -> BaseCache:
+    """Süreç genelinde paylaşılan LLM yanıt önbelleğini döndürür."""
+    global _llm_cache
+    if _llm_cache is None:
+        with _lock:
+            if _llm_cache is None:
+                _llm_cache = PersistentLLMCache()
+    return _llm_cache
+
+
+def set_llm_cache(cache: Optional[BaseCache]) -> None:
+    """
+    Varsayılan önbelleği başka bir `BaseCache` uygulamasıyla değiştirir.
+    Sadece bu çağrıdan sonra oluşturulan istemcileri etkiler.
+    """
+    global _llm_cache
+    with _lock:
+        _llm_cache = cache
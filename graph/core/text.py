@@ -0,0 +1,63 @@
+# graph/core/text.py
+"""
+Türkçe metinler için ortak normalizasyon yardımcıları.
+
+Python'un `str.lower()` fonksiyonu Türkçedeki noktalı/noktasız i ayrımını
+bilmez ('I'.lower() -> 'i', 'İ'.lower() -> 'i̇'). Buradaki fonksiyonlar önce
+doğru Türkçe küçük harf dönüşümünü yapar, ardından eşleştirme için
+diakritikleri katlar (ç->c, ğ->g, ı->i, ö->o, ş->s, ü->u). Böylece kullanıcı
+'tekstil fabrikasi' de yazsa 'Tekstil Fabrikası' da yazsa aynı anahtarlar oluşur.
+"""
+import re
+import unicodedata
+from typing import List
+
+_TURKISH_LOWER = str.maketrans({"I": "ı", "İ": "i"})
+_FOLD = str.maketrans({"ç": "c", "ğ": "g", "ı": "i", "ö": "o", "ş": "s", "ü": "u", "â": "a", "î": "i", "û": "u"})
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Eşleştirmede anlam taşımayan bağlaçlar ve mevzuat kalıpları (katlanmış biçimde)
+STOPWORDS = frozenset({
+    "ve", "veya", "ile", "icin", "bir", "bu", "da", "de", "ki", "mi", "gibi", "olan",
+    "haric", "dahil", "diger", "baska", "yerde", "siniflandirilmamis", "sadece", "yalnizca",
+    "yatirim", "yatirimi", "yatirimlari", "kurmak", "istiyorum", "yapmak", "acmak",
+})
+
+# Uzundan kısaya sıralı, katlanmış Türkçe çekim ve yapım ekleri
+_SUFFIXES = sorted({
+    "cilik", "culuk", "lik", "luk", "leri", "lari", "ler", "lar",
+    "nin", "nun", "dan", "den", "tan", "ten", "nda", "nde",
+    "si", "su", "in", "un", "da", "de", "ta", "te", "li", "lu",
+    "i", "u", "a", "e",
+}, key=len, reverse=True)
+MIN_STEM_LENGTH = 3
+
+
+def turkish_casefold(text: str) -> str:
+    """Metni Türkçe kurallarıyla küçük harfe çevirir ve diakritikleri katlar."""
+    text = unicodedata.normalize("NFC", text or "").translate(_TURKISH_LOWER).lower()
+    # Birleşik işaretleri (çengel, nokta, şapka ve U+0307 kalıntıları) ayıkla; 'ı' ayrıca katlanır.
+    text = "".join(ch for ch in unicodedata.normalize("NFD", text) if not unicodedata.combining(ch))
+    return unicodedata.normalize("NFC", text).translate(_FOLD)
+
+
+def stem(token: str, max_passes: int = 3) -> str:
+    """
+    Basit, sözlüksüz Türkçe ek atıcı. Kökü MIN_STEM_LENGTH karakterin altına
+    düşürmeden sondaki ekleri en fazla `max_passes` kez soyar
+    ('fabrikasi' -> 'fabrik', 'oteller' -> 'otel', 'hayvancilik' -> 'hayvan').
+    """
+    for _ in range(max_passes):
+        for suffix in _SUFFIXES:
+            if token.endswith(suffix) and len(token) - len(suffix) >= MIN_STEM_LENGTH:
+                token = token[: -len(suffix)]
+                break
+        else:
+            break
+    return token
+
+
+def tokenize(text: str, stemmed: bool = True) -> List[str]:
+    """Metni katlanmış, durak kelimelerden arındırılmış (isteğe bağlı köklenmiş) kelimelere böler."""
+    tokens = [t for t in _TOKEN_PATTERN.findall(turkish_casefold(text)) if t not in STOPWORDS]
+    return [stem(t) for t in tokens] if stemmed else tokens
@@ -1,24 +1,32 @@
 # graph/graph.py
 import logging
-from typing import Literal
-from langgraph.graph import StateGraph, END
+import os
+from typing import Literal, Optional
+from langgraph.graph import StateGraph, START, END
+from .core.instrumentation import instrument_node
 from .state import GraphState
 
 # --- Tüm Düğümleri ve Mantık Fonksiyonlarını Eksiksiz İçe Aktarma ---
-from .nodes.entity_extractor import entity_extractor_node
-from .nodes.mevzuat_auditor import mevzuat_auditor_node
-from .nodes.document_retriever import retrieve_documents_node
-from .nodes.temporal_resolver_node import temporal_resolver_node
-from .nodes.detail_extractor import detail_extractor_node
-from .nodes.investment_type_analyzer import investment_type_analyzer_node
-from .nodes.focused_retriever import focused_retriever_node
-from .nodes.condition_analyzer import condition_analyzer_node
-from .nodes.support_analyzer import support_analyzer_node
-from .nodes.region_resolver import region_resolver_node
-from .nodes.final_response_synthesizer import final_response_synthesizer_node
+from .nodes.entity_extractor import entity_extractor_node, aentity_extractor_node
+from .nodes.mevzuat_auditor import mevzuat_auditor_node, amevzuat_auditor_node
+from .nodes.document_retriever import retrieve_documents_node, aretrieve_documents_node
+from .nodes.temporal_resolver_node import temporal_resolver_node, atemporal_resolver_node
+from .nodes.detail_extractor import detail_extractor_node, adetail_extractor_node
+from .nodes.investment_type_analyzer import investment_type_analyzer_node, ainvestment_type_analyzer_node
+from .nodes.focused_retriever import focused_retriever_node, afocused_retriever_node
+from .nodes.condition_analyzer import condition_analyzer_node, acondition_analyzer_node
+from .nodes.support_analyzer import support_analyzer_node, asupport_analyzer_node
+from .nodes.region_resolver import region_resolver_node, aregion_resolver_node
+from .nodes.query_extractor import query_extractor_node, aquery_extractor_node
+from .nodes.final_response_synthesizer import final_response_synthesizer_node, afinal_response_synthesizer_node
 
 logging.basicConfig(level=logging.INFO, format='   > %(message)s')
 
+# Sorgu çıkarım modu: "unified" (varsayılan) varlıkları, tarihi ve bölgeyi tek
+# bir LLM çağrısıyla çıkarır; "separate" eski üç ayrı zinciri paralel çalıştırır.
+EXTRACTION_MODES = ("unified", "separate")
+DEFAULT_EXTRACTION_MODE = "unified"
+
 def should_retrieve_documents(state: GraphState) -> Literal["continue", "end"]:
     """Varlık çıkarma işleminden sonra doküman araması yapılıp yapılmayacağına karar verir."""
     logging.info("---KARAR: Dokümanlar Aranmalı mı?---")
@@ -46,58 +54,160 @@ def should_focus_search(state: GraphState) -> Literal["focus", "skip"]:
     logging.info(f"   > Karar: Yatırım türü '{investment_type_str}'. Daha spesifik bilgi için arama odaklanacak.")
     return "focus"
 
-def create_graph():
-    """Tüm modüler düğümleri ve kenarları tanımlayarak iş akışı grafiğini oluşturur."""
+def route_after_investment_type(state: GraphState) -> Literal["focus", "skip", "end"]:
+    """
+    Paralel dalların birleştiği yatırım türü analizinden sonraki akışı belirler.
+    Varlıklar yetersizse analiz doğrudan nihai rapora gider; aksi halde
+    odaklanmış arama kararı verilir.
+    """
+    if should_retrieve_documents(state) == "end":
+        return "end"
+    return should_focus_search(state)
+
+# --- Düğümlerin Okuduğu ve Yazdığı State Anahtarları (Bağımlılık Haritası) ---
+# Grafiğin paralel yapısı bu haritadan türetilmiştir: bir düğüm, ancak okuduğu
+# anahtarları yazan düğümler bittikten sonra çalışabilir. Aynı adımda
+# çalışan paralel düğümler ortak bir anahtara yazmaz; `documents` gibi birden
+# fazla düğümün yazdığı anahtarlar GraphState'te bir reducer ile birleştirilir.
+NODE_DEPENDENCIES = {
+    "query_extractor": {"reads": ["query"], "writes": ["entities", "extracted_details", "region_info"]},
+    "entity_extractor": {"reads": ["query"], "writes": ["entities"]},
+    "detail_extractor": {"reads": ["query"], "writes": ["extracted_details"]},
+    "region_resolver": {"reads": ["query"], "writes": ["region_info"]},
+    "mevzuat_auditor": {
+        "reads": ["entities"],
+        "writes": ["entities", "sector_number", "is_regionally_eligible", "is_large_scale", "is_prohibited"],
+    },
+    "retrieve_documents": {"reads": ["entities"], "writes": ["documents"]},
+    "temporal_resolver": {"reads": ["extracted_details"], "writes": ["temporal_directive", "temporal_directives", "acquired_rights_warning"]},
+    "investment_type_analyzer": {
+        "reads": ["entities", "sector_number", "documents", "extracted_details", "temporal_directive", "temporal_directives",
+                  "is_regionally_eligible", "is_large_scale", "is_prohibited"],
+        "writes": ["investment_type"],
+    },
+    "focused_retriever": {"reads": ["investment_type", "entities", "documents", "extracted_details"], "writes": ["documents"]},
+    "condition_analyzer": {
+        "reads": ["investment_type", "entities", "documents", "temporal_directives", "extracted_details"],
+        "writes": ["special_conditions"],
+    },
+    "support_analyzer": {
+        "reads": ["documents", "focused_documents", "investment_type", "special_conditions", "entities",
+                  "extracted_details", "region_info"],
+        "writes": ["support_analysis"],
+    },
+    "final_response_synthesizer": {
+        "reads": ["entities", "extracted_details", "is_regionally_eligible", "is_large_scale", "is_prohibited",
+                  "temporal_directives", "investment_type", "support_analysis"],
+        "writes": ["final_response"],
+    },
+}
+
+def resolve_extraction_mode(extraction_mode: Optional[str] = None) -> str:
+    """Verilen veya EXTRACTION_MODE ortam değişkenindeki sorgu çıkarım modunu doğrular."""
+    mode = (extraction_mode or os.getenv("EXTRACTION_MODE") or DEFAULT_EXTRACTION_MODE).strip().lower()
+    if mode not in EXTRACTION_MODES:
+        raise ValueError(f"Geçersiz çıkarım modu '{mode}'. Geçerli değerler: {', '.join(EXTRACTION_MODES)}")
+    return mode
+
+def create_graph(extraction_mode: Optional[str] = None):
+    """
+    Tüm modüler düğümleri ve kenarları tanımlayarak iş akışı grafiğini oluşturur.
+
+    Grafik, NODE_DEPENDENCIES haritasına göre birbirinden bağımsız adımları
+    paralel çalıştıran bir fan-out/fan-in DAG'dir. Varsayılan ("unified")
+    modda sorgu tek bir LLM çağrısıyla çözümlenir:
+
+        START ─ query_extractor ─┬─ mevzuat_auditor ────┐
+                                 ├─ retrieve_documents ─┤
+                                 └─ temporal_resolver ──┴─> investment_type_analyzer
+
+    "separate" modunda (EXTRACTION_MODE=separate) üç ayrı çıkarım zinciri
+    paralel çalışır:
+
+        START ─┬─ entity_extractor ─┬─ mevzuat_auditor ────┐
+               │                    └─ retrieve_documents ─┤
+               ├─ detail_extractor ─── temporal_resolver ──┤
+               └─ region_resolver ─────────────────────────┴─> investment_type_analyzer
+
+    Her iki modda da devamı aynıdır:
+
+        investment_type_analyzer ─> [focused_retriever] ─> condition_analyzer
+            ─> support_analyzer ─> final_response_synthesizer ─> END
+    """
+    mode = resolve_extraction_mode(extraction_mode)
     workflow = StateGraph(GraphState)
     
     # --- 1. Adım: Düğümleri Tanımla (Eksiksiz Liste) ---
-    workflow.add_node("entity_extractor", entity_extractor_node)
-    workflow.add_node("mevzuat_auditor", mevzuat_auditor_node)
-    workflow.add_node("retrieve_documents", retrieve_documents_node)
-    workflow.add_node("temporal_resolver", temporal_resolver_node)
-    workflow.add_node("detail_extractor", detail_extractor_node)
-    workflow.add_node("investment_type_analyzer", investment_type_analyzer_node)
-    workflow.add_node("focused_retriever", focused_retriever_node)
-    workflow.add_node("condition_analyzer", condition_analyzer_node)
-    workflow.add_node("support_analyzer", support_analyzer_node)
-    workflow.add_node("region_resolver", region_resolver_node)
-    workflow.add_node("final_response_synthesizer", final_response_synthesizer_node)
-
-    # --- 2. Adım: Grafiğin Akışını Tanımla (Orijinal ve Doğru Mantık) ---
-    workflow.set_entry_point("entity_extractor")
-    workflow.add_edge("entity_extractor", "mevzuat_auditor")
+    # Her düğüm, süre/token/önbellek ölçümlerini istek izine yazan bir sarmalayıcıyla eklenir.
+    if mode == "unified":
+        workflow.add_node("query_extractor", instrument_node("query_extractor", query_extractor_node, aquery_extractor_node))
+    else:
+        workflow.add_node("entity_extractor", instrument_node("entity_extractor", entity_extractor_node, aentity_extractor_node))
+        workflow.add_node("detail_extractor", instrument_node("detail_extractor", detail_extractor_node, adetail_extractor_node))
+        workflow.add_node("region_resolver", instrument_node("region_resolver", region_resolver_node, aregion_resolver_node))
+    workflow.add_node("mevzuat_auditor", instrument_node("mevzuat_auditor", mevzuat_auditor_node, amevzuat_auditor_node))
+    workflow.add_node("retrieve_documents", instrument_node("retrieve_documents", retrieve_documents_node, aretrieve_documents_node))
+    workflow.add_node("temporal_resolver", instrument_node("temporal_resolver", temporal_resolver_node, atemporal_resolver_node))
+    workflow.add_node("investment_type_analyzer", instrument_node("investment_type_analyzer", investment_type_analyzer_node, ainvestment_type_analyzer_node))
+    workflow.add_node("focused_retriever", instrument_node("focused_retriever", focused_retriever_node, afocused_retriever_node))
+    workflow.add_node("condition_analyzer", instrument_node("condition_analyzer", condition_analyzer_node, acondition_analyzer_node))
+    workflow.add_node("support_analyzer", instrument_node("support_analyzer", support_analyzer_node, asupport_analyzer_node))
+    workflow.add_node("final_response_synthesizer", instrument_node("final_response_synthesizer", final_response_synthesizer_node, afinal_response_synthesizer_node))
 
-    workflow.add_conditional_edges(
-        "mevzuat_auditor",
-        should_retrieve_documents,
-        {"continue": "retrieve_documents", "end": "final_response_synthesizer"},
-    )
+    # --- 2. Adım: Grafiğin Akışını Tanımla (Paralel Dallar) ---
+    if mode == "unified":
+        # Tek çıkarım çağrısı üç state anahtarını birden yazar; ardından üç dal aynı anda başlar.
+        workflow.add_edge(START, "query_extractor")
+        workflow.add_edge("query_extractor", "mevzuat_auditor")
+        workflow.add_edge("query_extractor", "retrieve_documents")
+        workflow.add_edge("query_extractor", "temporal_resolver")
+        fan_in = ["mevzuat_auditor", "retrieve_documents", "temporal_resolver"]
+    else:
+        # Fan-out: Sadece kullanıcı sorgusuna bağlı olan üç LLM adımı aynı anda başlar.
+        workflow.add_edge(START, "entity_extractor")
+        workflow.add_edge(START, "detail_extractor")
+        workflow.add_edge(START, "region_resolver")
 
-    workflow.add_edge("retrieve_documents", "detail_extractor")
-    workflow.add_edge("detail_extractor", "temporal_resolver")
-    workflow.add_edge("temporal_resolver", "investment_type_analyzer")
+        # Varlıklar çıkarılınca mevzuat denetimi ve doküman araması birlikte çalışır.
+        workflow.add_edge("entity_extractor", "mevzuat_auditor")
+        workflow.add_edge("entity_extractor", "retrieve_documents")
+        workflow.add_edge("detail_extractor", "temporal_resolver")
+        fan_in = ["mevzuat_auditor", "retrieve_documents", "temporal_resolver", "region_resolver"]
+
+    # Fan-in: Yatırım türü analizi, tüm dallar tamamlandığında bir kez çalışır.
+    workflow.add_edge(fan_in, "investment_type_analyzer")
 
     workflow.add_conditional_edges(
         "investment_type_analyzer",
-        should_focus_search,
+        route_after_investment_type,
         {
             "focus": "focused_retriever",
             "skip": "condition_analyzer",
+            "end": "final_response_synthesizer",
         },
     )
     
     workflow.add_edge("focused_retriever", "condition_analyzer")
     workflow.add_edge("condition_analyzer", "support_analyzer")
-    workflow.add_edge("support_analyzer", "region_resolver")
-    workflow.add_edge("region_resolver", "final_response_synthesizer")
+    workflow.add_edge("support_analyzer", "final_response_synthesizer")
     workflow.add_edge("final_response_synthesizer", END)
 
-    # --- 3. Adım: Grafiği Derle ve Çizdir ---
-    app = workflow.compile()
-    
+    # --- 3. Adım: Grafiği Derle ---
+    # Şema çizimi (ağ çağrısı gerektirebilir) başlangıçta değil, `draw_graph` ile açıkça yapılır.
+    return workflow.compile()
+
+def draw_graph(app, output_file_path: str = "graph.png") -> str:
+    """
+    Derlenmiş grafiğin şemasını PNG olarak kaydeder. PNG çizimi mermaid.ink
+    servisine gider; çizilemezse Mermaid kaynağı '.mmd' dosyasına yazılır.
+    Yazılan dosyanın yolunu döndürür.
+    """
     try:
-        app.get_graph().draw_mermaid_png(output_file_path="graph.png")
+        app.get_graph().draw_mermaid_png(output_file_path=output_file_path)
+        return output_file_path
     except Exception as e:
-        logging.warning(f"Grafik çizimi oluşturulamadı: {e}")
-
-    return app 
\ No newline at end of file
+        mermaid_path = os.path.splitext(output_file_path)[0] + ".mmd"
+        logging.warning(f"Grafik PNG olarak çizilemedi, Mermaid kaynağı '{mermaid_path}' dosyasına yazılıyor: {e}")
+        with open(mermaid_path, "w", encoding="utf-8") as f:
+            f.write(app.get_graph().draw_mermaid())
+        return mermaid_path 
\ No newline at end of file
@@ -0,0 +1,288 @@
+# graph/hybrid_retriever.py
+"""
+Yoğun (vektör) ve sözcüksel (BM25) aramayı birleştiren hibrit mevzuat arayıcısı.
+
+Sadece embedding benzerliğine dayanan arama, kullanıcının birebir yazdığı
+"Madde 17", "EK-2B" veya bir US-97 kodu gibi hukuki atıfları çoğu zaman
+kaçırır. Bu modül, vektör deposundaki parçaların üzerinde süreç içi bir BM25
+ters indeksi kurar ve üç sıralamayı karşılıklı sıra birleştirme (Reciprocal
+Rank Fusion) ile tek listede toplar:
+
+1. Yoğun vektör sıralaması (yerel index veya eski FAISS index'i),
+2. BM25 sözcüksel sıralama,
+3. Sorgudaki madde/ek/US-97 atıflarıyla metadata'sı birebir eşleşen parçalar.
+
+Metadata filtreleri (kategori, kaynak dosya, belirli bir tarihte yürürlükte
+olma) puanlamadan önce uygulanır: BM25 sadece izin verilen parçaları puanlar,
+yoğun arama da aynı konum kümesiyle sınırlandırılır.
+
+Sözcüksel indeks, yüklü vektör deposu nesnesi başına bir kez kurulur;
+VectorStoreManager index'i yeniden yüklediğinde bir sonraki aramada yenilenir.
+"""
+import asyncio
+import logging
+import math
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from langchain_core.documents import Document
+
+from graph.context_packer import BM25_B, BM25_K1
+from graph.core.text import tokenize, turkish_casefold
+from graph.native_index import NativeVectorStore
+from graph.vector_store import aget_vector_store, get_vector_store
+
+# RRF sabiti: Sıralamanın üst kısmındaki küçük farkların etkisini yumuşatır.
+RRF_K = 60
+# Her sıralamadan birleştirmeye giren aday sayısı
+CANDIDATE_K = 40
+# Metadata eşleşmesi, birleştirmede bu kadar ayrı sıralama ağırlığında sayılır.
+REFERENCE_WEIGHT = 2.0
+
+# Katlanmış metin üzerinde: "madde 17", "17. madde", "17 nci madde"
+_MADDE_PATTERN = re.compile(r"\bmadde\s*(\d+)|\b(\d+)\s*(?:\.|'?\s*(?:inci|nci|uncu|ncu))\s*madde")
+_EK_PATTERN = re.compile(r"\bek\s*-?\s*(\d+[a-z]?)\b")
+_US97_PATTERN = re.compile(r"\b(?:us\s*-?\s*97|kodu?)\D{0,20}?(\d+(?:\.\d+)*)")
+
+
+class References(NamedTuple):
+    """Sorguda birebir geçen hukuki atıflar."""
+    maddeler: Set[str]
+    ekler: Set[str]
+    us97_codes: Set[str]
+
+    def __bool__(self) -> bool:
+        return bool(self.maddeler or self.ekler or self.us97_codes)
+
+
+class HybridResult(NamedTuple):
+    documents: List[Document]
+    # Dönen dokümanlardan kaçının hem yoğun hem sözcüksel ilk k sonuçta yer aldığı.
+    # İki bağımsız sıralamanın uzlaşması, sorgunun güçlü olduğunu gösterir.
+    consensus: int
+
+
+def extract_references(text: str) -> References:
+    """Sorgu metnindeki madde numaralarını, ek adlarını ve US-97 kodlarını çıkarır."""
+    folded = turkish_casefold(text)
+    return References(
+        maddeler={a or b for a, b in _MADDE_PATTERN.findall(folded)},
+        ekler={f"EK-{ek.upper()}" for ek in _EK_PATTERN.findall(folded)},
+        us97_codes=set(_US97_PATTERN.findall(folded)),
+    )
+
+
+def _rrf(rankings: Iterable[Sequence[int]], weights: Optional[Sequence[float]] = None) -> Dict[int, float]:
+    """Sıralamaları karşılıklı sıra birleştirmesi ile tek puanda toplar."""
+    scores: Dict[int, float] = {}
+    for i, ranking in enumerate(rankings):
+        weight = weights[i] if weights else 1.0
+        for rank, position in enumerate(ranking):
+            scores[position] = scores.get(position, 0.0) + weight / (RRF_K + rank + 1)
+    return scores
+
+
+class LexicalIndex:
+    """
+    Vektör deposundaki parçaların BM25 ters indeksi. Konumlar vektör
+    deposundaki sıradır; metinler değil, sadece terim listeleri ve metadata tutulur.
+    """
+
+    def __init__(self, chunks: Iterable[Tuple[int, str, Dict[str, Any]]]):
+        self.metadatas: List[Dict[str, Any]] = []
+        self.postings: Dict[str, List[tuple]] = {}
+        self.lengths: List[int] = []
+        for position, text, metadata in chunks:
+            tokens = tokenize(text)
+            self.metadatas.append(metadata)
+            self.lengths.append(len(tokens))
+            for term, tf in Counter(tokens).items():
+                self.postings.setdefault(term, []).append((position, tf))
+        self.avg_length = sum(self.lengths) / len(self.lengths) if self.lengths else 1.0
+
+    def allowed(self, kategori: Optional[str] = None, source: Optional[str] = None,
+                effective_on: Optional[str] = None) -> Optional[Set[int]]:
+        """Filtrelere uyan parça konumları; filtre verilmemişse None (tümü)."""
+        if not (kategori or source or effective_on):
+            return None
+        result = set()
+        for position, metadata in enumerate(self.metadatas):
+            if kategori and metadata.get("kategori") != kategori:
+                continue
+            if source and metadata.get("source") != source:
+                continue
+            # Tarihler ISO biçiminde (YYYY-MM-DD) olduğu için metin karşılaştırması yeterlidir.
+            if effective_on and (metadata.get("effective_date") or "") > effective_on:
+                continue
+            result.add(position)
+        return result
+
+    def rank(self, text: str, allowed: Optional[Set[int]], limit: int) -> List[int]:
+        """Sorguyu BM25 ile puanlayıp en iyi `limit` parçanın konumlarını döndürür."""
+        n = len(self.metadatas) if allowed is None else len(allowed)
+        scores: Dict[int, float] = {}
+        for term, weight in Counter(tokenize(text)).items():
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            if allowed is not None:
+                postings = [p for p in postings if p[0] in allowed]
+                if not postings:
+                    continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for position, tf in postings:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.lengths[position] / self.avg_length)
+                scores[position] = scores.get(position, 0.0) + weight * idf * tf * (BM25_K1 + 1) / (tf + norm)
+        return sorted(scores, key=lambda p: (-scores[p], p))[:limit]
+
+    def reference_hits(self, references: References, allowed: Optional[Set[int]]) -> Set[int]:
+        """Metadata'sı sorgudaki madde/ek/US-97 atıflarından biriyle eşleşen parçalar."""
+        hits = set()
+        if not references:
+            return hits
+        for position, metadata in enumerate(self.metadatas):
+            if allowed is not None and position not in allowed:
+                continue
+            if (metadata.get("madde_no") in references.maddeler
+                    or metadata.get("ek_no") in references.ekler
+                    or any(code == ref or code.startswith(f"{ref}.")
+                           for code in metadata.get("us97_codes") or [] for ref in references.us97_codes)):
+                hits.add(position)
+        return hits
+
+
+class _LegacyFaissView:
+    """Eski (pickle tabanlı) FAISS deposunu, NativeVectorStore ile aynı okuma arayüzüne uyarlar."""
+
+    def __init__(self, store):
+        self.store = store
+
+    def iter_chunks(self) -> Iterator[Tuple[int, str, Dict[str, Any]]]:
+        ids = self.store.index_to_docstore_id
+        for position in range(len(ids)):
+            doc = self.store.docstore.search(ids[position])
+            yield position, doc.page_content, doc.metadata
+
+    def get_documents(self, positions: Sequence[int]) -> List[Document]:
+        ids = self.store.index_to_docstore_id
+        return [self.store.docstore.search(ids[p]) for p in positions]
+
+    def dense_rank(self, vector: List[float], allowed: Optional[Set[int]], limit: int) -> List[int]:
+        """FAISS sıralaması; filtre varsa arama izin verilen kimliklerle sınırlandırılır."""
+        import faiss
+        import numpy as np
+
+        index = self.store.index
+        query = np.array([vector], dtype=np.float32)
+        if getattr(self.store, "_normalize_L2", False):
+            faiss.normalize_L2(query)
+        if allowed is None:
+            _, indices = index.search(query, limit)
+        else:
+            try:
+                selector = faiss.IDSelectorBatch(np.fromiter(allowed, dtype=np.int64, count=len(allowed)))
+                _, indices = index.search(query, limit, params=faiss.SearchParameters(sel=selector))
+            except (AttributeError, TypeError, RuntimeError):
+                # Seçici desteklemeyen index türleri: tüm index taranır, izin verilmeyenler atlanır.
+                _, indices = index.search(query, index.ntotal)
+                return [int(i) for i in indices[0] if i in allowed][:limit]
+        return [int(i) for i in indices[0] if i >= 0]
+
+
+class HybridRetriever:
+    """Bir vektör deposu ile onun üzerinde kurulan sözcüksel indeksi birlikte sorgular."""
+
+    def __init__(self, store):
+        self.store = store
+        if isinstance(store, NativeVectorStore):
+            self.view = store
+        elif hasattr(store, "index_to_docstore_id"):
+            self.view = _LegacyFaissView(store)
+        else:
+            # Benchmark stub'ları gibi parçalarına erişilemeyen depolarda sadece yoğun arama yapılır.
+            self.view = None
+        self.lexical = LexicalIndex(self.view.iter_chunks()) if self.view is not None else None
+
+    def has_documents(self, kategori: Optional[str] = None, source: Optional[str] = None,
+                      effective_on: Optional[str] = None) -> bool:
+        """Filtrelere uyan en az bir parça olup olmadığını döndürür."""
+        if self.lexical is None:
+            return True
+        allowed = self.lexical.allowed(kategori=kategori, source=source, effective_on=effective_on)
+        return allowed is None or bool(allowed)
+
+    def _fuse(self, vector: List[float], query: str, lexical_query: Optional[str], k: int,
+              filters: Dict[str, Optional[str]]) -> HybridResult:
+        lexical_query = lexical_query or query
+        allowed = self.lexical.allowed(**filters)
+        if allowed is not None and not allowed:
+            return HybridResult([], 0)
+
+        dense = self.view.dense_rank(vector, allowed, CANDIDATE_K)
+        lexical = self.lexical.rank(lexical_query, allowed, CANDIDATE_K)
+        hits = self.lexical.reference_hits(extract_references(lexical_query), allowed)
+        # Atıf eşleşmeleri kendi içinde sözcüksel sıraya göre, sıralamada olmayanlar sona dizilir.
+        lexical_order = {position: rank for rank, position in enumerate(lexical)}
+        references = sorted(hits, key=lambda p: (lexical_order.get(p, len(lexical_order)), p))[:CANDIDATE_K]
+
+        scores = _rrf([dense, lexical, references], [1.0, 1.0, REFERENCE_WEIGHT])
+        top = sorted(scores, key=lambda p: (-scores[p], p))[:k]
+        consensus = len(set(top) & set(dense[:k]) & set(lexical[:k]))
+        return HybridResult(self.view.get_documents(top), consensus)
+
+    def search(self, query: str, k: int, lexical_query: Optional[str] = None, kategori: Optional[str] = None,
+               source: Optional[str] = None, effective_on: Optional[str] = None) -> HybridResult:
+        """
+        `query` ile hibrit arama yapar. `lexical_query` verilirse BM25 ve atıf
+        eşleşmesi için bu metin kullanılır (örn: kullanıcının ham sorgusu eklenerek).
+        """
+        if self.lexical is None:
+            return HybridResult(self.store.similarity_search(query, k=k), 0)
+        vector = self.store.embeddings.embed_query(query)
+        filters = dict(kategori=kategori, source=source, effective_on=effective_on)
+        return self._fuse(vector, query, lexical_query, k, filters)
+
+    async def asearch(self, query: str, k: int, lexical_query: Optional[str] = None, kategori: Optional[str] = None,
+                      source: Optional[str] = None, effective_on: Optional[str] = None) -> HybridResult:
+        """`search` metodunun asenkron karşılığı."""
+        if self.lexical is None:
+            return HybridResult(await self.store.asimilarity_search(query, k=k), 0)
+        vector = await self.store.embeddings.aembed_query(query)
+        filters = dict(kategori=kategori, source=source, effective_on=effective_on)
+        return self._fuse(vector, query, lexical_query, k, filters)
+
+
+_retriever: Optional[HybridRetriever] = None
+_lock = threading.Lock()
+
+
+def _retriever_for(store) -> HybridRetriever:
+    global _retriever
+    retriever = _retriever
+    if retriever is not None and retriever.store is store:
+        return retriever
+    with _lock:
+        if _retriever is None or _retriever.store is not store:
+            logging.info("   > Hibrit arama için sözcüksel (BM25) indeks oluşturuluyor...")
+            _retriever = HybridRetriever(store)
+        return _retriever
+
+
+def get_hybrid_retriever() -> HybridRetriever:
+    """
+    Paylaşılan vektör deposu için hibrit arayıcıyı döndürür. Depo yeniden
+    yüklendiyse sözcüksel indeks yeni depo üzerinde tekrar kurulur.
+    """
+    return _retriever_for(get_vector_store())
+
+
+async def aget_hybrid_retriever() -> HybridRetriever:
+    """`get_hybrid_retriever` fonksiyonunun asenkron karşılığı."""
+    store = await aget_vector_store()
+    retriever = _retriever
+    if retriever is not None and retriever.store is store:
+        return retriever
+    # İndeks kurulumu tüm parçaları tokenize ettiğinden olay döngüsünü bloklamamak için thread'de yapılır.
+    return await asyncio.to_thread(_retriever_for, store)
@@ -0,0 +1,236 @@
+# graph/investment_classifier.py
+"""
+Yatırım türünü LLM'e gitmeden, kesin verilerden belirleyen kural tabanlı sınıflandırıcı.
+
+Kullanılan veriler:
+- Mevzuat denetçisinin bayrakları: EK-4 (yasaklı), EK-3 (büyük ölçekli),
+  EK-2B (bölgesel uygunluk), yatırım konusunun US-97 sektör kodu ve EK-2A
+  sıra numarası (EK-2B sektörleri bu numarayla listeler).
+- EK-4'ün "TEŞVİK EDİLMEYECEK YATIRIMLAR" konuları ve EK-5 demir-çelik ürünleri.
+- Madde 17 öncelikli yatırım konuları ile analiz tarihinde yürürlükte olan
+  annotations.json kuralları.
+
+Kurallar, yatırım türü zincirinin istemindeki karar adımlarını aynı sırayla
+uygular (öncelikli -> kapsam dışı -> büyük ölçekli/stratejik -> bölgesel ->
+genel). Bir adım kesin olarak cevaplanamıyorsa (konu öncelikli yatırım veya
+EK-4 konusu olabilir, tutar stratejik yatırım incelemesi gerektirir, denetim
+verisi eksik ya da bayraklar çelişkili) sınıflandırıcı karar vermez ve LLM'e
+düşme gerekçesini döndürür. Konu eşleştirmesi bilinçli olarak geniştir:
+yanlış bir eşleşme sadece bir LLM çağrısına mal olur, kaçırılan bir eşleşme
+ise yanlış bir karara yol açar.
+"""
+import threading
+from datetime import date
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+from graph.annotation_store import get_annotation_store
+from graph.chains.investment_type_analyzer import InvestmentTypeAnalysis
+from graph.core.text import tokenize
+from graph.mevzuat_denetcisi import MevzuatDenetcisi, get_mevzuat_denetcisi
+
+# Zincir isteminin 3. adımındaki stratejik yatırım incelemesi eşiği (TL). Bu
+# tutarın üzerindeki yatırımların stratejik sayılıp sayılmayacağı Madde 8'deki
+# ithalat kriterlerine bağlıdır ve LLM'e bırakılır.
+STRATEGIC_REVIEW_AMOUNT = 500_000_000
+
+# Madde 17'deki öncelikli yatırım konularını işaret eden ifadeler. Bir ifadenin
+# tüm kelimeleri (köklenmiş) konuda geçiyorsa konu öncelikli yatırım adayıdır.
+MADDE_17_PHRASES = (
+    "denizyolu", "deniz yolu", "deniz taşımacılığı", "demiryolu", "demir yolu", "test merkezi", "rüzgar tüneli",
+    "turizm", "otel", "konaklama", "termal", "tatil köyü", "fuar", "ilaç", "onkoloji", "kan ürünleri",
+    "biyoteknoloji", "savunma", "havacılık", "uzay", "maden", "madencilik", "mermer", "ocak", "taş ocağı",
+    "eğitim", "okul", "ilkokul", "ortaokul", "lise", "ar-ge", "arge",
+)
+
+# annotations.json'daki öncelikli yatırım kurallarının kapsadığı konular;
+# sadece kural analiz tarihinde yürürlükteyse dikkate alınır.
+ANNOTATION_PRIORITY_PHRASES = {
+    "ONCELIKLI_YATIRIM_OTOMOTIV_GENISLEMESI": ("otomotiv", "motorlu kara taşıtı", "taşıt", "motor", "aksam"),
+    "ONCELIKLI_YATIRIM_YERLI_MADEN_ENERJI_GENISLEMESI": ("linyit", "kömür", "yerli maden", "elektrik üretimi"),
+    "ONCELIKLI_YATIRIM_TURIZM_DARALTILMASI": ("turizm", "otel", "konaklama", "termal"),
+    "ONCELIKLI_YATIRIM_EGITIM_GENISLETILMESI": ("kreş", "gündüz bakımevi", "okul öncesi", "okul", "eğitim"),
+    "ONCELIKLI_YATIRIM_ENERJI_VERIMLILIGI_EKLENMESI": ("enerji verimliliği", "enerji tasarrufu"),
+    "ONCELIKLI_YATIRIM_ATIK_ISI_EKLENMESI": ("atık ısı",),
+    "ONCELIKLI_YATIRIM_LNG_DEPOLAMA_EKLENMESI": ("lng", "sıvılaştırılmış doğal gaz", "doğal gaz depolama", "doğalgaz depolama"),
+    "EK4_SAGLIK_TESVIK_KAPSAM_DEGISIKLIGI": ("sağlık", "hastane", "tıp merkezi", "klinik", "poliklinik"),
+}
+
+# EK-4 konu metinlerinde her konuda geçen, ayırt edici olmayan kelimeler (köklenmiş biçimleri kullanılır).
+EK4_GENERIC_WORDS = (
+    "üretim", "üretimi", "yönelik", "tesis", "tesisi", "işletme", "işletmeler", "hizmet", "hizmetleri",
+    "faaliyet", "faaliyetleri", "işleme", "merkez", "merkezi", "sanayi", "imalat", "fabrika", "kapsamında", "dışında",
+    "dışındaki", "kalan", "cinsi", "modernizasyon", "ürün", "ürünleri", "ürünlerinin", "milyon", "türk",
+    "lirası", "lirasının", "üzerindeki", "altında", "altındaki", "kapasite", "kapasitesine", "sahip", "ton",
+    "gün", "belgeli", "özel", "yeni", "genel", "ülke", "yerli", "ait", "kamu", "alan", "alanı", "asgari",
+)
+
+
+def _phrase_stems(phrases: Iterable[str]) -> Tuple[FrozenSet[str], ...]:
+    return tuple(stems for stems in (frozenset(tokenize(phrase)) for phrase in phrases) if stems)
+
+
+def _matches_any(topic_stems: FrozenSet[str], phrases: Tuple[FrozenSet[str], ...]) -> bool:
+    return any(stems <= topic_stems for stems in phrases)
+
+
+class RuleDecision(NamedTuple):
+    """Kural tabanlı sınıflandırmanın sonucu."""
+    # Kurallar kesin bir sonuç verdiyse analiz; LLM'e düşülecekse None.
+    analysis: Optional[InvestmentTypeAnalysis]
+    # Uygulanan kuralın (veya LLM'e düşme gerekçesinin) kısa adı; metriklerde etiket olarak kullanılır.
+    rule: str
+
+
+class InvestmentTypeClassifier:
+    """Denetim bayrakları ve mevzuat eklerinden yatırım türünü belirleyen kural kümesi."""
+
+    def __init__(self, denetci: MevzuatDenetcisi):
+        self.denetci = denetci
+        self._madde17 = _phrase_stems(MADDE_17_PHRASES)
+        self._annotation_priority = {rule_id: _phrase_stems(phrases)
+                                     for rule_id, phrases in ANNOTATION_PRIORITY_PHRASES.items()}
+        self._ek4_topics = self._build_ek4_topics()
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {}
+
+    def _build_ek4_topics(self) -> List[Tuple[str, FrozenSet[str]]]:
+        """EK-4 'teşvik edilmeyecek' konuları: (konu metni, ayırt edici kökler). EK-5 ürünleri demir-çelik konusuna eklenir."""
+        generic = frozenset(tokenize(" ".join(EK4_GENERIC_WORDS)))
+        ek5_stems = frozenset(
+            stem_ for product in (self.denetci.ek5_data or {}).get("ürünler", [])
+            for stem_ in tokenize(product.get("Ürün", ""))
+        )
+        topics = []
+        for bolum in (self.denetci.ek4_data or {}).get("bölümler", []):
+            if bolum.get("başlık") != "TEŞVİK EDİLMEYECEK YATIRIMLAR":
+                continue
+            for kategori in bolum.get("kategoriler", []):
+                for konu in kategori.get("konular", []):
+                    text = konu.get("konu", "") if isinstance(konu, dict) else konu
+                    if not isinstance(text, str) or not text:
+                        continue
+                    stems = frozenset(tokenize(text))
+                    if "ek-5" in text.lower().replace("’", "'"):
+                        stems |= ek5_stems
+                    stems -= generic
+                    if stems:
+                        topics.append((text, stems))
+        return topics
+
+    def _ek4_topic(self, topic_stems: FrozenSet[str]) -> Optional[str]:
+        """Konuyla ortak ayırt edici kelimesi olan ilk EK-4 konusunu döndürür."""
+        for text, stems in self._ek4_topics:
+            if topic_stems & stems:
+                return text
+        return None
+
+    def _priority_candidate(self, topic_stems: FrozenSet[str], active_rule_ids: FrozenSet[str]) -> bool:
+        if _matches_any(topic_stems, self._madde17):
+            return True
+        return any(_matches_any(topic_stems, phrases)
+                   for rule_id, phrases in self._annotation_priority.items() if rule_id in active_rule_ids)
+
+    def classify(self, entities, flags: Dict[str, Optional[bool]], active_rule_ids: Iterable[str] = (),
+                 sector_number: Optional[str] = None) -> RuleDecision:
+        """
+        Yatırım türünü kurallarla belirler. `flags`, mevzuat denetçisinin state'e
+        yazdığı `is_prohibited`, `is_large_scale` ve `is_regionally_eligible`
+        anahtarlarıdır; `active_rule_ids` analiz tarihinde yürürlükteki kurallardır.
+        `sector_number`, konunun EK-2A sıra numarasıdır; EK-2B adımları sadece bu
+        numarayla karar verir (US-97 kodu EK-2B numaralarıyla karşılaştırılamaz).
+        """
+        topic = entities.investment_topic or ""
+        sector_code = entities.investment_sector_code
+        amount = entities.investment_amount or 0.0
+        topic_stems = frozenset(tokenize(topic))
+
+        if any(flags.get(name) is None for name in ("is_prohibited", "is_large_scale", "is_regionally_eligible")):
+            return RuleDecision(None, "missing_flags")
+        if not sector_code:
+            return RuleDecision(None, "unknown_sector")
+        # --- ADIM 1: Öncelikli yatırım ---
+        # Yürürlükteki kurallar sadece konularıyla eşleşen yatırımlar için dikkate alınır.
+        if self._priority_candidate(topic_stems, frozenset(active_rule_ids)):
+            return RuleDecision(None, "priority_candidate")
+
+        # --- ADIM 2: Kapsam dışı ---
+        if flags["is_prohibited"]:
+            if flags["is_large_scale"] or flags["is_regionally_eligible"]:
+                return RuleDecision(None, "conflicting_flags")
+            return RuleDecision(InvestmentTypeAnalysis(
+                investment_type="Kapsam Dışı",
+                reasoning=(f"'{topic}' yatırımının sektör kodu ({sector_code}), EK-4'teki teşvik edilmeyecek "
+                           f"yatırımlar listesinde yer almaktadır. Bu nedenle yatırım teşvik kapsamı dışındadır."),
+                legal_basis="EK-4 (Teşvik Edilmeyecek Yatırımlar), Madde 4/2",
+            ), "prohibited")
+        # EK-4 kodsuz konular içerir; konu bu listedeki bir konuya benziyorsa şartlar LLM ile incelenir.
+        if self._ek4_topic(topic_stems):
+            return RuleDecision(None, "ek4_topic")
+
+        # --- ADIM 3: Büyük ölçekli ve stratejik yatırım ---
+        if amount > STRATEGIC_REVIEW_AMOUNT:
+            return RuleDecision(None, "strategic_candidate")
+        if flags["is_large_scale"]:
+            threshold = self.denetci.large_scale_threshold(sector_code)
+            threshold_text = f" EK-3'teki asgari tutar olan {threshold:,.0f} TL'yi" if threshold else " EK-3'teki asgari tutarı"
+            return RuleDecision(InvestmentTypeAnalysis(
+                investment_type="Büyük Ölçekli Yatırım",
+                reasoning=(f"'{topic}' yatırımı (sektör kodu {sector_code}) teşvik edilmeyecek yatırımlar arasında "
+                           f"değildir ve {amount:,.0f} TL tutarıyla{threshold_text} karşılamaktadır."),
+                legal_basis="Madde 4/4, EK-3",
+            ), "large_scale")
+
+        # --- ADIM 4: Bölgesel teşvik ---
+        # EK-2B kararları EK-2A sıra numarasıyla verilir; numara yoksa veya denetim
+        # bayrağı bu numarayla yeniden yapılan kontrolle uyuşmuyorsa LLM'e gidilir.
+        region = entities.investment_region
+        if not sector_number:
+            return RuleDecision(None, "unknown_sector_number")
+        if not self.denetci.knows_province(region):
+            return RuleDecision(None, "unknown_province")
+        if self.denetci.check_regional_eligibility(sector_number, region) != bool(flags["is_regionally_eligible"]):
+            return RuleDecision(None, "conflicting_flags")
+        if flags["is_regionally_eligible"]:
+            return RuleDecision(InvestmentTypeAnalysis(
+                investment_type="Bölgesel Teşvik",
+                reasoning=(f"'{topic}' yatırımı (sektör kodu {sector_code}, EK-2A sıra no {sector_number}) teşvik edilmeyecek "
+                           f"ve büyük ölçekli yatırımlar arasında değildir; EK-2B'de {region} ili için desteklenen sektörler arasında yer almaktadır."),
+                legal_basis="Madde 4/3, EK-2A, EK-2B",
+            ), "regional")
+
+        # --- ADIM 5: Genel teşvik ---
+        # Bölgesel uygunluğun olumsuz olması, ancak hem il hem sektör numarası EK-2B'de bulunuyorsa kesin bir bilgidir.
+        if not self.denetci.is_listed_in_ek2b(sector_number):
+            return RuleDecision(None, "sector_not_in_ek2b")
+        return RuleDecision(InvestmentTypeAnalysis(
+            investment_type="Genel Teşvik",
+            reasoning=(f"'{topic}' yatırımı (sektör kodu {sector_code}, EK-2A sıra no {sector_number}) öncelikli, teşvik edilmeyecek, büyük ölçekli "
+                       f"veya stratejik yatırım kriterlerini karşılamamakta ve EK-2B'de {region} ili için desteklenen "
+                       f"sektörler arasında yer almamaktadır. Bu nedenle genel teşvik uygulamalarından yararlanabilir."),
+            legal_basis="Madde 4/2",
+        ), "general")
+
+    def record(self, decision: RuleDecision) -> None:
+        """Kural / LLM yolu sayaçlarını günceller."""
+        key = f"{'rules' if decision.analysis is not None else 'llm'}:{decision.rule}"
+        with self._lock:
+            self.stats[key] = self.stats.get(key, 0) + 1
+
+
+def active_rule_ids_on(on_date: date) -> FrozenSet[str]:
+    """Verilen tarihte yürürlükte olan annotations.json kurallarının kimlikleri."""
+    return frozenset(rule.change_id for rule in get_annotation_store().rules_on(on_date).active)
+
+
+_classifier: Optional[InvestmentTypeClassifier] = None
+_lock = threading.Lock()
+
+
+def get_investment_type_classifier() -> InvestmentTypeClassifier:
+    """Süreç genelinde paylaşılan yatırım türü sınıflandırıcısını döndürür."""
+    global _classifier
+    if _classifier is None:
+        with _lock:
+            if _classifier is None:
+                _classifier = InvestmentTypeClassifier(get_mevzuat_denetcisi())
+    return _classifier
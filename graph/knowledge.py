@@ -4,6 +4,9 @@ Bu dosya, Türkiye'deki yatırım teşvikleri için zaman içinde değişen krit
 içeren merkezi bir bilgi bankası (knowledge base) görevi görür.
 Bu veriler, "lehe olan hükümlerin" deterministik olarak kod ile hesaplanmasını
 sağlayarak LLM hatalarını önler.
+
+Versiyonlar arası miras ve tarih bazlı sorgular graph/knowledge_resolver.py
+tarafından yapılır (`snapshot_for`, `region_of`, `supports_for`).
 """
 
 # Önemli mevzuat değişikliklerinin yürürlüğe girdiği tarihler ve ilgili Karar Sayıları
@@ -0,0 +1,109 @@
+# graph/knowledge_resolver.py
+"""
+graph/knowledge.py'deki sürümlü (delta) tanımları, her mevzuat versiyonu için
+tam ve değiştirilemez anlık görüntülere (snapshot) dönüştüren modül.
+
+knowledge.py'de her versiyon sadece değişen şehirleri/destekleri içerir ve
+bir önceki versiyondan miras alır. Bu miras, modül yüklenirken bir kez
+uygulanır; bir tarih için yapılan sorgu, sıralı versiyon tarihleri üzerinde
+tek bir `bisect` ile ilgili anlık görüntüyü döndürür.
+"""
+from bisect import bisect_right
+from datetime import date, datetime
+from types import MappingProxyType
+from typing import Dict, List, Mapping, NamedTuple, Optional, Union
+
+from graph.core.text import turkish_casefold
+from graph.knowledge import REGION_DEFINITIONS, SUPPORT_DEFINITIONS, VERSION_DATES
+
+DateLike = Union[date, datetime, str, None]
+
+
+class KnowledgeSnapshot(NamedTuple):
+    """Belirli bir mevzuat versiyonunda geçerli olan tam bölge ve destek tabloları."""
+    effective_date: date
+    decision: Optional[str]
+    # il adı -> bölge numarası ("1".."6")
+    regions: Mapping[str, str]
+    # bölge numarası -> destek adı -> destek parametreleri
+    supports: Mapping[str, Mapping[str, Mapping[str, object]]]
+    # katlanmış il adı -> knowledge.py'deki yazımı
+    city_index: Mapping[str, str]
+
+
+def _to_date(value: DateLike) -> date:
+    if value is None:
+        return date.today()
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value)[:10], "%Y-%m-%d").date()
+
+
+def _freeze_supports(supports: Dict[str, Dict[str, Dict[str, object]]]):
+    return MappingProxyType({
+        region: MappingProxyType({name: MappingProxyType(dict(params)) for name, params in items.items()})
+        for region, items in supports.items()
+    })
+
+
+def _build_snapshots() -> List[KnowledgeSnapshot]:
+    """Delta tanımlarını sırayla uygulayarak her versiyon için tam tabloları üretir."""
+    decisions = {_to_date(value): key for key, value in VERSION_DATES.items()}
+    version_dates = sorted(
+        set(decisions) | {_to_date(d) for d in REGION_DEFINITIONS} | {_to_date(d) for d in SUPPORT_DEFINITIONS}
+    )
+    region_deltas = {_to_date(d): delta for d, delta in REGION_DEFINITIONS.items()}
+    support_deltas = {_to_date(d): delta for d, delta in SUPPORT_DEFINITIONS.items()}
+
+    regions: Dict[str, str] = {}
+    supports: Dict[str, Dict[str, Dict[str, object]]] = {}
+    snapshots = []
+    for version_date in version_dates:
+        regions.update(region_deltas.get(version_date, {}))
+        for region, items in support_deltas.get(version_date, {}).items():
+            region_supports = supports.setdefault(region, {})
+            for name, params in items.items():
+                # Destek parametreleri alan bazında miras alınır; sadece değişen alanlar yazılabilir.
+                region_supports[name] = {**region_supports.get(name, {}), **params}
+
+        snapshots.append(KnowledgeSnapshot(
+            effective_date=version_date,
+            decision=decisions.get(version_date),
+            regions=MappingProxyType(dict(regions)),
+            supports=_freeze_supports(supports),
+            city_index=MappingProxyType({turkish_casefold(city): city for city in regions}),
+        ))
+    return snapshots
+
+
+SNAPSHOTS: List[KnowledgeSnapshot] = _build_snapshots()
+_SNAPSHOT_DATES: List[date] = [snapshot.effective_date for snapshot in SNAPSHOTS]
+
+
+def snapshot_for(on_date: DateLike = None) -> Optional[KnowledgeSnapshot]:
+    """
+    Verilen tarihte yürürlükte olan mevzuat versiyonunun anlık görüntüsünü
+    döndürür. Tarih verilmezse bugün kullanılır; ilk versiyondan önceki
+    tarihler için None döner.
+    """
+    index = bisect_right(_SNAPSHOT_DATES, _to_date(on_date)) - 1
+    return SNAPSHOTS[index] if index >= 0 else None
+
+
+def region_of(city: str, on_date: DateLike = None) -> Optional[str]:
+    """Bir ilin verilen tarihteki teşvik bölgesini ("1".."6") döndürür; bulunamazsa None."""
+    snapshot = snapshot_for(on_date)
+    if snapshot is None or not city:
+        return None
+    canonical = snapshot.city_index.get(turkish_casefold(city).strip())
+    return snapshot.regions[canonical] if canonical else None
+
+
+def supports_for(region: Union[str, int], on_date: DateLike = None) -> Mapping[str, Mapping[str, object]]:
+    """Bir bölgenin verilen tarihteki bölgesel destek tablosunu döndürür; yoksa boş tablo."""
+    snapshot = snapshot_for(on_date)
+    if snapshot is None:
+        return MappingProxyType({})
+    return snapshot.supports.get(str(region).strip(), MappingProxyType({}))
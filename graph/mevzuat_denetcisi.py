@@ -1,6 +1,14 @@
 import json
+import re
+import threading
 from pathlib import Path
-from typing import Optional, Any
+from typing import Optional, Any, Dict, FrozenSet, Iterable, List, Tuple
+
+from graph.core.text import turkish_casefold
+from graph.sector_matcher import SectorCandidate, SectorMatcher
+
+# EK metinlerinde sektör kodları '(US-97:15.61)' biçiminde gömülüdür.
+US97_PATTERN = re.compile(r"US-97\s*:\s*(\d+(?:\.\d+)*)")
 
 class MevzuatDenetcisi:
     """
@@ -15,6 +23,8 @@ class MevzuatDenetcisi:
         self.ek3_data = self._load_json(data_path / "ek-3.json")
         self.ek4_data = self._load_json(data_path / "ek-4.json")
         self.ek5_data = self._load_json(data_path / "ek-5.json")
+        self._build_indexes()
+        self.sector_matcher = SectorMatcher.from_ek2a(self.ek2a_data)
 
     def _load_json(self, file_path: Path) -> Optional[Any]:
         """Verilen yoldaki JSON dosyasını güvenli bir şekilde yükler."""
@@ -26,102 +36,191 @@ class MevzuatDenetcisi:
             print(f"!!! KRİTİK HATA: {file_path} dosyası okunamadı. Hata Tipi: {type(e).__name__}, Mesaj: {e}")
             return None
 
+    def match_sector(self, topic: str) -> Optional[SectorCandidate]:
+        """
+        EK-2A verisini kullanarak, verilen yatırım konusuna en çok uyan sektörü
+        bulur. Aday hem US-97 kodunu (EK-3/EK-4) hem de EK-2A sıra numarasını
+        (EK-2B) taşır.
+        """
+        return self.sector_matcher.best(topic or "")
+
+    def sector_by_number(self, sektor_no: str) -> Optional[SectorCandidate]:
+        """EK-2A sıra numarasıyla sektörü (US-97 kodu ve adıyla) döndürür."""
+        return self.sector_matcher.by_row(sektor_no) if sektor_no else None
+
     def get_sektor_kodu_from_description(self, topic: str) -> Optional[str]:
         """
         EK-2A verisini kullanarak, verilen yatırım konusuna en çok uyan
         sektörün US-97 kodunu bulur.
         """
-        if not self.ek2a_data or "sektörler" not in self.ek2a_data:
-            return None
-        
-        topic_words = set(topic.lower().strip().split())
-        for sector in self.ek2a_data.get("sektörler", []):
-            sector_name_words = set(sector.get("SEKTÖR ADI", "").lower().split())
-            
-            # Kullanıcının girdiği kelimelerden herhangi biri sektör adında geçiyorsa eşleştir.
-            if topic_words & sector_name_words: # Kesişim kontrolü
-                return sector.get("US-97 Kodu")
-        return None
-
-    def check_regional_eligibility(self, sektor_kodu: str, il_adi: str) -> bool:
+        candidate = self.match_sector(topic)
+        return candidate.code if candidate else None
+
+    def get_sektor_no_from_description(self, topic: str) -> Optional[str]:
+        """Yatırım konusuna en çok uyan sektörün EK-2A sıra numarasını (EK-2B'deki numara) bulur."""
+        candidate = self.match_sector(topic)
+        return candidate.row if candidate else None
+
+    def find_sector_candidates(self, topic: str, top_k: int = 5) -> List[SectorCandidate]:
+        """Yatırım konusu için puanlı aday sektörlerin sıralı listesini döndürür."""
+        return self.sector_matcher.match(topic or "", top_k=top_k)
+
+    # --- ÖNCEDEN DERLENMİŞ İNDEKSLER ---
+    # Denetim fonksiyonları her çağrıda EK ağaçlarını taramak yerine, yükleme
+    # anında bir kez oluşturulan bu sözlük/küme yapılarına O(1) erişir.
+
+    @staticmethod
+    def _normalize_il(il_adi: str) -> str:
         """
-        Belirli bir sektör kodunun, belirli bir il için EK-2B'ye göre bölgesel
-        teşvike uygun olup olmadığını denetler.
+        İl adını karşılaştırma için normalize eder: 'Şanlıurfa (Merkez)' -> 'sanliurfa'.
+        Bilgi bankasıyla (graph/knowledge_resolver.py) aynı Türkçe katlamayı kullanır;
+        böylece 'sanliurfa' gibi yazımlar her iki tarafta da aynı ile eşleşir.
         """
-        if not self.ek2b_data or "tablo" not in self.ek2b_data or not sektor_kodu:
-            return False
-            
-        il_adi_normalized = il_adi.upper().strip()
-        # İsimlerdeki "İ" harfini "I" ya çevirerek eşleşmeyi garantile
-        il_adi_normalized = il_adi_normalized.replace('İ', 'I')
+        return turkish_casefold((il_adi or "").split('(')[0]).strip()
+
+    @staticmethod
+    def _extract_us97_codes(text: str) -> List[str]:
+        """Bir metin içindeki '(US-97:xx.xx)' işaretlerinden sektör kodlarını çıkarır."""
+        return US97_PATTERN.findall(text or "")
+
+    def _build_indexes(self) -> None:
+        """EK-2B, EK-3 ve EK-4 verilerinden arama indekslerini oluşturur."""
+        self._il_sektorleri = self._build_regional_index()
+        self._bolgesel_sektorler = frozenset().union(*self._il_sektorleri.values())
+        self._buyuk_olcek_esikleri = self._build_large_scale_index()
+        self._yasakli_kodlar = self._build_prohibited_index()
 
+    def _build_regional_index(self) -> Dict[str, FrozenSet[str]]:
+        """EK-2B: normalize il adı -> desteklenen sektörlerin EK-2A sıra numaraları kümesi."""
+        index: Dict[str, FrozenSet[str]] = {}
+        if not self.ek2b_data or "tablo" not in self.ek2b_data:
+            return index
         for satir in self.ek2b_data.get("tablo", {}).get("satirlar", []):
-            current_il = satir.get("İL ADI", "").upper().split('(')[0].strip()
-            current_il = current_il.replace('İ', 'I')
-            if current_il == il_adi_normalized:
-                sektor_numaralari_str = satir.get("SEKTÖR NUMARALARI", "")
-                return sektor_kodu in sektor_numaralari_str.split()
-        return False
+            il = self._normalize_il(satir.get("İL ADI") or "")
+            # Aynı il tabloda birden fazla kez geçerse ilk satır geçerlidir.
+            if il and il not in index:
+                index[il] = frozenset((satir.get("SEKTÖR NUMARALARI") or "").split())
+        return index
+
+    def _build_large_scale_index(self) -> Dict[str, float]:
+        """EK-3: US-97 kodu -> asgari sabit yatırım tutarı (TL). Alt yatırımlar dahildir."""
+        index: Dict[str, float] = {}
+
+        def add(text: str, million_tl) -> None:
+            # Tutarı belirtilmemiş (null) konular eşik olarak kullanılamaz.
+            if million_tl is None:
+                return
+            for kod in self._extract_us97_codes(text):
+                # Bir kod birden fazla yerde geçerse belgedeki ilk eşik geçerlidir.
+                index.setdefault(kod, float(million_tl) * 1_000_000)
+
+        if not self.ek3_data or "yatırımlar" not in self.ek3_data:
+            return index
+        for investment in self.ek3_data.get("yatırımlar", []):
+            add(investment.get("Yatırım Konusu", ""), investment.get("Asgari Sabit Yatırım Tutarı (Milyon TL)"))
+            # İç içe geçmiş alt yatırımlar (örn: Motorlu Kara Taşıtları)
+            for alt_yatirim in investment.get("Alt Yatırımlar", []) or []:
+                add(alt_yatirim.get("Konu", ""), alt_yatirim.get("Tutar (Milyon TL)"))
+        return index
+
+    def _build_prohibited_index(self) -> FrozenSet[str]:
+        """EK-4: 'TEŞVİK EDİLMEYECEK YATIRIMLAR' bölümünde geçen US-97 kodları."""
+        kodlar = set()
+        if not self.ek4_data:
+            return frozenset()
+        for bolum in self.ek4_data.get("bölümler", []):
+            if bolum.get("başlık") != "TEŞVİK EDİLMEYECEK YATIRIMLAR":
+                continue
+            for kategori in bolum.get("kategoriler", []):
+                for konu in kategori.get("konular", []):
+                    # Konu bir string veya dictionary olabilir
+                    konu_str = konu.get("konu", "") if isinstance(konu, dict) else konu
+                    if isinstance(konu_str, str):
+                        kodlar.update(self._extract_us97_codes(konu_str))
+        return frozenset(kodlar)
+
+    def check_regional_eligibility(self, sektor_no: str, il_adi: str) -> bool:
+        """
+        Belirli bir sektörün, belirli bir il için EK-2B'ye göre bölgesel
+        teşvike uygun olup olmadığını denetler. `sektor_no`, sektörün EK-2A
+        sıra numarasıdır (US-97 kodu değil); EK-2B sektörleri bu numarayla listeler.
+        """
+        if not sektor_no or not il_adi:
+            return False
+        return str(sektor_no).strip() in self._il_sektorleri.get(self._normalize_il(il_adi), frozenset())
+
+    def knows_province(self, il_adi: str) -> bool:
+        """İlin EK-2B tablosunda yer alıp almadığını döndürür (bölgesel denetimin güvenilirliği için)."""
+        return bool(il_adi) and self._normalize_il(il_adi) in self._il_sektorleri
+
+    def sectors_for_province(self, il_adi: str) -> Optional[FrozenSet[str]]:
+        """İlin EK-2B'de desteklenen sektörlerinin EK-2A sıra numaralarını döndürür; il EK-2B'de yoksa None."""
+        return self._il_sektorleri.get(self._normalize_il(il_adi)) if il_adi else None
+
+    def is_listed_in_ek2b(self, sektor_no: str) -> bool:
+        """EK-2A sıra numarasının EK-2B'de en az bir il için listelenip listelenmediğini döndürür."""
+        return bool(sektor_no) and str(sektor_no).strip() in self._bolgesel_sektorler
+
+    def large_scale_threshold(self, sektor_kodu: str) -> Optional[float]:
+        """Sektörün EK-3'teki asgari sabit yatırım tutarı (TL); sektör EK-3'te yoksa None."""
+        if not sektor_kodu:
+            return None
+        return self._buyuk_olcek_esikleri.get(str(sektor_kodu).strip())
 
     def check_large_scale_eligibility(self, sektor_kodu: str, amount: float) -> bool:
         """
         Belirli bir sektör ve yatırım tutarının EK-3'e göre Büyük Ölçekli Yatırım
         şartlarını karşılayıp karşılamadığını denetler.
         """
-        if not self.ek3_data or "yatırımlar" not in self.ek3_data or not sektor_kodu:
+        if not sektor_kodu:
             return False
-            
-        # EK-3'teki US-97 kodları metin içinde gizli, bu yüzden metin araması yapacağız
-        for investment in self.ek3_data.get("yatırımlar", []):
-            # Basit yatırım konuları
-            konu = investment.get("Yatırım Konusu", "")
-            if f"(US-97:{sektor_kodu})" in konu or f"US-97:{sektor_kodu}" in konu:
-                 if "Asgari Sabit Yatırım Tutarı (Milyon TL)" in investment:
-                    min_amount = float(investment["Asgari Sabit Yatırım Tutarı (Milyon TL)"]) * 1_000_000
-                    return amount >= min_amount
-
-            # İç içe geçmiş alt yatırımlar (örn: Motorlu Kara Taşıtları)
-            if "Alt Yatırımlar" in investment:
-                for alt_yatirim in investment.get("Alt Yatırımlar", []):
-                    alt_konu = alt_yatirim.get("Konu", "")
-                    if f"(US-97:{sektor_kodu})" in alt_konu or f"US-97:{sektor_kodu}" in alt_konu:
-                        min_amount = float(alt_yatirim.get("Tutar (Milyon TL)", 0)) * 1_000_000
-                        return amount >= min_amount
-        return False
+        min_amount = self._buyuk_olcek_esikleri.get(str(sektor_kodu).strip())
+        return min_amount is not None and (amount or 0.0) >= min_amount
 
     def check_prohibited_list(self, sektor_kodu: str) -> bool:
         """
         Belirli bir sektörün EK-4'e göre teşvik edilmeyenler listesinde
         olup olmadığını denetler.
         """
-        if not self.ek4_data or not sektor_kodu:
+        if not sektor_kodu:
             return False
+        return str(sektor_kodu).strip() in self._yasakli_kodlar
 
-        # EK-4'te yasaklı konular listeler halinde. Bu listelerde arama yap.
-        try:
-            for bolum in self.ek4_data.get("bölümler", []):
-                if bolum.get("başlık") == "TEŞVİK EDİLMEYECEK YATIRIMLAR":
-                    for kategori in bolum.get("kategoriler", []):
-                        for konu in kategori.get("konular", []):
-                            # Konu bir string veya dictionary olabilir
-                            konu_str = ""
-                            if isinstance(konu, dict):
-                                konu_str = konu.get("konu", "")
-                            elif isinstance(konu, str):
-                                konu_str = konu
-                            
-                            if f"(US-97:{sektor_kodu})" in konu_str or f"US-97:{sektor_kodu}" in konu_str:
-                                return True
-        except Exception:
-            # Karmaşık yapıda hata olursa güvenli tarafta kal
-            return False 
-        return False
-
-# Singleton instance
-mevzuat_denetcisi_instance = MevzuatDenetcisi()
-
-def get_mevzuat_denetcisi():
-    return mevzuat_denetcisi_instance
+    def audit_many(self, rows: Iterable[Tuple[str, str, str, float]]) -> List[Dict[str, bool]]:
+        """
+        (US-97 sektör kodu, EK-2A sıra no, il adı, yatırım tutarı) demetlerinden
+        oluşan bir listeyi toplu olarak denetler. Sonuçlar, `mevzuat_auditor_node`
+        düğümünün state'e yazdığı anahtarlarla, girdi sırasıyla döndürülür.
+        """
+        il_cache: Dict[str, FrozenSet[str]] = {}
+        results = []
+        for sektor_kodu, sektor_no, il_adi, amount in rows:
+            kod = str(sektor_kodu).strip() if sektor_kodu else ""
+            no = str(sektor_no).strip() if sektor_no else ""
+            sektorler = il_cache.get(il_adi)
+            if sektorler is None:
+                sektorler = self._il_sektorleri.get(self._normalize_il(il_adi or ""), frozenset())
+                il_cache[il_adi] = sektorler
+            min_amount = self._buyuk_olcek_esikleri.get(kod)
+            results.append({
+                "is_regionally_eligible": bool(no) and no in sektorler,
+                "is_large_scale": min_amount is not None and (amount or 0.0) >= min_amount,
+                "is_prohibited": kod in self._yasakli_kodlar,
+            })
+        return results
+
+# Singleton instance: EK dosyaları import sırasında değil, ilk denetimde yüklenir.
+_mevzuat_denetcisi: Optional[MevzuatDenetcisi] = None
+_lock = threading.Lock()
+
+def get_mevzuat_denetcisi() -> MevzuatDenetcisi:
+    """Süreç genelinde paylaşılan mevzuat denetçisini döndürür; ilk çağrıda oluşturur."""
+    global _mevzuat_denetcisi
+    if _mevzuat_denetcisi is None:
+        with _lock:
+            if _mevzuat_denetcisi is None:
+                _mevzuat_denetcisi = MevzuatDenetcisi()
+    return _mevzuat_denetcisi
 
 if __name__ == '__main__':
     # --- EK-4 DOSYASINI İZOLE TEST ETMEK İÇİN ÖZEL TEST BLOGU ---
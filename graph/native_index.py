@@ -0,0 +1,192 @@
+# graph/native_index.py
+"""
+Pickle kullanmayan, süreçler arasında paylaşılabilen yerel index biçimi.
+
+`FAISS.load_local` her süreçte tüm docstore'u pickle ile Python nesnelerine
+açar; aynı makinedeki her Streamlit/worker süreci corpus'un kendi kopyasını
+tutar. Bu biçimde index klasörü üç dosyadan oluşur:
+
+- header.json       : Biçim sürümü, parça sayısı, boyut ve embedding modeli.
+- vectors.f32       : Satır satır ham float32 vektörler (parça sayısı x boyut).
+                      Salt okunur memmap ile açılır; sayfalar işletim sisteminin
+                      önbelleğinden tüm süreçlerce paylaşılır.
+- documents.sqlite3 : Parça kimliği, metni ve metadata'sı (JSON). Dokümanlar
+                      sadece istendiklerinde, konumlarına göre okunur.
+
+Yükleme sırasında hiçbir pickle çalıştırılmaz ve corpus belleğe açılmaz.
+Dosyalar yazıldıktan sonra değiştirilmez; güncellemeler yeni bir klasöre
+yazılıp yerine konur (bkz. vector_db_builder.py).
+"""
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+HEADER_FILE = "header.json"
+VECTORS_FILE = "vectors.f32"
+DOCUMENTS_FILE = "documents.sqlite3"
+INDEX_FILES = (HEADER_FILE, VECTORS_FILE, DOCUMENTS_FILE)
+FORMAT_NAME = "mevzuat-native"
+FORMAT_VERSION = 1
+
+
+def is_native_index(folder: str) -> bool:
+    """Klasörde yerel biçimde bir index olup olmadığını döndürür."""
+    return os.path.exists(os.path.join(folder, HEADER_FILE))
+
+
+def write_native_index(folder: str, documents: Sequence[Document], vectors: Iterable[Sequence[float]],
+                       embedding_model: str) -> Dict[str, Any]:
+    """
+    Dokümanları ve (aynı sırada) vektörlerini `folder` klasörüne yerel biçimde
+    yazar. Vektörler akış halinde yazılır; tamamı bellekte tutulmaz.
+    """
+    os.makedirs(folder, exist_ok=True)
+    dimensions = None
+    count = 0
+    with open(os.path.join(folder, VECTORS_FILE), "wb") as f:
+        for vector in vectors:
+            row = np.asarray(vector, dtype=np.float32)
+            if dimensions is None:
+                dimensions = row.shape[0]
+            elif row.shape[0] != dimensions:
+                raise ValueError(f"Vektör boyutu tutarsız: {row.shape[0]} != {dimensions}")
+            row.tofile(f)
+            count += 1
+    if count != len(documents):
+        raise ValueError(f"Doküman ({len(documents)}) ve vektör ({count}) sayısı eşleşmiyor.")
+
+    conn = sqlite3.connect(os.path.join(folder, DOCUMENTS_FILE))
+    try:
+        conn.execute("CREATE TABLE chunks (position INTEGER PRIMARY KEY, id TEXT UNIQUE, text TEXT NOT NULL, metadata TEXT NOT NULL)")
+        conn.executemany(
+            "INSERT INTO chunks VALUES (?, ?, ?, ?)",
+            ((position, doc.id or str(position), doc.page_content, json.dumps(doc.metadata, ensure_ascii=False))
+             for position, doc in enumerate(documents)),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    header = {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "count": count,
+        "dimensions": dimensions or 0,
+        "dtype": "float32",
+        "embedding_model": embedding_model,
+    }
+    with open(os.path.join(folder, HEADER_FILE), "w", encoding="utf-8") as f:
+        json.dump(header, f, ensure_ascii=False, indent=2)
+    return header
+
+
+class NativeVectorStore:
+    """
+    Yerel biçimdeki index üzerinde, uygulamanın kullandığı benzerlik araması
+    arayüzünü (similarity_search/asimilarity_search) sağlayan salt okunur depo.
+    """
+
+    def __init__(self, folder: str, embeddings):
+        with open(os.path.join(folder, HEADER_FILE), "r", encoding="utf-8") as f:
+            self.header = json.load(f)
+        if self.header.get("format") != FORMAT_NAME or self.header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Desteklenmeyen index biçimi: {self.header.get('format')} v{self.header.get('version')}")
+        self.folder = folder
+        self.embeddings = embeddings
+        self.count = self.header["count"]
+        self.dimensions = self.header["dimensions"]
+
+        if self.count:
+            self._vectors = np.memmap(os.path.join(folder, VECTORS_FILE), dtype=np.float32, mode="r",
+                                      shape=(self.count, self.dimensions))
+        else:
+            self._vectors = np.zeros((0, self.dimensions), dtype=np.float32)
+        self._norms: Optional[np.ndarray] = None
+        # immutable=1: Dosya hiç değişmediği için kilit ve günlük (journal) dosyası kullanılmaz.
+        uri = f"file:{os.path.abspath(os.path.join(folder, DOCUMENTS_FILE))}?mode=ro&immutable=1"
+        self._conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _query(self, sql: str, params: Sequence = ()) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def iter_chunks(self) -> Iterator[Tuple[int, str, Dict[str, Any]]]:
+        """Tüm parçaları (konum, metin, metadata) olarak sırayla döndürür."""
+        for position, text, metadata in self._query("SELECT position, text, metadata FROM chunks ORDER BY position"):
+            yield position, text, json.loads(metadata)
+
+    def get_documents(self, positions: Sequence[int]) -> List[Document]:
+        """Verilen konumlardaki parçaları aynı sırayla Document olarak okur."""
+        if not positions:
+            return []
+        placeholders = ",".join("?" * len(positions))
+        rows = self._query(f"SELECT position, id, text, metadata FROM chunks WHERE position IN ({placeholders})",
+                           [int(p) for p in positions])
+        by_position = {row[0]: Document(page_content=row[2], metadata=json.loads(row[3]), id=row[1]) for row in rows}
+        return [by_position[int(p)] for p in positions if int(p) in by_position]
+
+    def id_positions(self) -> Dict[str, int]:
+        """Parça kimliği -> konum eşlemesi."""
+        return {chunk_id: position for position, chunk_id in self._query("SELECT position, id FROM chunks")}
+
+    def vector_at(self, position: int) -> np.ndarray:
+        return np.array(self._vectors[position])
+
+    def _squared_norms(self) -> np.ndarray:
+        # İlk aramada bir kez hesaplanır (yükleme sırasında vektörlere dokunulmaz).
+        if self._norms is None:
+            self._norms = np.einsum("ij,ij->i", self._vectors, self._vectors)
+        return self._norms
+
+    def search_by_vector(self, vector: Sequence[float], limit: int,
+                         allowed: Optional[Set[int]] = None) -> List[Tuple[int, float]]:
+        """
+        Sorgu vektörüne L2 uzaklığı en küçük `limit` parçayı (konum, uzaklık²)
+        olarak döndürür. `allowed` verilirse sadece bu konumlar taranır.
+        """
+        if not self.count or limit <= 0:
+            return []
+        query = np.asarray(vector, dtype=np.float32)
+        if allowed is None:
+            positions = None
+            distances = self._squared_norms() - 2.0 * (self._vectors @ query)
+        else:
+            if not allowed:
+                return []
+            positions = np.fromiter(sorted(allowed), dtype=np.int64, count=len(allowed))
+            distances = self._squared_norms()[positions] - 2.0 * (self._vectors[positions] @ query)
+        distances = distances + float(query @ query)
+
+        if limit < len(distances):
+            top = np.argpartition(distances, limit)[:limit]
+        else:
+            top = np.arange(len(distances))
+        top = top[np.argsort(distances[top], kind="stable")]
+        if positions is not None:
+            return [(int(positions[i]), float(distances[i])) for i in top]
+        return [(int(i), float(distances[i])) for i in top]
+
+    def dense_rank(self, vector: Sequence[float], allowed: Optional[Set[int]], limit: int) -> List[int]:
+        return [position for position, _ in self.search_by_vector(vector, limit, allowed)]
+
+    def similarity_search_with_score_by_vector(self, vector: Sequence[float], k: int = 4) -> List[Tuple[Document, float]]:
+        hits = self.search_by_vector(vector, k)
+        documents = self.get_documents([position for position, _ in hits])
+        return list(zip(documents, [score for _, score in hits]))
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs) -> List[Document]:
+        vector = self.embeddings.embed_query(query)
+        return [doc for doc, _ in self.similarity_search_with_score_by_vector(vector, k)]
+
+    async def asimilarity_search(self, query: str, k: int = 4, **kwargs) -> List[Document]:
+        vector = await self.embeddings.aembed_query(query)
+        return [doc for doc, _ in self.similarity_search_with_score_by_vector(vector, k)]
@@ -1,40 +1,62 @@
 import logging
+from graph.core.llm import raise_if_rate_limited
 from graph.state import GraphState
 from graph.chains.detail_extractor import get_detail_extractor_chain
 
 logging.basicConfig(level=logging.INFO, format='   > %(message)s')
 
+# Hata durumunda döndürülecek varsayılan boş nesne
+DEFAULT_RESPONSE = {"extracted_details": {}}
+
+def _prepare_inputs(state: GraphState):
+    """Zincir girdilerini hazırlar. Zincir çağrılmayacaksa None döndürür."""
+    # Girdilerin 'None' olmadığından emin ol
+    query = state.get("query", "")
+    if not query:
+        logging.info("   > Sorgu boş olduğu için detay çıkarımı atlanıyor.")
+        return None
+    return {"query": query}
+
+def _handle_response(response):
+    logging.info(f"   > Çıkarılan Detaylar: {response.dict()}")
+    return {"extracted_details": response}
+
 def detail_extractor_node(state: GraphState):
     """
-    Temporal Resolver'dan gelen direktifleri analiz eder ve bu direktiflerin
-    gerektirdiği spesifik detayları (lisans tarihi, başvuru tarihi vb.)
-    kullanıcı sorgusundan çıkarır. Hatalara karşı dayanıklıdır.
+    Zamana bağlı analiz için gereken spesifik detayları (referans tarihi vb.)
+    kullanıcı sorgusundan çıkarır. Sadece sorguya bağlı olduğu için grafikte
+    varlık çıkarımıyla paralel çalışır. Hatalara karşı dayanıklıdır.
     """
     logging.info("---NODE: Kritik Detaylar Çıkarılıyor---")
-    
-    # Hata durumunda döndürülecek varsayılan boş nesne
-    default_response = {"extracted_details": {}}
 
     try:
-        # Girdilerin 'None' olmadığından emin ol
-        query = state.get("query", "")
-        # ÖNEMLİ: temporal_directives state'inden al, tekil değil çoğul
-        temporal_directives = state.get("temporal_directives", "")
+        inputs = _prepare_inputs(state)
+        if inputs is None:
+            return DEFAULT_RESPONSE
 
-        # Eğer işlenecek direktif yoksa, boşuna LLM'i çağırma
-        if not temporal_directives:
-            logging.info("   > İşlenecek zamansal direktif bulunamadı. Atlanıyor.")
-            return default_response
+        chain = get_detail_extractor_chain()
+        response = chain.invoke(inputs)
+        return _handle_response(response)
+
+    except Exception as e:
+        raise_if_rate_limited(e)
+        logging.error(f"   > HATA: Detay çıkarımı sırasında bir zincir hatası oluştu: {e}")
+        return DEFAULT_RESPONSE
+
+async def adetail_extractor_node(state: GraphState):
+    """`detail_extractor_node` düğümünün asenkron (ainvoke) versiyonu."""
+    logging.info("---NODE: Kritik Detaylar Çıkarılıyor---")
+
+    try:
+        inputs = _prepare_inputs(state)
+        if inputs is None:
+            return DEFAULT_RESPONSE
 
         chain = get_detail_extractor_chain()
-        response = chain.invoke({
-            "query": query,
-            "temporal_directives": temporal_directives # çoğul olanı kullan
-        })
-        
-        logging.info(f"   > Çıkarılan Detaylar: {response.dict()}")
-        return {"extracted_details": response}
+        response = await chain.ainvoke(inputs)
+        return _handle_response(response)
 
     except Exception as e:
+        raise_if_rate_limited(e)
         logging.error(f"   > HATA: Detay çıkarımı sırasında bir zincir hatası oluştu: {e}")
-        return default_response 
\ No newline at end of file
+        return DEFAULT_RESPONSE
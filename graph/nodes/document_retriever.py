@@ -1,40 +1,84 @@
 import logging
-from typing import List
+from typing import List, Optional
 
 from langchain.schema import Document
-from langchain_community.vectorstores import FAISS
-from langchain_openai import OpenAIEmbeddings
 
+from graph.core.llm import raise_if_rate_limited
 from graph.state import GraphState
-
-# Sabitler
-DB_PATH = "mevzuat_veritabani"
+from graph.hybrid_retriever import get_hybrid_retriever, aget_hybrid_retriever
 
 logging.basicConfig(level=logging.INFO, format='   > %(message)s')
 
+# İndeks fıkra/bent/tablo satırı düzeyinde parçalı olduğu için (bkz. vector_db_builder.py)
+# bütün madde döndüren eski aramaya göre daha fazla, ama çok daha kısa parça alınır.
+RETRIEVAL_K = 10
+
+def _build_search_query(state: GraphState) -> Optional[str]:
+    """Arama sorgusunu oluşturur. Gerekli varlıklar yoksa None döndürür."""
+    entities = state.get("entities")
+    # Grafikte mevzuat denetimiyle paralel çalıştığı için yetersiz varlık kontrolü burada yapılır.
+    if not entities or not entities.investment_topic or not entities.investment_region:
+        logging.info("   > Yatırım konusu veya bölgesi bulunamadığı için doküman araması atlanıyor.")
+        return None
+
+    search_query = f"{entities.investment_topic} {entities.investment_region}"
+    logging.info(f"   > Vektör Veritabanı Arama Sorgusu: '{search_query}'")
+    return search_query
+
+def _lexical_query(state: GraphState, search_query: str) -> str:
+    """
+    Sözcüksel (BM25) arama ve atıf eşleşmesi için kullanıcının ham sorgusu da
+    eklenir; böylece "Madde 17" veya "EK-2B" gibi birebir atıflar kaçmaz.
+    """
+    return f"{search_query} {state.get('query') or ''}"
+
 def retrieve_documents_node(state: GraphState) -> dict:
     """
     Kullanıcının sorgusuna ve çıkarılan varlıklara dayanarak, önceden oluşturulmuş
-    olan FAISS vektör veritabanından ilgili mevzuat dokümanlarını alır.
+    olan vektör veritabanından ilgili mevzuat dokümanlarını hibrit
+    (yoğun + BM25) arama ile alır.
     """
     logging.info("---NODE: İlgili Dokümanlar Alınıyor---")
-    
-    entities = state["entities"]
-    
-    search_query = f"{entities.investment_topic} {entities.investment_region}"
-    logging.info(f"   > Vektör Veritabanı Arama Sorgusu: '{search_query}'")
+
+    search_query = _build_search_query(state)
+    if search_query is None:
+        return {"documents": []}
 
     try:
-        # Mevcut FAISS veritabanını yükle
-        embeddings = OpenAIEmbeddings()
-        vector_db = FAISS.load_local(DB_PATH, embeddings, allow_dangerous_deserialization=True)
+        # Süreç genelinde paylaşılan (önceden yüklenmiş) vektör veritabanı üzerindeki hibrit arayıcıyı al
+        retriever = get_hybrid_retriever()
 
-        # Benzerlik araması yap ve en ilgili dokümanları al
-        documents: List[Document] = vector_db.similarity_search(search_query, k=5)
+        # Yoğun ve sözcüksel sıralamaları birleştirerek en ilgili dokümanları al
+        documents: List[Document] = retriever.search(
+            search_query, k=RETRIEVAL_K, lexical_query=_lexical_query(state, search_query)
+        ).documents
         
         logging.info(f"   > {len(documents)} adet ilgili doküman bulundu.")
         return {"documents": documents}
 
     except Exception as e:
+        raise_if_rate_limited(e)
+        logging.error(f"   > HATA: Vektör veritabanı okunurken bir hata oluştu: {e}")
+        return {"documents": []}
+
+async def aretrieve_documents_node(state: GraphState) -> dict:
+    """`retrieve_documents_node` düğümünün asenkron versiyonu."""
+    logging.info("---NODE: İlgili Dokümanlar Alınıyor---")
+
+    search_query = _build_search_query(state)
+    if search_query is None:
+        return {"documents": []}
+
+    try:
+        retriever = await aget_hybrid_retriever()
+        documents: List[Document] = (await retriever.asearch(
+            search_query, k=RETRIEVAL_K, lexical_query=_lexical_query(state, search_query)
+        )).documents
+
+        logging.info(f"   > {len(documents)} adet ilgili doküman bulundu.")
+        return {"documents": documents}
+
+    except Exception as e:
+        raise_if_rate_limited(e)
         logging.error(f"   > HATA: Vektör veritabanı okunurken bir hata oluştu: {e}")
-        return {"documents": []} 
\ No newline at end of file
+        return {"documents": []}
@@ -4,10 +4,20 @@ from graph.chains.entity_extractor import get_entity_extractor_chain
 
 logging.basicConfig(level=logging.INFO, format='   > %(message)s')
 
+def _handle_response(response):
+    logging.info(f"Çıkarılan Varlıklar: {response}")
+    return {"entities": response}
+
 def entity_extractor_node(state: GraphState):
     """Sorgudan varlıkları (yatırım konusu, bölge, tutar) çıkarır."""
     logging.info("---NODE: Varlıklar Çıkarılıyor---")
     chain = get_entity_extractor_chain()
     response = chain.invoke({"query": state["query"]})
-    logging.info(f"Çıkarılan Varlıklar: {response}")
-    return {"entities": response} 
\ No newline at end of file
+    return _handle_response(response)
+
+async def aentity_extractor_node(state: GraphState):
+    """`entity_extractor_node` düğümünün asenkron (ainvoke) versiyonu."""
+    logging.info("---NODE: Varlıklar Çıkarılıyor---")
+    chain = get_entity_extractor_chain()
+    response = await chain.ainvoke({"query": state["query"]})
+    return _handle_response(response)
@@ -1,6 +1,7 @@
 # graph/nodes/final_response_synthesizer.py
 import logging
 from typing import Dict, Any
+from graph.core.llm import raise_if_rate_limited
 from graph.state import GraphState
 from graph.chains.final_response_synthesizer import get_final_response_synthesizer_chain
 from graph.chains.investment_type_analyzer import InvestmentTypeAnalysis
@@ -8,17 +9,11 @@ from graph.chains.support_analyzer import SupportAnalysis, SupportItem
 
 logging.basicConfig(level=logging.INFO, format='   > %(message)s')
 
-def final_response_synthesizer_node(state: GraphState) -> Dict[str, Any]:
+def _build_prompt_state(state: GraphState) -> Dict[str, Any]:
     """
-    Tüm analiz adımlarından gelen yapılandırılmış verileri, son kullanıcıya sunulacak,
-    kolay anlaşılır, profesyonel ve bütünlüklü bir metne dönüştürür.
-    
-    Bu düğüm, önceki adımlarda oluşabilecek hatalara karşı 'kurşun geçirmez' olacak şekilde
-    tasarlanmıştır. Önceki bir adımdan gelen veri 'None' ise, bunu güvenli bir şekilde
-    ele alır ve raporun ilgili bölümünü varsayılan bir metinle doldurur.
+    Önceki adımlardan gelen verileri, None değerlerine karşı korumalı olarak
+    rapor prompt'una verilecek tek bir sözlükte toplar.
     """
-    logging.info("---NODE: Nihai Rapor Oluşturuluyor---")
-
     # --- SAVUNMA MEKANİZMASI: None'a Karşı Koruma ---
     # Önceki adımlardan gelen Pydantic nesnelerini al. Eğer 'None' iseler,
     # raporun neden eksik olduğunu açıklayan varsayılan, güvenli bir nesne oluştur.
@@ -45,7 +40,7 @@ def final_response_synthesizer_node(state: GraphState) -> Dict[str, Any]:
     
     # Raporlama için kullanılacak tam state'i oluştur.
     # Burada sadece string'e çevrilebilen temel tipler olmalı.
-    final_state_for_prompt = {
+    return {
         "entities": state.get("entities", {}),
         "extracted_details": state.get("extracted_details", {}),
         "is_regionally_eligible": state.get("is_regionally_eligible", "Belirsiz"),
@@ -56,6 +51,19 @@ def final_response_synthesizer_node(state: GraphState) -> Dict[str, Any]:
         "support_analysis": support_analysis.dict(), # Pydantic nesnesini dict'e çevir
     }
 
+def final_response_synthesizer_node(state: GraphState) -> Dict[str, Any]:
+    """
+    Tüm analiz adımlarından gelen yapılandırılmış verileri, son kullanıcıya sunulacak,
+    kolay anlaşılır, profesyonel ve bütünlüklü bir metne dönüştürür.
+    
+    Bu düğüm, önceki adımlarda oluşabilecek hatalara karşı 'kurşun geçirmez' olacak şekilde
+    tasarlanmıştır. Önceki bir adımdan gelen veri 'None' ise, bunu güvenli bir şekilde
+    ele alır ve raporun ilgili bölümünü varsayılan bir metinle doldurur.
+    """
+    logging.info("---NODE: Nihai Rapor Oluşturuluyor---")
+
+    final_state_for_prompt = _build_prompt_state(state)
+
     try:
         chain = get_final_response_synthesizer_chain()
         # Zincir artık bir Pydantic nesnesi (FinalReport) döndürüyor.
@@ -65,6 +73,24 @@ def final_response_synthesizer_node(state: GraphState) -> Dict[str, Any]:
         # Yapısal yanıtı, main.py'nin beklediği 'final_response' anahtarıyla döndür.
         return {"final_response": structured_response.dict()}
     except Exception as e:
+        raise_if_rate_limited(e)
         logging.error(f"   > HATA: Nihai rapor oluşturulurken bir zincir hatası oluştu: {e}")
         # Hata durumunda, yanıltıcı başarı mesajını önlemek için boş veya hata içeren bir durum döndür
-        return {"final_response": None} 
\ No newline at end of file
+        return {"final_response": None}
+
+async def afinal_response_synthesizer_node(state: GraphState) -> Dict[str, Any]:
+    """`final_response_synthesizer_node` düğümünün asenkron (ainvoke) versiyonu."""
+    logging.info("---NODE: Nihai Rapor Oluşturuluyor---")
+
+    final_state_for_prompt = _build_prompt_state(state)
+
+    try:
+        chain = get_final_response_synthesizer_chain()
+        structured_response = await chain.ainvoke({"state": final_state_for_prompt})
+
+        logging.info("Nihai Rapor başarıyla oluşturuldu.")
+        return {"final_response": structured_response.dict()}
+    except Exception as e:
+        raise_if_rate_limited(e)
+        logging.error(f"   > HATA: Nihai rapor oluşturulurken bir zincir hatası oluştu: {e}")
+        return {"final_response": None}
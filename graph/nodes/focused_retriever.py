@@ -1,60 +1,113 @@
 import logging
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from langchain.schema import Document
-from langchain_community.vectorstores import FAISS
-from langchain_openai import OpenAIEmbeddings
 
 from graph.state import GraphState
 from graph.chains.focused_query_generator import get_focused_query_generator_chain
-
-# Sabitler
-DB_PATH = "mevzuat_veritabani"
+from graph.core.instrumentation import record_cache_hit
+from graph.core.llm import raise_if_rate_limited
+from graph.hybrid_retriever import HybridResult, get_hybrid_retriever, aget_hybrid_retriever
 
 logging.basicConfig(level=logging.INFO, format='   > %(message)s')
 
+# İndeks fıkra/bent/tablo satırı düzeyinde parçalı olduğu için (bkz. vector_db_builder.py)
+# bütün madde döndüren eski aramaya göre daha fazla, ama çok daha kısa parça alınır.
+FOCUSED_RETRIEVAL_K = 6
+# Şablon sorgunun sonuçlarından en az bu kadarı hem yoğun hem BM25 sıralamasının
+# ilk k sonucunda yer alıyorsa sorgu yeterince güçlü sayılır ve LLM'e sorgu ürettirilmez.
+MIN_TEMPLATE_CONSENSUS = 3
+TEMPLATE_QUERY = "{investment_type} {region} destek unsurları oranları süreleri ve şartları"
+
+def _query_inputs(state: GraphState) -> Dict:
+    return {
+        "investment_type": state["investment_type"].investment_type,
+        "region": state["entities"].investment_region
+    }
+
+def _effective_on(state: GraphState, retriever) -> Optional[str]:
+    """
+    Sorguda bir tarih belirtildiyse arama o tarihte yürürlükte olan parçalarla
+    sınırlandırılır. Index'te o tarihten önceki mevzuat yoksa filtre uygulanmaz.
+    """
+    details = state.get("extracted_details")
+    value = details.get("reference_date") if isinstance(details, dict) else getattr(details, "reference_date", None)
+    if not value or not retriever.has_documents(effective_on=str(value)):
+        return None
+    return str(value)
+
+def _is_strong(result: HybridResult) -> bool:
+    if result.consensus >= MIN_TEMPLATE_CONSENSUS:
+        logging.info(f"   > Şablon sorgu yeterli ({result.consensus} ortak sonuç); LLM ile sorgu üretimi atlanıyor.")
+        record_cache_hit("focused_template")
+        return True
+    return False
+
+def _select_new_documents(state: GraphState, newly_found_docs: List[Document]) -> Dict:
+    logging.info(f"   > Odaklanmış aramada {len(newly_found_docs)} adet yeni doküman bulundu.")
+
+    # Sadece yeni bulunanları döndür; mevcut listeyle tekrarsız birleştirme
+    # GraphState'teki `merge_documents` reducer'ı tarafından yapılır.
+    current_doc_contents = {doc.page_content for doc in state.get("documents") or []}
+    new_docs = [doc for doc in newly_found_docs if doc.page_content not in current_doc_contents]
+
+    logging.info(f"   > {len(new_docs)} yeni doküman mevcut listeye eklenecek.")
+    return {"documents": new_docs}
+
 def focused_retriever_node(state: GraphState) -> Dict:
     """
     Yatırım türü belirlendikten sonra, daha spesifik ve odaklanmış bir arama
     yaparak ilgili destek ve şartları netleştirecek ek dokümanlar bulur.
-    Bu düğüm de standart FAISS veritabanını kullanır.
+
+    Önce yatırım türü ve bölgeden oluşturulan şablon bir sorguyla hibrit arama
+    yapılır; sonuçlar güçlüyse LLM'e ayrıca sorgu ürettirilmez.
     """
     logging.info("---NODE: Odaklanmış Arama Yapılıyor---")
 
-    investment_type_analysis = state.get("investment_type")
-    if not investment_type_analysis:
-        return {"documents": state.get("documents", [])}
+    if not state.get("investment_type"):
+        return {}
 
-    # Odaklanmış arama sorgusu oluştur
-    chain = get_focused_query_generator_chain()
-    focused_query_obj = chain.invoke({
-        "investment_type": investment_type_analysis.investment_type,
-        "region": state["entities"].investment_region
-    })
-    focused_query = focused_query_obj.query
-    logging.info(f"   > Oluşturulan Odaklanmış Sorgu: '{focused_query}'")
+    inputs = _query_inputs(state)
+    try:
+        # Süreç genelinde paylaşılan (önceden yüklenmiş) vektör veritabanı üzerindeki hibrit arayıcıyı al
+        retriever = get_hybrid_retriever()
+        effective_on = _effective_on(state, retriever)
+
+        result = retriever.search(TEMPLATE_QUERY.format(**inputs), k=FOCUSED_RETRIEVAL_K, effective_on=effective_on)
+        if not _is_strong(result):
+            # Odaklanmış arama sorgusu oluştur
+            chain = get_focused_query_generator_chain()
+            focused_query = chain.invoke(inputs).query
+            logging.info(f"   > Oluşturulan Odaklanmış Sorgu: '{focused_query}'")
+            result = retriever.search(focused_query, k=FOCUSED_RETRIEVAL_K, effective_on=effective_on)
+        return _select_new_documents(state, result.documents)
+
+    except Exception as e:
+        raise_if_rate_limited(e)
+        logging.error(f"   > HATA: Odaklanmış arama sırasında bir hata oluştu: {e}")
+        return {} # Hata durumunda state'i bozmamak için boş dict döndür
+
+async def afocused_retriever_node(state: GraphState) -> Dict:
+    """`focused_retriever_node` düğümünün asenkron versiyonu."""
+    logging.info("---NODE: Odaklanmış Arama Yapılıyor---")
 
+    if not state.get("investment_type"):
+        return {}
+
+    inputs = _query_inputs(state)
     try:
-        # Standart FAISS veritabanını yükle
-        embeddings = OpenAIEmbeddings()
-        vector_db = FAISS.load_local(DB_PATH, embeddings, allow_dangerous_deserialization=True)
-
-        # Odaklanmış arama yap
-        newly_found_docs = vector_db.similarity_search(focused_query, k=3)
-        
-        logging.info(f"   > Odaklanmış aramada {len(newly_found_docs)} adet yeni doküman bulundu.")
-
-        # Mevcut doküman listesini al ve yeni bulunanları (tekrarsız olarak) ekle
-        current_docs = state.get("documents", [])
-        current_doc_contents = {doc.page_content for doc in current_docs}
-        
-        for doc in newly_found_docs:
-            if doc.page_content not in current_doc_contents:
-                current_docs.append(doc)
-
-        logging.info(f"   > Toplam doküman sayısı {len(current_docs)}'e yükseldi.")
-        return {"documents": current_docs}
+        retriever = await aget_hybrid_retriever()
+        effective_on = _effective_on(state, retriever)
+
+        result = await retriever.asearch(TEMPLATE_QUERY.format(**inputs), k=FOCUSED_RETRIEVAL_K, effective_on=effective_on)
+        if not _is_strong(result):
+            chain = get_focused_query_generator_chain()
+            focused_query = (await chain.ainvoke(inputs)).query
+            logging.info(f"   > Oluşturulan Odaklanmış Sorgu: '{focused_query}'")
+            result = await retriever.asearch(focused_query, k=FOCUSED_RETRIEVAL_K, effective_on=effective_on)
+        return _select_new_documents(state, result.documents)
 
     except Exception as e:
-        logging.error(f"   > HATA: Odaklanmış arama sırasında veritabanı hatası: {e}")
-        return {} # Hata durumunda state'i bozmamak için boş dict döndür 
\ No newline at end of file
+        raise_if_rate_limited(e)
+        logging.error(f"   > HATA: Odaklanmış arama sırasında bir hata oluştu: {e}")
+        return {}
@@ -2,31 +2,100 @@
 import logging
 from typing import Dict, Any, List
 from langchain_core.documents import Document
+from graph.context_packer import entity_query, pack_documents
+from graph.core.instrumentation import get_metrics_registry, record_cache_hit
+from graph.core.llm import raise_if_rate_limited
+from graph.investment_classifier import RuleDecision, active_rule_ids_on, get_investment_type_classifier
 from graph.state import GraphState
 from graph.chains.investment_type_analyzer import get_investment_type_analyzer_chain, InvestmentTypeAnalysis
+from graph.temporal_resolver import get_primary_analysis_date
 
 logging.basicConfig(level=logging.INFO, format='   > %(message)s')
 
-# Öncelikli yatırım olduğunu GARANTİLEYEN Kural ID'leri
-PRIORITY_RULE_IDS = [
-    "ONCELIKLI_YATIRIM_OTOMOTIV_GENISLEMESI",
-    "ONCELIKLI_YATIRIM_YERLI_MADEN_ENERJI_GENISLEMESI",
-    "ONCELIKLI_YATIRIM_TURIZM_DARALTILMASI",
-    "ONCELIKLI_YATIRIM_EGITIM_GENISLETILMESI",
-    "ONCELIKLI_YATIRIM_ENERJI_VERIMLILIGI_EKLENMESI",
-    "ONCELIKLI_YATIRIM_ATIK_ISI_EKLENMESI",
-    "ONCELIKLI_YATIRIM_LNG_DEPOLAMA_EKLENMESI",
-    "EK4_SAGLIK_TESVIK_KAPSAM_DEGISIKLIGI" 
-]
-
-def format_documents_for_analysis(docs: List[Document]) -> str:
-    """Doküman listesini LLM'in işleyebileceği tek bir metne dönüştürür."""
+# Kural tabanlı sınıflandırıcının kullandığı mevzuat denetçisi bayrakları
+AUDIT_FLAGS = ("is_prohibited", "is_large_scale", "is_regionally_eligible")
+
+def format_documents_for_analysis(docs: List[Document], query: str = "") -> str:
+    """Doküman listesini, yatırım türü analizinin token bütçesine sığacak tek bir metne dönüştürür."""
     if not docs:
         return ""
-    # Mevzuat metinlerini birleştirirken daha belirgin bir ayraç kullanalım.
-    return "\n\n---\n\n".join(
-        [f"Kaynak: {doc.metadata.get('source', 'Bilinmiyor')} - Detay: {doc.metadata.get('detay', 'Bilinmiyor')}\n\n{doc.page_content}" for doc in docs]
+    return pack_documents("investment_type", docs, query=query)
+
+def _default_response() -> InvestmentTypeAnalysis:
+    # Hata durumunda döndürülecek varsayılan "güvenli" nesne
+    return InvestmentTypeAnalysis(
+        investment_type="Belirsiz", 
+        reasoning="Yatırım türü analizi sırasında bir hata oluştu veya yeterli veri bulunamadı.", 
+        legal_basis="Yok"
+    )
+
+def _classify(state: GraphState) -> RuleDecision:
+    """Kural tabanlı sınıflandırıcıyı çalıştırır ve hangi yolun (kural / LLM) kullanıldığını sayar."""
+    classifier = get_investment_type_classifier()
+    analysis_date = get_primary_analysis_date(state.get("extracted_details"))
+    decision = classifier.classify(
+        state.get("entities"),
+        {name: state.get(name) for name in AUDIT_FLAGS},
+        active_rule_ids=active_rule_ids_on(analysis_date),
+        sector_number=state.get("sector_number"),
     )
+    classifier.record(decision)
+    fast_path = decision.analysis is not None
+    if fast_path:
+        record_cache_hit("investment_type_rules")
+    get_metrics_registry().count_event("investment_type_decisions", path="rules" if fast_path else "llm", rule=decision.rule)
+    return decision
+
+def _prepare_inputs(state: GraphState):
+    """
+    Zincir girdilerini hazırlar. Kural tabanlı kontroller sonucu LLM'e gerek
+    kalmadıysa, döndürülecek güncellemeyi ikinci eleman olarak verir.
+    """
+    # --- DOĞRU VE GÜVENLİ STATE ERİŞİMİ ---
+    # GraphState bir TypedDict'tir. .get() metodu en güvenli yoldur.
+    # İstem tek bir `temporal_directive` alanı bekler: geçmiş tarih notu ve tarihteki kural direktifleri birlikte verilir.
+    temporal_directive_text = "\n".join(
+        text for text in (state.get("temporal_directive"), state.get("temporal_directives")) if text
+    ) or "Uygulanacak özel bir zamansal direktif bulunamadı."
+    entities = state.get("entities")
+    documents = state.get("documents") or []
+
+    # Temel veriler olmadan analiz yapılamaz.
+    if not entities or not entities.investment_topic or not entities.investment_region:
+        logging.warning("   > Analiz için temel varlıklar (entities) eksik. Atlanıyor.")
+        return None, {"investment_type": InvestmentTypeAnalysis(investment_type="Belirsiz", reasoning="Analiz için yeterli ön bilgi (varlıklar) bulunamadı.", legal_basis="Yok")}
+
+    # --- KURAL TABANLI SINIFLANDIRMA ---
+    # Denetim bayrakları ve mevzuat ekleri sonucu kesin olarak belirliyorsa LLM'e gidilmez.
+    decision = _classify(state)
+    if decision.analysis is not None:
+        logging.info(f"   > Kural tabanlı sınıflandırma ({decision.rule}): '{decision.analysis.investment_type}'. LLM atlanıyor.")
+        return None, {"investment_type": decision.analysis}
+
+    # --- STANDART LLM ANALİZİ ---
+    logging.info(f"   > Kurallar yetersiz ({decision.rule}). Standart analiz için LLM'e başvuruluyor...")
+
+    # Zincire gönderilecek tüm girdilerin mevcut olduğundan emin ol.
+    return {
+        "entities": entities,
+        "documents": format_documents_for_analysis(documents, entity_query(entities)),
+        "temporal_directive": temporal_directive_text,
+        "is_regionally_eligible": state.get("is_regionally_eligible", False),
+        "is_large_scale": state.get("is_large_scale", False),
+        "is_prohibited": state.get("is_prohibited", False),
+    }, None
+
+def _handle_response(response) -> Dict[str, Any]:
+    # --- SAĞLAMLIK KONTROLÜ ---
+    if not response or not isinstance(response, InvestmentTypeAnalysis):
+        logging.error("   > HATA: Yatırım türü analiz zinciri 'None' veya geçersiz bir tip döndürdü.")
+        analysis_result = _default_response()
+    else:
+        analysis_result = response
+
+    logging.info(f"   > Belirlenen Yatırım Türü: {analysis_result.investment_type}")
+    
+    return {"investment_type": analysis_result}
 
 def investment_type_analyzer_node(state: GraphState) -> Dict[str, Any]:
     """
@@ -36,63 +105,35 @@ def investment_type_analyzer_node(state: GraphState) -> Dict[str, Any]:
     Bu düğüm, hata durumlarında bile sistemin çökmemesi için ASLA None döndürmez.
     """
     logging.info("---NODE: Yatırım Türü Analiz Ediliyor---")
-    
-    # Hata durumunda döndürülecek varsayılan "güvenli" nesne
-    default_response = InvestmentTypeAnalysis(
-        investment_type="Belirsiz", 
-        reasoning="Yatırım türü analizi sırasında bir hata oluştu veya yeterli veri bulunamadı.", 
-        legal_basis="Yok"
-    )
 
     try:
-        # --- DOĞRU VE GÜVENLİ STATE ERİŞİMİ ---
-        # GraphState bir TypedDict'tir. .get() metodu en güvenli yoldur.
-        temporal_directives_text = state.get("temporal_directives") or "Uygulanacak özel bir zamansal direktif bulunamadı."
-        entities = state.get("entities")
-        documents = state.get("documents") or []
-
-        # Temel veriler olmadan analiz yapılamaz.
-        if not entities:
-            logging.warning("   > Analiz için temel varlıklar (entities) eksik. Atlanıyor.")
-            return {"investment_type": InvestmentTypeAnalysis(investment_type="Belirsiz", reasoning="Analiz için yeterli ön bilgi (varlıklar) bulunamadı.", legal_basis="Yok")}
-
-        # --- KURAL TABANLI KONTROL ---
-        if any(rule_id in temporal_directives_text for rule_id in PRIORITY_RULE_IDS):
-            logging.info("   > Kural tabanlı kontrol: 'Öncelikli Yatırım' statüsü sağlayan bir Kural ID'si bulundu. LLM atlanıyor.")
-            priority_response = InvestmentTypeAnalysis(
-                investment_type="Öncelikli Yatırım",
-                reasoning="Sistem, zamana bağlı direktifler arasında, yatırımın konusuna doğrudan 'Öncelikli Yatırım' statüsü veren bir mevzuat kuralı (Kural ID ile teyit edildi) tespit etmiştir. Bu kural, diğer analizlere göre önceliklidir.",
-                legal_basis="İlgili Öncelikli Yatırım Kararı (Madde 17 veya ilgili değişiklik)"
-            )
-            return {"investment_type": priority_response}
-            
-        # --- STANDART LLM ANALİZİ ---
-        logging.info("   > Standart analiz için LLM'e başvuruluyor...")
-        chain = get_investment_type_analyzer_chain()
+        invoke_params, early_response = _prepare_inputs(state)
+        if early_response is not None:
+            return early_response
 
-        # Zincire gönderilecek tüm girdilerin mevcut olduğundan emin ol.
-        invoke_params = {
-            "entities": entities,
-            "documents": format_documents_for_analysis(documents),
-            "temporal_directives": temporal_directives_text,
-            "is_regionally_eligible": state.get("is_regionally_eligible", False),
-            "is_large_scale": state.get("is_large_scale", False),
-            "is_prohibited": state.get("is_prohibited", False),
-        }
-        
+        chain = get_investment_type_analyzer_chain()
         response = chain.invoke(invoke_params)
+        return _handle_response(response)
+
+    except Exception as e:
+        raise_if_rate_limited(e)
+        logging.critical(f"   > KRİTİK HATA: Yatırım türü analizi sırasında beklenmedik bir hata oluştu: {e}", exc_info=True)
+        return {"investment_type": _default_response()}
 
-        # --- SAĞLAMLIK KONTROLÜ ---
-        if not response or not isinstance(response, InvestmentTypeAnalysis):
-            logging.error("   > HATA: Yatırım türü analiz zinciri 'None' veya geçersiz bir tip döndürdü.")
-            analysis_result = default_response
-        else:
-            analysis_result = response
+async def ainvestment_type_analyzer_node(state: GraphState) -> Dict[str, Any]:
+    """`investment_type_analyzer_node` düğümünün asenkron (ainvoke) versiyonu."""
+    logging.info("---NODE: Yatırım Türü Analiz Ediliyor---")
+
+    try:
+        invoke_params, early_response = _prepare_inputs(state)
+        if early_response is not None:
+            return early_response
 
-        logging.info(f"   > Belirlenen Yatırım Türü: {analysis_result.investment_type}")
-        
-        return {"investment_type": analysis_result}
+        chain = get_investment_type_analyzer_chain()
+        response = await chain.ainvoke(invoke_params)
+        return _handle_response(response)
 
     except Exception as e:
+        raise_if_rate_limited(e)
         logging.critical(f"   > KRİTİK HATA: Yatırım türü analizi sırasında beklenmedik bir hata oluştu: {e}", exc_info=True)
-        return {"investment_type": default_response} 
\ No newline at end of file
+        return {"investment_type": _default_response()}
@@ -24,26 +24,29 @@ def mevzuat_auditor_node(state: GraphState) -> Dict:
 
     denetci = get_mevzuat_denetcisi()
 
-    # Adım 1: Konudan kesin sektör kodunu bul (Arşivci)
-    sektor_kodu = denetci.get_sektor_kodu_from_description(konu)
-    if not sektor_kodu:
+    # Adım 1: Konudan kesin sektörü bul (Arşivci). US-97 kodu EK-3/EK-4 için,
+    # EK-2A sıra numarası ise EK-2B için kullanılır; ikisi farklı numaralandırmalardır.
+    sektor = denetci.match_sector(konu)
+    if not sektor:
         logging.warning(f"   > '{konu}' için bir sektör kodu bulunamadı.")
         # HATA DÜZELTME: Her zaman Pydantic objesi döndür, dict değil.
         # Mevcut entity nesnesinin bir kopyasını oluşturup sadece sektör kodunu güncelle.
         updated_entities = entities.copy(update={"investment_sector_code": None})
         return {
             "entities": updated_entities,
+            "sector_number": None,
             "is_regionally_eligible": False,
             "is_large_scale": False,
             "is_prohibited": False,
         }
     
-    logging.info(f"   > '{konu}' konusu için Sektör Kodu '{sektor_kodu}' olarak tespit edildi.")
+    sektor_kodu = sektor.code
+    logging.info(f"   > '{konu}' konusu için Sektör Kodu '{sektor_kodu}' (EK-2A sıra no {sektor.row}) olarak tespit edildi.")
     # State'deki entities'i yeni bulunan kesin sektör koduyla güncelle
     updated_entities = entities.copy(update={"investment_sector_code": sektor_kodu})
 
     # Adım 2: Tüm denetimleri yap
-    is_regionally_eligible = denetci.check_regional_eligibility(sektor_kodu, il_adi)
+    is_regionally_eligible = denetci.check_regional_eligibility(sektor.row, il_adi)
     is_large_scale = denetci.check_large_scale_eligibility(sektor_kodu, tutar)
     is_prohibited = denetci.check_prohibited_list(sektor_kodu)
     
@@ -53,7 +56,15 @@ def mevzuat_auditor_node(state: GraphState) -> Dict:
 
     return {
         "entities": updated_entities,
+        "sector_number": sektor.row,
         "is_regionally_eligible": is_regionally_eligible,
         "is_large_scale": is_large_scale,
         "is_prohibited": is_prohibited,
-    } 
\ No newline at end of file
+    }
+
+async def amevzuat_auditor_node(state: GraphState) -> Dict:
+    """
+    `mevzuat_auditor_node` düğümünün asenkron versiyonu. Denetimler bellekteki
+    EK verileri üzerinde çalıştığı için olay döngüsünde doğrudan yürütülür.
+    """
+    return mevzuat_auditor_node(state)
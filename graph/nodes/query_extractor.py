@@ -0,0 +1,82 @@
+import asyncio
+import logging
+from typing import Any, Dict
+from graph.core.llm import raise_if_rate_limited
+from graph.state import GraphState
+from graph.chains.query_extractor import ExtractedQuery, get_query_extractor_chain
+from graph.chains.region_resolver import resolve_region_from_name, resolve_region_from_query, unknown_region_info
+from graph.nodes.detail_extractor import detail_extractor_node, adetail_extractor_node
+from graph.nodes.entity_extractor import entity_extractor_node, aentity_extractor_node
+from graph.nodes.region_resolver import region_resolver_node, aregion_resolver_node
+
+logging.basicConfig(level=logging.INFO, format='   > %(message)s')
+
+def _region_info(query: str, response: ExtractedQuery) -> Dict[str, Any]:
+    """
+    Bölgeyi önce sorgudan yerel olarak çözmeyi dener; olmazsa LLM'in bulduğu
+    il adını yerel haritayla doğrular, haritada yoksa LLM'in bölgesini kullanır.
+    Birleşik çağrı zaten yapıldığı için burada hızlı yol (atlanan LLM çağrısı) sayılmaz.
+    """
+    local_info = resolve_region_from_query(query)
+    if local_info is not None:
+        logging.info(f"   > Bölge yerel olarak doğrulandı: {local_info.corrected_name} ({local_info.region_number}. Bölge)")
+        return local_info.dict()
+
+    info = response.to_region_info()
+    if info is None:
+        logging.warning("   > Birleşik çıkarımda il adı bulunamadı.")
+        return unknown_region_info().dict()
+
+    mapped = resolve_region_from_name(info.corrected_name)
+    if mapped.region_number:
+        info = mapped
+    logging.info(f"   > Bölge çözümlendi: {info.corrected_name} ({info.region_number}. Bölge)")
+    return info.dict()
+
+def _handle_response(query: str, response: ExtractedQuery) -> Dict[str, Any]:
+    entities = response.to_entities()
+    details = response.to_details()
+    logging.info(f"Çıkarılan Varlıklar: {entities}")
+    logging.info(f"   > Çıkarılan Detaylar: {details.dict()}")
+    return {
+        "entities": entities,
+        "extracted_details": details,
+        "region_info": _region_info(query, response),
+    }
+
+def _merge(results) -> Dict[str, Any]:
+    merged: Dict[str, Any] = {}
+    for result in results:
+        merged.update(result)
+    return merged
+
+def query_extractor_node(state: GraphState) -> Dict[str, Any]:
+    """
+    Varlıkları, referans tarihini ve teşvik bölgesini tek bir LLM çağrısıyla
+    çıkarır ve `entities`, `extracted_details`, `region_info` anahtarlarını
+    doldurur. Birleşik çağrı başarısız olursa ayrı zincirlere geri döner.
+    """
+    logging.info("---NODE: Varlıklar, Tarih ve Bölge Birlikte Çıkarılıyor---")
+    try:
+        chain = get_query_extractor_chain()
+        response = chain.invoke({"query": state["query"]})
+        return _handle_response(state["query"], response)
+    except Exception as e:
+        raise_if_rate_limited(e)
+        logging.error(f"   > HATA: Birleşik çıkarım başarısız oldu, ayrı zincirlere geçiliyor: {e}")
+        return _merge(node(state) for node in (entity_extractor_node, detail_extractor_node, region_resolver_node))
+
+async def aquery_extractor_node(state: GraphState) -> Dict[str, Any]:
+    """`query_extractor_node` düğümünün asenkron (ainvoke) versiyonu."""
+    logging.info("---NODE: Varlıklar, Tarih ve Bölge Birlikte Çıkarılıyor---")
+    try:
+        chain = get_query_extractor_chain()
+        response = await chain.ainvoke({"query": state["query"]})
+        return _handle_response(state["query"], response)
+    except Exception as e:
+        raise_if_rate_limited(e)
+        logging.error(f"   > HATA: Birleşik çıkarım başarısız oldu, ayrı zincirlere geçiliyor: {e}")
+        results = await asyncio.gather(
+            aentity_extractor_node(state), adetail_extractor_node(state), aregion_resolver_node(state)
+        )
+        return _merge(results)
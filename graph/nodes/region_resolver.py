@@ -1,48 +1,89 @@
 import logging
 import re
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from graph.core.instrumentation import record_cache_hit
+from graph.core.llm import raise_if_rate_limited
 from graph.state import GraphState
-from graph.chains.region_resolver import get_region_resolver_chain, RegionInfo
+from graph.chains.region_resolver import get_region_resolver_chain, resolve_region_from_query, unknown_region_info
+from graph.region_matcher import get_province_resolver
 
 logging.basicConfig(level=logging.INFO, format='   > %(message)s')
 
+def _resolve_locally(query: str) -> Optional[Dict[str, Any]]:
+    """
+    İl adını LLM'e gitmeden sorgudan çözmeyi dener ve hızlı yol sayaçlarını
+    günceller. Eşleşme yeterince güvenilir değilse None döner ve çağıran LLM
+    zincirine başvurur.
+    """
+    resolver = get_province_resolver()
+    info = resolve_region_from_query(query)
+    resolver.record(fast_path=info is not None)
+    if info is None:
+        logging.info("   > Yerel bölge eşleşmesi yetersiz. LLM'e başvuruluyor.")
+        return None
+    record_cache_hit("region_local")
+    logging.info(f"   > Bölge yerel olarak çözümlendi: {info.corrected_name} ({info.region_number}. Bölge). {info.reasoning}")
+    return {"region_info": info.dict()}
+
+def _handle_response(response) -> Dict[str, Any]:
+    # --- SAVUNMA MEKANİZMASI: Yanıt Kontrolü ---
+    # LLM'in eksik veya hatalı yanıt verme ihtimaline karşı.
+    if not response or not response.corrected_name:
+         logging.warning(f"   > LLM'den geçerli bir bölge adı alınamadı. Yanıt: {response}")
+         return {"region_info": unknown_region_info().dict()}
+
+    logging.info(f"   > Bölge çözümlendi: {response.corrected_name} ({response.region_number}. Bölge)")
+    return {"region_info": response.dict()}
+
 def region_resolver_node(state: GraphState) -> Dict[str, Any]:
     """
     Kullanıcı tarafından girilen il adını standartlaştırır ve teşvik bölge numarasını bulur.
     Farklı veri tiplerine karşı dayanıklıdır.
     """
     logging.info("---NODE: Bölge Bilgileri Çözümleniyor---")
-    
-    # Hata durumunda döndürülecek varsayılan nesne
-    # DÜZELTME: Pydantic modelindeki 'alias' tanımına uygun anahtar kelimeyi kullan
-    default_response = RegionInfo(
-        il="Bilinmiyor",
-        teşvik_bölgesi=None,
-        reasoning="Girdide il adı bulunamadığı veya okunamadığı için bölge çözümlenemedi."
-    )
 
     try:
-        chain = get_region_resolver_chain()
-        
         # State'ten orijinal sorguyu al
         query = state.get("query")
 
         if not query:
             logging.warning("   > Orijinal sorgu bulunamadığı için bölge çözümlenemedi.")
-            return {"region_info": default_response.dict()}
+            return {"region_info": unknown_region_info().dict()}
         
+        local_result = _resolve_locally(query)
+        if local_result is not None:
+            return local_result
+
         # Zincire 'entities' yerine doğrudan 'query' ver.
+        chain = get_region_resolver_chain()
         response = chain.invoke({"query": query})
+        return _handle_response(response)
 
-        # --- SAVUNMA MEKANİZMASI: Yanıt Kontrolü ---
-        # LLM'in eksik veya hatalı yanıt verme ihtimaline karşı.
-        if not response or not response.corrected_name:
-             logging.warning(f"   > LLM'den geçerli bir bölge adı alınamadı. Yanıt: {response}")
-             return {"region_info": default_response.dict()}
+    except Exception as e:
+        raise_if_rate_limited(e)
+        logging.error(f"   > HATA: Bölge çözümleme sırasında beklenmedik bir hata oluştu: {e}")
+        return {"region_info": unknown_region_info().dict()}
 
-        logging.info(f"   > Bölge çözümlendi: {response.corrected_name} ({response.region_number}. Bölge)")
-        return {"region_info": response.dict()}
+async def aregion_resolver_node(state: GraphState) -> Dict[str, Any]:
+    """`region_resolver_node` düğümünün asenkron (ainvoke) versiyonu."""
+    logging.info("---NODE: Bölge Bilgileri Çözümleniyor---")
+
+    try:
+        query = state.get("query")
+
+        if not query:
+            logging.warning("   > Orijinal sorgu bulunamadığı için bölge çözümlenemedi.")
+            return {"region_info": unknown_region_info().dict()}
+
+        local_result = _resolve_locally(query)
+        if local_result is not None:
+            return local_result
+
+        chain = get_region_resolver_chain()
+        response = await chain.ainvoke({"query": query})
+        return _handle_response(response)
 
     except Exception as e:
+        raise_if_rate_limited(e)
         logging.error(f"   > HATA: Bölge çözümleme sırasında beklenmedik bir hata oluştu: {e}")
-        return {"region_info": default_response.dict()} 
\ No newline at end of file
+        return {"region_info": unknown_region_info().dict()}
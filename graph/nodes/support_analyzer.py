@@ -1,59 +1,134 @@
 # graph/nodes/support_analyzer.py
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from langchain.schema.document import Document
+from graph.context_packer import entity_query, pack_documents, unique_documents
+from graph.core.instrumentation import get_metrics_registry
+from graph.core.llm import raise_if_rate_limited
+from graph.knowledge_resolver import region_of
 from graph.state import GraphState
 from graph.chains.support_analyzer import get_support_analyzer_chain, SupportAnalysis
+from graph.support_calculator import calculate_supports
+from graph.temporal_resolver import get_primary_analysis_date
 
 logging.basicConfig(level=logging.INFO, format='   > %(message)s')
 
-def format_documents_for_support_analysis(docs: List[Document]) -> str:
-    """Doküman listesini destek analizi için tek bir metne dönüştürür."""
-    return "\n\n---\n\n".join([f"Kaynak: {doc.metadata.get('source', 'Bilinmiyor')} - Madde/Ek: {doc.metadata.get('madde_ek', 'Bilinmiyor')}\n\nİçerik:\n{doc.page_content}" for doc in docs])
+def format_documents_for_support_analysis(docs: List[Document], query: str = "") -> str:
+    """Doküman listesini, destek analizinin token bütçesine sığacak tek bir metne dönüştürür."""
+    return pack_documents("support", docs, query=query)
+
+def _default_response() -> Dict[str, Any]:
+    return {"support_analysis": SupportAnalysis(supports=[])}
+
+def _region_number(state: GraphState, analysis_date) -> Optional[str]:
+    """İlin analiz tarihindeki bölgesini bilgi bankasından, bulunamazsa bölge çözümleyicinin sonucundan alır."""
+    region_info = state.get("region_info") or {}
+    if not isinstance(region_info, dict):
+        region_info = region_info.dict()
+    entities = state.get("entities")
+    for city in (region_info.get("corrected_name"), getattr(entities, "investment_region", None)):
+        region = region_of(city, analysis_date) if city else None
+        if region:
+            return region
+    return region_info.get("region_number")
+
+def _calculate(state: GraphState) -> Optional[SupportAnalysis]:
+    """
+    Destekleri oran tablolarından hesaplar. Yatırım türü tablolarla
+    hesaplanamıyorsa (büyük ölçekli, stratejik, belirsiz) None döner ve LLM'e gidilir.
+    """
+    investment_type = getattr(state.get("investment_type"), "investment_type", None)
+    if not investment_type:
+        return None
+    analysis_date = get_primary_analysis_date(state.get("extracted_details"))
+    amount = getattr(state.get("entities"), "investment_amount", None)
+    analysis = calculate_supports(amount, _region_number(state, analysis_date), investment_type, analysis_date)
+    get_metrics_registry().count_event("support_analysis", path="llm" if analysis is None else "calculator")
+    if analysis is not None:
+        logging.info(f"   > Destekler oran tablolarından hesaplandı ({investment_type}). LLM atlanıyor.")
+    return analysis
+
+def _prepare_inputs(state: GraphState) -> Optional[Dict[str, Any]]:
+    """Zincir girdilerini hazırlar. Analiz yapılamayacaksa None döndürür."""
+    # --- DOĞRU VE GÜVENLİ STATE ERİŞİMİ ---
+    main_docs = state.get("documents") or []
+    focused_docs = state.get("focused_documents") or []
+    investment_type = state.get("investment_type")
+    special_conditions = state.get("special_conditions")
+    entities = state.get("entities")
+    
+    # Gerekli bilgilerden herhangi biri yoksa, analiz yapmadan güvenli bir şekilde çık.
+    if not investment_type or not entities:
+        logging.warning("   > Yatırım türü veya temel varlıklar bulunamadığı için destek analizi atlanıyor.")
+        return None
+
+    # Odaklanmış aramada ana aramayla aynı maddeler dönebilir; tekrarlar bağlama iki kez girmez.
+    all_docs = unique_documents(main_docs, focused_docs)
+    
+    if not all_docs:
+        logging.warning("   > Analiz için hiç doküman bulunamadı. Atlanıyor.")
+        return None
+
+    # Zincire gerekli tüm bilgileri, güvenli .get() metoduyla sağlayarak ver.
+    return {
+        "investment_type": investment_type,
+        "special_conditions": special_conditions,
+        "entities": entities,
+        "documents": format_documents_for_support_analysis(all_docs, entity_query(entities, getattr(investment_type, "investment_type", None)))
+    }
+
+def _handle_response(response) -> Dict[str, Any]:
+    logging.info(f"   > Analiz Sonucu: {len(response.supports)} adet destek bulundu.")
+    # DÜZELTME: Pydantic nesnesini .dict() ile sözlüğe çevirerek state'e yaz.
+    return {"support_analysis": response.dict()}
 
 def support_analyzer_node(state: GraphState) -> Dict[str, Any]:
     """
     Belirlenen yatırım türü ve özel koşullara dayanarak, yatırımın
     alabileceği destek unsurlarını (KDV istisnası, vergi indirimi vb.) analiz eder.
+    Oranları bilgi bankasında bulunan yatırım türleri için destekler ve tutarlar
+    hesaplama motoruyla (graph/support_calculator.py) belirlenir; LLM'e sadece
+    diğer türler için gidilir.
     """
     logging.info("---NODE: Destek Unsurları Analiz Ediliyor---")
-    
-    default_response = {"support_analysis": SupportAnalysis(supports=[])}
 
     try:
+        calculated = _calculate(state)
+        if calculated is not None:
+            return _handle_response(calculated)
+
+        inputs = _prepare_inputs(state)
+        if inputs is None:
+            return _default_response()
+
         chain = get_support_analyzer_chain()
-        
-        # --- DOĞRU VE GÜVENLİ STATE ERİŞİMİ ---
-        main_docs = state.get("documents") or []
-        focused_docs = state.get("focused_documents") or []
-        investment_type = state.get("investment_type")
-        special_conditions = state.get("special_conditions")
-        entities = state.get("entities")
-        
-        # Gerekli bilgilerden herhangi biri yoksa, analiz yapmadan güvenli bir şekilde çık.
-        if not investment_type or not entities:
-            logging.warning("   > Yatırım türü veya temel varlıklar bulunamadığı için destek analizi atlanıyor.")
-            return default_response
-
-        all_docs = main_docs + focused_docs
-        
-        if not all_docs:
-            logging.warning("   > Analiz için hiç doküman bulunamadı. Atlanıyor.")
-            return default_response
-
-        # Zincire gerekli tüm bilgileri, güvenli .get() metoduyla sağlayarak ver.
-        response = chain.invoke({
-            "investment_type": investment_type,
-            "special_conditions": special_conditions,
-            "entities": entities,
-            "documents": format_documents_for_support_analysis(all_docs)
-        })
-
-        logging.info(f"   > Analiz Sonucu: {len(response.supports)} adet destek bulundu.")
-        # DÜZELTME: Pydantic nesnesini .dict() ile sözlüğe çevirerek state'e yaz.
-        return {"support_analysis": response.dict()}
+        response = chain.invoke(inputs)
+        return _handle_response(response)
 
     except Exception as e:
+        raise_if_rate_limited(e)
         logging.error(f"   > HATA: Destek analizi sırasında bir hata oluştu: {e}")
         # Hata durumunda bile state'i bozmuyoruz, boş bir nesne dönüyoruz.
-        return default_response 
\ No newline at end of file
+        return _default_response()
+
+async def asupport_analyzer_node(state: GraphState) -> Dict[str, Any]:
+    """`support_analyzer_node` düğümünün asenkron (ainvoke) versiyonu."""
+    logging.info("---NODE: Destek Unsurları Analiz Ediliyor---")
+
+    try:
+        calculated = _calculate(state)
+        if calculated is not None:
+            return _handle_response(calculated)
+
+        inputs = _prepare_inputs(state)
+        if inputs is None:
+            return _default_response()
+
+        chain = get_support_analyzer_chain()
+        response = await chain.ainvoke(inputs)
+        return _handle_response(response)
+
+    except Exception as e:
+        raise_if_rate_limited(e)
+        logging.error(f"   > HATA: Destek analizi sırasında bir hata oluştu: {e}")
+        return _default_response()
@@ -1,4 +1,5 @@
 from ..state import GraphState
+from ..temporal_resolver import resolve_temporal_directives
 from typing import Dict, Any
 import logging
 from datetime import datetime, date
@@ -13,25 +14,36 @@ def temporal_resolver_node(state: GraphState) -> Dict[str, Any]:
 
     Bu düğüm, özellikle geçmiş tarihli mevzuatın geçerliliği konusunda kullanıcıyı
     uyarmak ve RAG sürecini doğru belgelere yönlendirmek için kritik öneme sahiptir.
+    Analiz tarihinde yürürlükteki annotations.json direktifleri de (tarih
+    verilmemişse bugüne göre) `temporal_directives` olarak yazılır.
     """
     # Acil durum modu: Eğer bir şekilde bu düğüme gelinirse, hatayı logla ve pas geç.
     # Bu, normalde detail_extractor'dan sonra çalışması gereken bir düğümdür.
     # TODO: Bu acil durum modunu daha sağlam bir mantıkla değiştir.
     
     extracted_details = state.get("extracted_details")
+    # Tarih aralığına göre önceden hesaplanmış kural kümelerinden okunur (graph/annotation_store.py).
+    temporal_directives = resolve_temporal_directives(extracted_details)
     
+    # Detaylar Pydantic nesnesi (ExtractedDetails) veya hata durumunda boş bir sözlük olabilir.
+    if isinstance(extracted_details, dict):
+        reference_date_value = extracted_details.get("reference_date")
+    else:
+        reference_date_value = getattr(extracted_details, "reference_date", None)
+
     # Eğer bir önceki adımdan detaylar gelmediyse veya boşsa, atla.
-    if not extracted_details or not extracted_details.get("reference_date"):
+    if not reference_date_value:
         logger.info("   > İşlenecek zamansal direktif bulunamadı. Atlanıyor.")
         return {
             "temporal_directive": None,
+            "temporal_directives": temporal_directives,
             "acquired_rights_warning": None
         }
         
-    reference_date_str = extracted_details.get("reference_date")
+    reference_date_str = str(reference_date_value)
     
     try:
-        # Gelen tarih string'ini date objesine çevir
+        # Gelen tarihi (date objesi veya string) date objesine çevir
         reference_date = datetime.strptime(reference_date_str, "%Y-%m-%d").date()
         
         # Bugünün tarihi
@@ -50,6 +62,7 @@ def temporal_resolver_node(state: GraphState) -> Dict[str, Any]:
             
             return {
                 "temporal_directive": temporal_directive,
+                "temporal_directives": temporal_directives,
                 "acquired_rights_warning": acquired_rights_warning
             }
         
@@ -60,5 +73,13 @@ def temporal_resolver_node(state: GraphState) -> Dict[str, Any]:
     # Eğer tarih gelecekteyse veya ayrıştırma başarısızsa, bir şey yapma
     return {
         "temporal_directive": None,
+        "temporal_directives": temporal_directives,
         "acquired_rights_warning": None
-    } 
\ No newline at end of file
+    }
+
+async def atemporal_resolver_node(state: GraphState) -> Dict[str, Any]:
+    """
+    `temporal_resolver_node` düğümünün asenkron versiyonu. Ağ veya disk
+    çağrısı yapmadığı için olay döngüsünde doğrudan yürütülür.
+    """
+    return temporal_resolver_node(state)
@@ -0,0 +1,191 @@
+# graph/region_matcher.py
+"""
+Kullanıcı sorgusundaki il adını LLM'e gitmeden bulan yerel çözümleyici.
+
+Sırasıyla şu eşleşmeler denenir:
+  1. Birebir / takma ad (CITY_ALIASES) eşleşmesi, Türkçe harf katlamalı
+     ('istanbul', 'İSTANBUL', "Bursa'da", 'Konyada').
+  2. 81 il adı ve takma adlar üzerine kurulu BK-ağacında düzenleme mesafesi
+     (yazım hatası) araması ('Eskişhir', 'Diyarbakir').
+
+Her eşleşmeye bir güven puanı verilir. Puan eşiğin altındaysa (veya sorguda
+birden fazla farklı il geçiyorsa) düğüm LLM tabanlı çözümleyiciye düşer.
+Bölge numaraları graph/knowledge_resolver.py'deki güncel anlık görüntüden
+(EK-1 ile uyumlu) okunur.
+"""
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from graph.chains.region_resolver import CITY_ALIASES
+from graph.core.text import turkish_casefold
+from graph.knowledge_resolver import snapshot_for
+
+# Bu puanın altındaki eşleşmeler için LLM'e başvurulur.
+CONFIDENCE_THRESHOLD = 0.8
+# Yazım hatası araması yapılacak en kısa kelime (kısa kelimelerde yanlış eşleşme riski yüksek)
+MIN_FUZZY_LENGTH = 5
+# İl adlarından sonra gelen, kesme işaretsiz de yazılabilen hal ekleri (katlanmış, uzundan kısaya)
+_CASE_SUFFIXES = ("daki", "deki", "taki", "teki", "dan", "den", "tan", "ten", "nda", "nde",
+                  "nin", "da", "de", "ta", "te", "ya", "ye")
+_TOKEN_PATTERN = re.compile(r"[^\W\d_]+(?:['’][^\W\d_]+)?")
+
+
+class ProvinceMatch(NamedTuple):
+    """Sorguda bulunan il ve eşleşmenin ne kadar güvenilir olduğu."""
+    name: str
+    region_number: Optional[int]
+    confidence: float
+    method: str
+    token: str
+
+
+def levenshtein(a: str, b: str) -> int:
+    """İki kelime arasındaki düzenleme mesafesi."""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+class BKTree:
+    """Düzenleme mesafesine göre yakın kelime araması yapan Burkhard-Keller ağacı."""
+
+    def __init__(self, words: Dict[str, str]):
+        # words: katlanmış kelime -> resmi il adı
+        self._root: Optional[Tuple[str, str, Dict[int, tuple]]] = None
+        for word, value in words.items():
+            self.add(word, value)
+
+    def add(self, word: str, value: str) -> None:
+        if self._root is None:
+            self._root = (word, value, {})
+            return
+        node = self._root
+        while True:
+            distance = levenshtein(word, node[0])
+            if distance == 0:
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = (word, value, {})
+                return
+            node = child
+
+    def search(self, word: str, max_distance: int) -> List[Tuple[int, str, str]]:
+        """`max_distance` içindeki tüm kelimeleri (mesafe, kelime, değer) olarak döndürür."""
+        results = []
+        stack = [self._root] if self._root else []
+        while stack:
+            node_word, value, children = stack.pop()
+            distance = levenshtein(word, node_word)
+            if distance <= max_distance:
+                results.append((distance, node_word, value))
+            for child_distance, child in children.items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    stack.append(child)
+        return sorted(results)
+
+
+class ProvinceResolver:
+    """İl adlarını sorgu metninden deterministik olarak çıkaran çözümleyici."""
+
+    def __init__(self, regions: Dict[str, str], aliases: Dict[str, str]):
+        self.regions = dict(regions)
+        self._exact: Dict[str, Tuple[str, str]] = {}
+        for city in self.regions:
+            self._exact[turkish_casefold(city)] = (city, "exact")
+        for alias, city in aliases.items():
+            if city in self.regions:
+                self._exact.setdefault(turkish_casefold(alias), (city, "alias"))
+        self._tree = BKTree({word: city for word, (city, _) in self._exact.items()})
+        # Sorgulardaki sıradan kelimeler ('yatirim', 'fabrikasi') tekrar ettiği için arama sonuçları önbelleklenir.
+        self._fuzzy_search = lru_cache(maxsize=8192)(self._tree.search)
+        self._lock = threading.Lock()
+        self.stats = {"fast_path": 0, "llm_fallback": 0}
+
+    def _candidates(self, token: str) -> List[Tuple[str, bool]]:
+        """Bir kelimenin ek atılmış biçimlerini döndürür: (aday, ek atıldı mı)."""
+        if "'" in token or "’" in token:
+            # Kesme işaretinden sonrası her zaman ektir: "Bursa'da" -> "bursa"
+            return [(turkish_casefold(re.split(r"['’]", token)[0]), False)]
+        folded = turkish_casefold(token)
+        candidates = [(folded, False)]
+        for suffix in _CASE_SUFFIXES:
+            if folded.endswith(suffix) and len(folded) - len(suffix) >= 3:
+                candidates.append((folded[: -len(suffix)], True))
+        return candidates
+
+    def _region_number(self, city: str) -> Optional[int]:
+        region = self.regions.get(city)
+        return int(region) if region else None
+
+    def _match_exact(self, token: str) -> Optional[ProvinceMatch]:
+        for candidate, stripped in self._candidates(token):
+            hit = self._exact.get(candidate)
+            if hit:
+                city, method = hit
+                # Eki kesme işaretsiz atılmış eşleşmeler ('Konyada') bir miktar daha az güvenilirdir.
+                confidence = 0.95 if stripped else 1.0
+                return ProvinceMatch(city, self._region_number(city), confidence, method, token)
+        return None
+
+    def _match_fuzzy(self, token: str) -> Optional[ProvinceMatch]:
+        best: Optional[ProvinceMatch] = None
+        for candidate, _ in self._candidates(token):
+            if len(candidate) < MIN_FUZZY_LENGTH:
+                continue
+            max_distance = 1 if len(candidate) < 10 else 2
+            for distance, word, city in self._fuzzy_search(candidate, max_distance)[:1]:
+                confidence = 1.0 - distance / max(len(candidate), len(word))
+                if best is None or confidence > best.confidence:
+                    best = ProvinceMatch(city, self._region_number(city), confidence, "fuzzy", token)
+        return best
+
+    def match_token(self, token: str) -> Optional[ProvinceMatch]:
+        """Tek bir kelimeyi il adlarıyla eşleştirir (önce birebir, sonra yazım hatası toleranslı)."""
+        return self._match_exact(token) or self._match_fuzzy(token)
+
+    def find_in_text(self, text: str) -> Optional[ProvinceMatch]:
+        """
+        Metindeki en güvenilir il eşleşmesini döndürür. Metinde birbirinden
+        farklı birden fazla kesin il adı geçiyorsa güven puanı düşürülür.
+        """
+        tokens = _TOKEN_PATTERN.findall(text or "")
+        matches = [m for m in map(self._match_exact, tokens) if m]
+        # Yazım hatası araması pahalıdır; sadece birebir eşleşme yoksa yapılır.
+        if not matches:
+            matches = [m for m in map(self._match_fuzzy, tokens) if m]
+        if not matches:
+            return None
+        matches.sort(key=lambda m: -m.confidence)
+        best = matches[0]
+        rivals = {m.name for m in matches if m.confidence >= CONFIDENCE_THRESHOLD and m.name != best.name}
+        if rivals:
+            return best._replace(confidence=min(best.confidence, 0.5), method="ambiguous")
+        return best
+
+    def record(self, fast_path: bool) -> None:
+        """Hızlı yol / LLM'e düşme sayaçlarını günceller."""
+        with self._lock:
+            self.stats["fast_path" if fast_path else "llm_fallback"] += 1
+
+
+_resolver: Optional[ProvinceResolver] = None
+_lock = threading.Lock()
+
+
+def get_province_resolver() -> ProvinceResolver:
+    """Süreç genelinde paylaşılan il çözümleyicisini döndürür."""
+    global _resolver
+    if _resolver is None:
+        with _lock:
+            if _resolver is None:
+                _resolver = ProvinceResolver(snapshot_for().regions, CITY_ALIASES)
+    return _resolver
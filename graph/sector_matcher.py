@@ -0,0 +1,138 @@
+# graph/sector_matcher.py
+"""
+Yatırım konusunu (serbest metin) EK-2A'daki sektörlere eşleyen BM25 tabanlı
+arama modülü.
+
+Sektör adları yükleme anında bir kez Türkçe'ye duyarlı biçimde normalize
+edilip köklenir ve ters indekse (kök -> [(satır, frekans)]) yazılır. Bir
+sorgu, yalnızca sorgu köklerinin geçtiği satırları puanlar; sonuç puana göre
+sıralı aday listesidir.
+"""
+import math
+from collections import Counter, defaultdict
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from graph.core.text import tokenize
+
+# BM25 parametreleri (sektör adları kısa olduğu için b biraz düşük tutuldu)
+BM25_K1 = 1.2
+BM25_B = 0.5
+
+# Kullanıcıların sık kullandığı, ancak sektör adlarında geçmeyen ifadeler için
+# eş anlamlı genişletmeleri. Anahtarlar ve değerler tokenize() ile köklenir.
+TOPIC_SYNONYMS: Dict[str, str] = {
+    "fabrika": "imalat",
+    "uretim": "imalat",
+    "otel": "oteller",
+    "motel": "moteller",
+    "hayvan": "hayvancılık",
+    "çiftlik": "hayvancılık",
+    "sera": "seracılık",
+    "kumaş": "tekstil dokuma",
+    "iplik": "tekstil",
+    "konfeksiyon": "giyim",
+    "otomotiv": "motorlu kara taşıtları",
+    "yazılım": "bilgi teknolojisi",
+    "bilişim": "bilgi teknolojisi",
+    "okul": "eğitim",
+    "üniversite": "eğitim",
+    "klinik": "sağlık hastane",
+    "lojistik": "depolama taşımacılık",
+    "depo": "depolama",
+    "santral": "elektrik üretimi",
+    "güneş": "elektrik üretimi",
+    "rüzgar": "elektrik üretimi",
+    "enerji": "elektrik",
+    "çelik": "ana metal",
+    "demir": "ana metal",
+    "tersane": "gemi inşa",
+    "ilaç": "eczacılık",
+    "süt": "gıda",
+    "un": "gıda",
+}
+
+
+class SectorCandidate(NamedTuple):
+    """
+    Bir yatırım konusu için bulunan aday sektör. `row`, sektörün EK-2A'daki
+    sıra numarasıdır; EK-2B il tablosu sektörleri bu numarayla listeler.
+    US-97 kodu (`code`) ise EK-3/EK-4 denetimleri ve gösterim içindir.
+    """
+    code: str
+    name: str
+    score: float
+    row: str
+
+
+class SectorMatcher:
+    """EK-2A sektör adları üzerinde BM25 puanlamalı ters indeks."""
+
+    def __init__(self, sectors: Sequence[Tuple[str, str, str]]):
+        # sectors: (EK-2A sıra no, US-97 kodu, sektör adı) üçlüleri
+        self.sectors = [(str(row), str(code).strip(), name) for row, code, name in sectors if code and name]
+        self._postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self._doc_lengths: List[int] = []
+        for doc_id, (_, _, name) in enumerate(self.sectors):
+            terms = Counter(tokenize(name))
+            self._doc_lengths.append(sum(terms.values()))
+            for term, freq in terms.items():
+                self._postings[term].append((doc_id, freq))
+
+        n_docs = len(self.sectors)
+        self._avg_length = (sum(self._doc_lengths) / n_docs) if n_docs else 0.0
+        self._idf = {
+            term: math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self._postings.items()
+        }
+        self._synonyms = {
+            stem_: tokenize(expansion)
+            for word, expansion in TOPIC_SYNONYMS.items()
+            for stem_ in tokenize(word)
+        }
+
+    @classmethod
+    def from_ek2a(cls, ek2a_data: Optional[dict]) -> "SectorMatcher":
+        """
+        ek-2a.json içeriğinden (tablo.satirlar) eşleyici oluşturur. Tabloda
+        sıra numarası sütunu yoktur; satırın 1'den başlayan sırası kullanılır.
+        """
+        rows = (ek2a_data or {}).get("tablo", {}).get("satirlar", [])
+        return cls([(index, row.get("US-97 Kodu"), row.get("Sektör Adı")) for index, row in enumerate(rows, start=1)])
+
+    def _query_terms(self, topic: str) -> List[str]:
+        terms = tokenize(topic)
+        expanded = list(terms)
+        for term in terms:
+            expanded.extend(self._synonyms.get(term, []))
+        # Sorgu terimleri tekilleştirilir; BM25'te sorgu frekansı kullanılmaz.
+        return list(dict.fromkeys(expanded))
+
+    def match(self, topic: str, top_k: int = 5) -> List[SectorCandidate]:
+        """Yatırım konusuna en çok uyan sektörleri puana göre azalan sırada döndürür."""
+        if not topic or not self.sectors:
+            return []
+
+        scores: Dict[int, float] = defaultdict(float)
+        for term in self._query_terms(topic):
+            idf = self._idf.get(term)
+            if idf is None:
+                continue
+            for doc_id, freq in self._postings[term]:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self._doc_lengths[doc_id] / self._avg_length)
+                scores[doc_id] += idf * freq * (BM25_K1 + 1) / (freq + norm)
+
+        # Eşit puanda belgedeki sıra korunur (deterministik sonuç)
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:top_k]
+        return [SectorCandidate(self.sectors[i][1], self.sectors[i][2], score, self.sectors[i][0]) for i, score in ranked]
+
+    def by_row(self, row: str) -> Optional[SectorCandidate]:
+        """EK-2A sıra numarasıyla doğrudan sektörü döndürür (puan 0); numara yoksa None."""
+        for sector_row, code, name in self.sectors:
+            if sector_row == str(row).strip():
+                return SectorCandidate(code, name, 0.0, sector_row)
+        return None
+
+    def best(self, topic: str) -> Optional[SectorCandidate]:
+        """En yüksek puanlı adayı döndürür; hiçbir terim eşleşmezse None."""
+        candidates = self.match(topic, top_k=1)
+        return candidates[0] if candidates else None
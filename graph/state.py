@@ -1,5 +1,5 @@
 import operator
-from typing import TypedDict, Optional, List, Dict, Any
+from typing import TypedDict, Optional, List, Dict, Any, Annotated
 from langchain_core.documents import Document
 from pydantic import BaseModel, Field, validator
 
@@ -27,6 +27,20 @@ class FinalReport(BaseModel):
         return v
 
 
+def merge_documents(current: Optional[List[Document]], new: Optional[List[Document]]) -> List[Document]:
+    """
+    `documents` anahtarı için reducer. Farklı düğümlerden (ana arama, odaklanmış
+    arama) gelen dokümanları, içerik bazında tekrarsız olarak birleştirir.
+    """
+    merged = list(current or [])
+    seen = {doc.page_content for doc in merged}
+    for doc in new or []:
+        if doc.page_content not in seen:
+            seen.add(doc.page_content)
+            merged.append(doc)
+    return merged
+
+
 class GraphState(TypedDict):
     """
     Grafiğin durumu. Her bir düğüm tarafından güncellenen ve diğer
@@ -35,26 +49,37 @@ class GraphState(TypedDict):
     Attributes:
         query: Kullanıcının orijinal sorgusu.
         entities: Sorgudan çıkarılan varlıklar (yatırım konusu, bölge, tutar, sektör kodu).
+        sector_number: Yatırım konusunun EK-2A sıra numarası; EK-2B il tablosu sektörleri bu numarayla listeler.
         is_regionally_eligible: Yatırımın, EK-2B'ye göre bölgesel teşvike uygun olup olmadığını belirten boolean bayrak.
         is_large_scale: Yatırımın, EK-3'e göre Büyük Ölçekli Yatırım şartlarını karşılayıp karşılamadığını belirten boolean bayrak.
         is_prohibited: Yatırımın, EK-4'e göre teşvik edilmeyenler listesinde olup olmadığını belirten boolean bayrak.
-        documents: Vektör veritabanından alınan ilgili mevzuat metinleri.
+        documents: Vektör veritabanından alınan ilgili mevzuat metinleri. Birden fazla düğüm
+            yazabildiği için `merge_documents` reducer'ı ile tekrarsız birleştirilir.
+        focused_documents: Odaklanmış aramadan ayrıca gelen dokümanlar (varsa).
         investment_type: Yatırımın türü ve gerekçesi.
         special_conditions: Yatırımın tabi olduğu özel koşullar ve istisnalar.
         support_analysis: Belirlenen destek unsurları ve detayları.
         temporal_directive: Zamana bağlı analiz için oluşturulan direktif metni.
+        temporal_directives: Analiz tarihine göre uygulanacak mevzuat direktiflerinin listesi (metin).
+        acquired_rights_warning: Geçmiş tarihli sorgular için kazanılmış hak uyarısı.
         extracted_details: "ÖZEL NOT"lar için sorgudan çıkarılan kritik detaylar.
+        region_info: Standartlaştırılmış il adı ve teşvik bölgesi bilgisi.
         final_response: Kullanıcıya sunulacak nihai metin.
     """
     query: str
     entities: Optional[ExtractedEntities] = None
+    sector_number: Optional[str] = None
     is_regionally_eligible: bool = False
     is_large_scale: bool = False
     is_prohibited: bool = False
-    documents: Optional[List[Document]] = None
+    documents: Annotated[Optional[List[Document]], merge_documents] = None
+    focused_documents: Optional[List[Document]] = None
     investment_type: Optional[InvestmentTypeAnalysis] = None
     special_conditions: Optional[SpecialConditions] = None
     support_analysis: Optional[SupportAnalysis] = None
     temporal_directive: Optional[str] = None
+    temporal_directives: Optional[str] = None
+    acquired_rights_warning: Optional[str] = None
     extracted_details: Optional[ExtractedDetails] = None
+    region_info: Optional[Dict[str, Any]] = None
     final_response: Optional[str] = None
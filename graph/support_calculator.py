@@ -0,0 +1,319 @@
+# graph/support_calculator.py
+"""
+Destek unsurlarını LLM'e gitmeden, bilgi bankasındaki oran tablolarından
+(graph/knowledge.py: SUPPORT_DEFINITIONS, GENERAL_SUPPORTS) hesaplayan motor.
+
+Girdi: yatırım tutarı, teşvik bölgesi, yatırım türü ve analiz tarihi.
+Çıktı: Alanları doldurulmuş `SupportItem` listesi (oranlar, yatırıma katkı
+tutarı, faiz desteği üst limiti, sigorta primi süresi) ve yıllara göre
+tahmini destek nakit akışı.
+
+Hesaplama numpy dizileri üzerinde yapılır: `evaluate` bir tutar dizisi alır ve
+tüm tutar varyantlarını tek seferde hesaplar; tek bir tutar, bir elemanlı
+dizidir. Böylece bin farklı tutarı denemek, bir tutarı hesaplamakla aşağı
+yukarı aynı maliyettedir.
+
+Oran tabloları sadece genel, bölgesel ve öncelikli yatırımlar için bilgi
+bankasında yer alır. Büyük ölçekli ve stratejik yatırımların oranları
+tablolarda olmadığından bu türler için `calculate_supports` None döndürür ve
+destek analizi LLM zincirine bırakılır. Bölgesel ve öncelikli yatırımlarda
+bölge veya tarihe ait oran tablosu çözümlenemezse de None döner; bölgesel
+destekler eksik bir planla sessizce düşürülmez. 6. bölgedeki sigorta primi (işçi
+hissesi) desteği `SupportItem` destek adları arasında olmadığından raporlanmaz.
+"""
+import re
+from datetime import date
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+from graph.chains.support_analyzer import CashFlowYear, SupportAnalysis, SupportItem
+from graph.knowledge import GENERAL_SUPPORTS
+from graph.knowledge_resolver import snapshot_for
+
+TAX_REDUCTION = "Vergi İndirimi"
+EMPLOYER_PREMIUM = "Sigorta Primi İşveren Hissesi Desteği"
+INTEREST_SUPPORT = "Faiz Desteği"
+LAND_ALLOCATION = "Yatırım Yeri Tahsisi"
+INCOME_TAX_WITHHOLDING = "Gelir Vergisi Stopajı Desteği"
+
+# Yatırım türü -> uygulanabilir destekler (Madde 4). Öncelikli yatırımlar
+# bölgesel teşvik desteklerinden 5. bölge oranlarıyla yararlanır (Madde 17).
+REGIONAL_SUPPORTS = (*GENERAL_SUPPORTS, TAX_REDUCTION, EMPLOYER_PREMIUM, INTEREST_SUPPORT, LAND_ALLOCATION)
+ALLOWED_SUPPORTS: Dict[str, Tuple[str, ...]] = {
+    "Genel Teşvik": tuple(GENERAL_SUPPORTS),
+    "Bölgesel Teşvik": REGIONAL_SUPPORTS,
+    "Öncelikli Yatırım": REGIONAL_SUPPORTS,
+    # Teşvik edilmeyecek yatırımlar hiçbir destekten yararlanamaz.
+    "Kapsam Dışı": (),
+}
+CALCULABLE_TYPES = frozenset(ALLOWED_SUPPORTS)
+# Oranları bölgeye ve versiyonun tablolarına bağlı olan türler
+REGION_DEPENDENT_TYPES = frozenset({"Bölgesel Teşvik", "Öncelikli Yatırım"})
+
+# Faiz desteği 3, 4, 5 ve 6. bölgelerde uygulanır (Madde 4/3-e).
+INTEREST_SUPPORT_MIN_REGION = 3
+# Öncelikli yatırımlar 5. bölge desteklerinden yararlanır (6. bölgedekiler 6. bölgeden).
+PRIORITY_SUPPORT_REGION = 5
+# Gelir vergisi stopajı desteği, yatırım 6. bölgedeyse genel teşvikte de uygulanır (Madde 4/2-c, 4/3-f).
+WITHHOLDING_REGION = 6
+
+LEGAL_BASIS = {
+    "KDV İstisnası": "2012/3305 sayılı Karar, Madde 4 ve Madde 10",
+    "Gümrük Vergisi Muafiyeti": "2012/3305 sayılı Karar, Madde 4 ve Madde 9",
+    TAX_REDUCTION: "2012/3305 sayılı Karar, Madde 15 ve EK-2A Tablosu, {region}. Bölge",
+    EMPLOYER_PREMIUM: "2012/3305 sayılı Karar, Madde 12 ve EK-2A Tablosu, {region}. Bölge",
+    INTEREST_SUPPORT: "2012/3305 sayılı Karar, Madde 11 ve EK-2A Tablosu, {region}. Bölge",
+    LAND_ALLOCATION: "2012/3305 sayılı Karar, Madde 16",
+    INCOME_TAX_WITHHOLDING: "2012/3305 sayılı Karar, Madde 14 ve EK-2A Tablosu, {region}. Bölge",
+}
+
+ArrayLike = Union[float, List[float], np.ndarray]
+
+
+class CashFlowAssumptions(NamedTuple):
+    """
+    Yıllık nakit akışı için senaryo varsayımları. Oranlar mevzuattan gelir;
+    yatırımcının kârı, kredi kullanımı ve istihdamı ise bu varsayımlarla
+    tahmin edilir.
+    """
+    # Kurumlar vergisi oranı
+    corporate_tax_rate: float = 0.20
+    # Yatırımdan elde edilen yıllık vergi matrahının yatırım tutarına oranı
+    taxable_income_ratio: float = 0.15
+    # Kullanılan yatırım kredisinin sabit yatırım tutarına oranı (en fazla %70)
+    loan_ratio: float = 0.70
+    # Faiz desteği verilen kredi yılı sayısı; anapara eşit taksitlerle ödenir
+    loan_years: int = 5
+    # "TL" veya "Döviz"; faiz desteği puanını belirler
+    loan_currency: str = "TL"
+    # İşveren hissesi desteği tutarı için istihdam; 0 ise sadece süre raporlanır
+    employees: int = 0
+    # Çalışan başına yıllık SGK işveren hissesi (TL)
+    annual_employer_premium: float = 0.0
+    # Nakit akışı tablosunun kaç yıl için üretileceği
+    horizon_years: int = 10
+
+
+class SupportPlan(NamedTuple):
+    """Bir yatırım türü, bölge ve mevzuat versiyonu için çözümlenmiş destek oranları."""
+    investment_type: str
+    # Oranların okunduğu bölge (öncelikli yatırımlarda 5. veya 6. bölge)
+    support_region: Optional[int]
+    supports: Tuple[str, ...]
+    # Yüzde olarak; ilgili destek uygulanmıyorsa 0
+    contribution_rate: float
+    reduction_rate: float
+    tl_interest_points: float
+    fx_interest_points: float
+    interest_cap: float
+    employer_premium_years: int
+    withholding_years: int
+
+
+class SupportFigures(NamedTuple):
+    """`evaluate` çıktısı. Her dizinin ilk ekseni tutar varyantlarıdır; tablolar (n, yıl) boyutludur."""
+    amounts: np.ndarray
+    contribution: np.ndarray
+    tax_reduction: np.ndarray
+    interest_support: np.ndarray
+    employer_premium: np.ndarray
+    # Tahmini kâr ufuk içinde katkı tutarını tüketmeye yetmezse kalan kısım
+    unused_contribution: np.ndarray
+
+    @property
+    def total(self) -> np.ndarray:
+        return self.tax_reduction + self.interest_support + self.employer_premium
+
+
+def _support_region(investment_type: str, region: Optional[int]) -> Optional[int]:
+    if investment_type == "Öncelikli Yatırım":
+        return max(region or PRIORITY_SUPPORT_REGION, PRIORITY_SUPPORT_REGION)
+    return region
+
+
+@lru_cache(maxsize=256)
+def _plan(investment_type: str, region: Optional[int], effective_date: Optional[date]) -> SupportPlan:
+    support_region = _support_region(investment_type, region)
+    supports = ALLOWED_SUPPORTS[investment_type]
+    snapshot = snapshot_for(effective_date) if effective_date else None
+    table = snapshot.supports.get(str(support_region), {}) if snapshot and support_region else {}
+
+    if support_region and support_region < INTEREST_SUPPORT_MIN_REGION:
+        supports = tuple(name for name in supports if name != INTEREST_SUPPORT)
+    if supports and support_region == WITHHOLDING_REGION and INCOME_TAX_WITHHOLDING in table:
+        supports += (INCOME_TAX_WITHHOLDING,)
+    # Tabloda karşılığı olmayan bölgesel destekler raporlanmaz.
+    supports = tuple(name for name in supports if name in GENERAL_SUPPORTS or name == LAND_ALLOCATION or name in table)
+
+    tax = table.get(TAX_REDUCTION, {}) if TAX_REDUCTION in supports else {}
+    interest = table.get(INTEREST_SUPPORT, {}) if INTEREST_SUPPORT in supports else {}
+    premium = table.get(EMPLOYER_PREMIUM, {}) if EMPLOYER_PREMIUM in supports else {}
+    withholding = table.get(INCOME_TAX_WITHHOLDING, {}) if INCOME_TAX_WITHHOLDING in supports else {}
+    return SupportPlan(
+        investment_type=investment_type,
+        support_region=support_region,
+        supports=supports,
+        contribution_rate=float(tax.get("YKO", 0)),
+        reduction_rate=float(tax.get("İndirim Oranı", 0)),
+        tl_interest_points=float(interest.get("TL Puan", 0)),
+        fx_interest_points=float(interest.get("Döviz Puan", 0)),
+        interest_cap=float(interest.get("Limit (Bin TL)", 0)) * 1000,
+        employer_premium_years=int(premium.get("Süre (yıl)", 0)),
+        withholding_years=int(withholding.get("Süre (yıl)", 0)),
+    )
+
+
+def _parse_region(region: Optional[Union[int, str]]) -> Optional[int]:
+    """1-6 arası bölge numarasını döndürür ("6", 6, "6. Bölge"); çözümlenemezse None."""
+    match = re.search(r"(?<!\d)([1-6])(?!\d)", str(region)) if region else None
+    return int(match.group(1)) if match else None
+
+
+def plan_for(investment_type: str, region: Optional[Union[int, str]], on_date: date) -> Optional[SupportPlan]:
+    """
+    Yatırım türü ve bölge için verilen tarihte geçerli destek oranlarını
+    döndürür. Tür, bilgi bankasındaki tablolarla hesaplanamıyorsa veya
+    bölgesel bir türün bölgesi ya da tarihe ait oran tablosu yoksa None döner.
+    """
+    if investment_type not in CALCULABLE_TYPES:
+        return None
+    region_number = _parse_region(region)
+    snapshot = snapshot_for(on_date)
+    if investment_type in REGION_DEPENDENT_TYPES and (
+            snapshot is None or _support_region(investment_type, region_number) is None):
+        return None
+    # Aynı versiyondaki tüm tarihler aynı planı paylaşır.
+    return _plan(investment_type, region_number, snapshot.effective_date if snapshot else None)
+
+
+def _capped_schedule(yearly: np.ndarray, cap: np.ndarray) -> np.ndarray:
+    """Yıllık tutarları, kümülatif toplam üst sınırı aşmayacak şekilde kırpar."""
+    cumulative = np.minimum(np.cumsum(yearly, axis=1), cap[:, None])
+    return np.diff(cumulative, axis=1, prepend=0.0)
+
+
+def evaluate(amounts: ArrayLike, plan: SupportPlan,
+             assumptions: CashFlowAssumptions = CashFlowAssumptions()) -> SupportFigures:
+    """
+    Tutar varyantlarının tamamı için destek tutarlarını ve yıllık nakit
+    akışını tek seferde hesaplar.
+    """
+    amounts = np.atleast_1d(np.asarray(amounts, dtype=np.float64))
+    years = np.arange(1, assumptions.horizon_years + 1, dtype=np.float64)
+
+    # Vergi indirimi: Katkı tutarı = YKO x yatırım tutarı. Katkı, her yıl
+    # indirimli vergi ödenerek (matrah x vergi oranı x indirim oranı) tükenir.
+    contribution = amounts * plan.contribution_rate / 100
+    yearly_saving = amounts * assumptions.taxable_income_ratio * assumptions.corporate_tax_rate * plan.reduction_rate / 100
+    tax_reduction = _capped_schedule(np.broadcast_to(yearly_saving[:, None], (amounts.size, years.size)), contribution)
+
+    # Faiz desteği: Kalan anapara üzerinden puan kadar faiz, üst limite kadar ödenir.
+    points = plan.tl_interest_points if assumptions.loan_currency == "TL" else plan.fx_interest_points
+    outstanding = np.clip(1 - (years - 1) / max(assumptions.loan_years, 1), 0, None) * (years <= assumptions.loan_years)
+    loans = amounts * assumptions.loan_ratio
+    interest_support = _capped_schedule(np.outer(loans, outstanding) * points / 100, np.full(amounts.size, plan.interest_cap))
+
+    # İşveren hissesi desteği: Tutardan bağımsızdır, destek süresi boyunca sabittir.
+    premium_year = assumptions.employees * assumptions.annual_employer_premium * (years <= plan.employer_premium_years)
+    employer_premium = np.broadcast_to(premium_year, (amounts.size, years.size))
+
+    return SupportFigures(
+        amounts=amounts,
+        contribution=contribution,
+        tax_reduction=tax_reduction,
+        interest_support=interest_support,
+        employer_premium=employer_premium,
+        unused_contribution=contribution - tax_reduction.sum(axis=1),
+    )
+
+
+def _format_tl(value: float) -> str:
+    if value >= 1_000_000:
+        return f"{value / 1_000_000:,.2f} Milyon TL".replace(",", "X").replace(".", ",").replace("X", ".")
+    return f"{value:,.0f} TL".replace(",", ".")
+
+
+def _format_number(value: float) -> str:
+    return f"{value:g}"
+
+
+def _support_item(name: str, plan: SupportPlan, contribution: Optional[float]) -> SupportItem:
+    legal_basis = LEGAL_BASIS[name].format(region=plan.support_region)
+    if name in GENERAL_SUPPORTS:
+        return SupportItem(support_name=name, description=GENERAL_SUPPORTS[name], legal_basis=legal_basis)
+    if name == TAX_REDUCTION:
+        return SupportItem(
+            support_name=name,
+            yatirima_katki_orani=f"%{_format_number(plan.contribution_rate)}",
+            vergi_indirim_orani=f"%{_format_number(plan.reduction_rate)}",
+            yatirima_katki_tutari=contribution,
+            description=("Yatırımdan elde edilen kazançlar, yatırıma katkı tutarına ulaşılıncaya kadar indirimli "
+                         "kurumlar veya gelir vergisine tabi tutulur."
+                         + (f" Yatırıma katkı tutarı {_format_tl(contribution)}." if contribution else "")),
+            legal_basis=legal_basis,
+        )
+    if name == EMPLOYER_PREMIUM:
+        return SupportItem(
+            support_name=name,
+            sigorta_primi_destegi_suresi=f"{plan.employer_premium_years} Yıl",
+            destek_suresi_yil=plan.employer_premium_years,
+            description="Yatırımla sağlanan ilave istihdam için asgari ücrete tekabül eden sigorta primi işveren hissesi Bakanlıkça karşılanır.",
+            legal_basis=legal_basis,
+        )
+    if name == INTEREST_SUPPORT:
+        return SupportItem(
+            support_name=name,
+            tl_kredi_faiz_destegi_puani=f"{_format_number(plan.tl_interest_points)} Puan",
+            doviz_kredi_faiz_destegi_puani=f"{_format_number(plan.fx_interest_points)} Puan",
+            faiz_destegi_ust_limiti=_format_tl(plan.interest_cap),
+            faiz_destegi_ust_limiti_tl=plan.interest_cap,
+            description="Teşvik belgesi kapsamındaki yatırım için kullanılan kredilerin faizinin belirtilen puanlık kısmı, üst limite kadar Bakanlıkça karşılanır.",
+            legal_basis=legal_basis,
+        )
+    if name == INCOME_TAX_WITHHOLDING:
+        return SupportItem(
+            support_name=name,
+            destek_suresi_yil=plan.withholding_years,
+            description=f"Yatırımla sağlanan ilave istihdam için ücretlerden kesilen gelir vergisi {plan.withholding_years} yıl süreyle terkin edilir.",
+            legal_basis=legal_basis,
+        )
+    return SupportItem(
+        support_name=name,
+        description="Yatırım için uygun bulunan yerlerde, Maliye Bakanlığınca belirlenen usul ve esaslar çerçevesinde yatırım yeri tahsis edilebilir.",
+        legal_basis=legal_basis,
+    )
+
+
+def _cash_flow(figures: SupportFigures, index: int = 0) -> List[CashFlowYear]:
+    rows = np.stack([figures.tax_reduction[index], figures.interest_support[index], figures.employer_premium[index]])
+    return [
+        CashFlowYear(
+            year=year,
+            vergi_indirimi=round(float(tax), 2),
+            faiz_destegi=round(float(interest), 2),
+            sigorta_primi_destegi=round(float(premium), 2),
+            toplam=round(float(tax + interest + premium), 2),
+        )
+        for year, (tax, interest, premium) in enumerate(rows.T, start=1)
+    ]
+
+
+def calculate_supports(amount: Optional[float], region: Optional[Union[int, str]], investment_type: str, on_date: date,
+                       assumptions: CashFlowAssumptions = CashFlowAssumptions()) -> Optional[SupportAnalysis]:
+    """
+    Tek bir yatırım için destek unsurlarını ve nakit akışını hesaplar. Tutar
+    bilinmiyorsa sadece oranlar, süreler ve limitler doldurulur. Yatırım türü
+    tablolarla hesaplanamıyorsa None döner.
+    """
+    plan = plan_for(investment_type, region, on_date)
+    if plan is None:
+        return None
+
+    figures = evaluate(amount, plan, assumptions) if amount else None
+    contribution = float(figures.contribution[0]) if figures is not None and plan.contribution_rate else None
+    return SupportAnalysis(
+        supports=[_support_item(name, plan, contribution) for name in plan.supports],
+        cash_flow=_cash_flow(figures) if figures is not None and plan.supports else None,
+    )
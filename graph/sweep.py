@@ -0,0 +1,206 @@
+# graph/sweep.py
+"""
+"En çok destek nerede?" taraması: Bir yatırım konusunu ve tutarını, tüm
+iller ve bir tarih aralığındaki tüm mevzuat versiyonları için tek seferde
+değerlendirir ve illeri tahmini toplam desteğe göre sıralar.
+
+Her il x versiyon hücresi için ayrı bir analiz çalıştırmak yerine:
+- İllerin her versiyondaki bölgeleri (knowledge_resolver anlık görüntüleri)
+  bir (il, versiyon) matrisinde,
+- EK-2B'nin il -> desteklenen sektör tablosu bir (il, sektör) matrisinde
+  bir kez tutulur.
+Destek tutarları hesaplama motoruyla (graph/support_calculator.py) her farklı
+(yatırım türü, bölge, oran tablosu) için bir kez hesaplanır ve hücrelere
+dizi indekslemesiyle dağıtılır. Böylece 81 il x tüm versiyonlar milisaniyeler
+içinde sıralanır; tam LLM raporu sadece seçilen adaylar için üretilir
+(bkz. province_sweep.py).
+
+Büyük ölçekli yatırım oranları bilgi bankasında olmadığından EK-3 eşiğini
+aşan yatırımlar bölgesel tablolarla sıralanır ve `large_scale` ile işaretlenir.
+"""
+import logging
+import threading
+from bisect import bisect_right
+from datetime import date
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from graph.knowledge_resolver import SNAPSHOTS, KnowledgeSnapshot
+from graph.mevzuat_denetcisi import MevzuatDenetcisi, get_mevzuat_denetcisi
+from graph.support_calculator import CALCULABLE_TYPES, CashFlowAssumptions, evaluate, plan_for
+
+logging.basicConfig(level=logging.INFO, format='   > %(message)s')
+
+# Taramada hücrelere atanan yatırım türleri; dizilerde indeksleriyle tutulur.
+SWEEP_TYPES = ("Genel Teşvik", "Bölgesel Teşvik", "Kapsam Dışı")
+GENERAL, REGIONAL, EXCLUDED = range(len(SWEEP_TYPES))
+# Bölge numaraları doğrudan indeks olarak kullanılır (0: bölgesi bilinmeyen il).
+REGION_SLOTS = 7
+
+
+class SweepRow(NamedTuple):
+    """Sıralanmış tarama tablosunun bir satırı (il x mevzuat versiyonu)."""
+    rank: int
+    province: str
+    region: int
+    # Satırın değerlendirildiği tarih: versiyonun yürürlük tarihi veya aralığın başı
+    analysis_date: date
+    decision: Optional[str]
+    investment_type: str
+    # İl EK-2B'de yoksa None
+    regionally_eligible: Optional[bool]
+    large_scale: bool
+    contribution: float
+    interest_cap: float
+    employer_premium_years: int
+    total_support: float
+
+
+class ProvinceSweep:
+    """İl x versiyon bölge matrisi ile il x sektör EK-2B matrisini tutan tarayıcı."""
+
+    def __init__(self, denetci: MevzuatDenetcisi, snapshots: List[KnowledgeSnapshot] = SNAPSHOTS):
+        self.denetci = denetci
+        self.snapshots = snapshots
+        self._dates = [snapshot.effective_date for snapshot in snapshots]
+        self.provinces: Tuple[str, ...] = tuple(sorted({city for s in snapshots for city in s.regions}))
+        self.regions = np.array(
+            [[int(s.regions.get(city, 0)) for s in snapshots] for city in self.provinces], dtype=np.int8
+        )
+        self._build_ek2b_matrix()
+
+    def _build_ek2b_matrix(self) -> None:
+        """
+        EK-2B: (il, EK-2A sıra numarası) -> desteklenir mi; il EK-2B'de yoksa
+        satırı bilinmiyor sayılır. Sütunlar US-97 koduyla değil, sıra numarasıyla indekslenir.
+        """
+        province_sectors = [self.denetci.sectors_for_province(city) for city in self.provinces]
+        sectors = sorted(set().union(*(s for s in province_sectors if s)))
+        self._sector_index: Dict[str, int] = {code: i for i, code in enumerate(sectors)}
+        self.ek2b = np.zeros((len(self.provinces), len(sectors)), dtype=bool)
+        for row, codes in enumerate(province_sectors):
+            for code in codes or ():
+                self.ek2b[row, self._sector_index[code]] = True
+        self.ek2b_known = np.array([codes is not None for codes in province_sectors], dtype=bool)
+
+    def _columns(self, start: date, end: date) -> np.ndarray:
+        """[start, end] aralığının herhangi bir anında yürürlükte olan versiyonların indeksleri."""
+        first = max(bisect_right(self._dates, start) - 1, 0)
+        last = bisect_right(self._dates, end) - 1
+        return np.arange(first, last + 1)
+
+    def _value_tables(self, columns: np.ndarray, amount: float, types: Tuple[str, ...],
+                      assumptions: CashFlowAssumptions) -> Dict[str, np.ndarray]:
+        """
+        (versiyon, tür, bölge) -> destek değerleri tabloları. Aynı oranları
+        paylaşan versiyonlar için hesaplama motoru bir kez çalışır.
+        """
+        shape = (len(columns), len(types), REGION_SLOTS)
+        tables = {name: np.zeros(shape) for name in ("contribution", "interest_cap", "employer_premium_years", "total_support")}
+        computed: Dict[tuple, Tuple[float, float, int, float]] = {}
+        for d, column in enumerate(columns):
+            on_date = self._dates[column]
+            for t, investment_type in enumerate(types):
+                for region in range(1, REGION_SLOTS):
+                    plan = plan_for(investment_type, region, on_date)
+                    values = computed.get(plan)
+                    if values is None:
+                        figures = evaluate(amount, plan, assumptions)
+                        values = (float(figures.contribution[0]), plan.interest_cap,
+                                  plan.employer_premium_years, float(figures.total[0].sum()))
+                        computed[plan] = values
+                    for name, value in zip(tables, values):
+                        tables[name][d, t, region] = value
+        return tables
+
+    def sweep(self, topic: str, amount: float, start: Optional[date] = None, end: Optional[date] = None,
+              sector_number: Optional[str] = None, investment_type: Optional[str] = None,
+              assumptions: CashFlowAssumptions = CashFlowAssumptions(),
+              best_per_province: bool = True, top: Optional[int] = None) -> List[SweepRow]:
+        """
+        Yatırımı tüm iller ve [start, end] aralığındaki tüm mevzuat versiyonları
+        için değerlendirir; satırları tahmini toplam desteğe göre azalan sırada
+        döndürür. `investment_type` verilirse (örn. "Öncelikli Yatırım") tüm
+        iller bu türle, verilmezse EK-2B uygunluğuna göre bölgesel veya genel
+        teşvikle değerlendirilir. `best_per_province` ile her il için sadece en
+        çok destek sağlayan versiyon listelenir. `sector_number` verilirse konu
+        yerine bu EK-2A sıra numarası kullanılır. Sektör bulunamazsa boş liste döner.
+        """
+        start = start or date.today()
+        end = max(end or start, start)
+        sector = self.denetci.sector_by_number(sector_number) if sector_number else self.denetci.match_sector(topic)
+        if sector is None:
+            logging.warning(f"   > '{sector_number or topic}' için EK-2A'da bir sektör bulunamadı; tarama yapılamıyor.")
+            return []
+        sector_code = sector.code
+        columns = self._columns(start, end)
+        if not len(columns):
+            logging.warning(f"   > {start} - {end} aralığında yürürlükte bir mevzuat versiyonu yok.")
+            return []
+
+        # --- İl bazında uygunluk ve yatırım türü ---
+        # EK-2B uygunluğu EK-2A sıra numarasıyla, EK-3/EK-4 denetimleri US-97 koduyla yapılır.
+        sector_column = self._sector_index.get(sector.row)
+        eligible = self.ek2b[:, sector_column] if sector_column is not None else np.zeros(len(self.provinces), dtype=bool)
+        large_scale = self.denetci.check_large_scale_eligibility(sector_code, amount)
+        if investment_type is not None:
+            if investment_type not in CALCULABLE_TYPES:
+                raise ValueError(f"'{investment_type}' türü oran tablolarıyla hesaplanamıyor.")
+            types = (investment_type,)
+            type_codes = np.zeros(len(self.provinces), dtype=np.intp)
+        else:
+            types = SWEEP_TYPES
+            type_codes = np.where(eligible, REGIONAL, GENERAL)
+            if self.denetci.check_prohibited_list(sector_code):
+                type_codes[:] = EXCLUDED
+
+        # --- Hücre değerleri: tablolardan (versiyon, tür, bölge) ile toplama ---
+        tables = self._value_tables(columns, amount, types, assumptions)
+        regions = self.regions[:, columns].astype(np.intp)
+        version_axis = np.arange(len(columns))[None, :]
+        cells = {name: table[version_axis, type_codes[:, None], regions] for name, table in tables.items()}
+
+        # --- Sıralama ---
+        if best_per_province:
+            # Eşitlikte aralığın başına en yakın versiyon seçilir.
+            rows, cols = np.arange(len(self.provinces)), np.argmax(cells["total_support"], axis=1)
+        else:
+            rows, cols = (axis.ravel() for axis in np.indices(regions.shape))
+        order = np.lexsort((cols, rows, -cells["contribution"][rows, cols], -cells["total_support"][rows, cols]))
+        if top is not None:
+            order = order[:top]
+
+        result = []
+        for rank, index in enumerate(order, start=1):
+            row, col = rows[index], cols[index]
+            snapshot = self.snapshots[columns[col]]
+            result.append(SweepRow(
+                rank=rank,
+                province=self.provinces[row],
+                region=int(regions[row, col]),
+                analysis_date=max(snapshot.effective_date, start),
+                decision=snapshot.decision,
+                investment_type=types[type_codes[row]],
+                regionally_eligible=bool(eligible[row]) if self.ek2b_known[row] else None,
+                large_scale=large_scale,
+                contribution=float(cells["contribution"][row, col]),
+                interest_cap=float(cells["interest_cap"][row, col]),
+                employer_premium_years=int(cells["employer_premium_years"][row, col]),
+                total_support=float(cells["total_support"][row, col]),
+            ))
+        return result
+
+
+_province_sweep: Optional[ProvinceSweep] = None
+_lock = threading.Lock()
+
+
+def get_province_sweep() -> ProvinceSweep:
+    """Süreç genelinde paylaşılan il taramasını döndürür; ilk çağrıda matrisleri oluşturur."""
+    global _province_sweep
+    if _province_sweep is None:
+        with _lock:
+            if _province_sweep is None:
+                _province_sweep = ProvinceSweep(get_mevzuat_denetcisi())
+    return _province_sweep
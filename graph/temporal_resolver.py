@@ -1,62 +1,70 @@
 # graph/temporal_resolver.py
-import json
 from datetime import date, datetime
-from typing import List, Dict, Optional
+from functools import lru_cache
+from typing import List, Optional
 
 # ExtractedDetails Pydantic modelini import et
 from .chains.detail_extractor import ExtractedDetails
+from .annotation_store import DirectiveSet, get_annotation_store
 
-ANNOTATIONS_FILE = "annotations.json"
-
-def _get_primary_analysis_date(extracted_details: Optional[ExtractedDetails]) -> date:
+def get_primary_analysis_date(extracted_details: Optional[ExtractedDetails]) -> date:
     """
-    Öncelik sırasına göre analiz için kullanılacak ana tarihi belirler.
-    Eğer kullanıcı bir tarih belirtmişse onu, belirtmemişse bugünü kullanır.
-    Bu fonksiyon, 'None' değerlerine karşı dayanıklıdır.
+    Analiz için kullanılacak ana tarihi belirler.
+    Eğer kullanıcı bir referans tarihi belirtmişse onu, belirtmemişse bugünü kullanır.
+    Bu fonksiyon, 'None' değerlerine ve sözlük biçimindeki detaylara karşı dayanıklıdır.
     """
-    if extracted_details:
-        # Öncelik sırası: başvuru > belge > yatırım başlangıcı
-        if extracted_details.application_date:
-            return extracted_details.application_date
-        if extracted_details.certificate_date:
-            return extracted_details.certificate_date
-        if extracted_details.investment_start_date:
-            return extracted_details.investment_start_date
-            
+    if isinstance(extracted_details, dict):
+        reference_date = extracted_details.get("reference_date")
+    else:
+        reference_date = getattr(extracted_details, "reference_date", None)
+
+    if isinstance(reference_date, date):
+        return reference_date
+    if isinstance(reference_date, str) and reference_date:
+        try:
+            return datetime.strptime(reference_date[:10], "%Y-%m-%d").date()
+        except ValueError:
+            pass
+
     # Eğer hiçbir tarih belirtilmemişse veya 'extracted_details' None ise, bugünü varsay
     return date.today()
 
-def resolve_temporal_directives(extracted_details: Optional[ExtractedDetails]) -> str:
+@lru_cache(maxsize=256)
+def _render_directives(directive_set: DirectiveSet) -> str:
+    """Bir kural kümesini direktif listesine çevirir. Aynı aralıktaki tüm tarihler bu metni paylaşır."""
+    lines: List[str] = []
+    for rule in directive_set.active:
+        if rule.directive:
+            lines.append(f"- {rule.directive} (Kaynak: {rule.legal_source}, Kural ID: {rule.change_id})")
+    for rule in directive_set.pending:
+        # Kural ID'si bilinçli olarak yazılmaz: ID'ye bakan kural tabanlı kontroller,
+        # henüz yürürlüğe girmemiş bir kuralı geçerliymiş gibi algılamamalıdır.
+        if rule.past_state_directive:
+            lines.append(
+                f"- GEÇMİŞ DURUM: {rule.past_state_directive} "
+                f"(Kaynak: {rule.legal_source}, {rule.effective_date.strftime('%d.%m.%Y')} öncesi)"
+            )
+    return "\n".join(lines)
+
+def resolve_directives_for_date(analysis_date: date) -> str:
     """
-    Kullanıcının sorgusundan çıkarılan hassas tarih bilgisini ve annotations.json dosyasını
-    kullanarak, analiz için bir direktif seti oluşturur.
+    Verilen analiz tarihi için direktif metnini oluşturur. Toplu 'what-if'
+    raporlarında doğrudan tarih listesi üzerinde çağrılabilir.
     """
-    analysis_date = _get_primary_analysis_date(extracted_details)
-    
-    try:
-        with open(ANNOTATIONS_FILE, 'r', encoding='utf-8') as f:
-            annotations: List[Dict] = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
+    store = get_annotation_store()
+    if store.error and not store.rules:
         return "UYARI: Annotations dosyası bulunamadı veya bozuk. Analiz sadece güncel mevzuata göre yapılacaktır."
 
-    applicable_directives: List[str] = []
-    
-    for change in annotations:
-        try:
-            # effective_date'i datetime.date nesnesine çevir
-            effective_date = datetime.strptime(change["effective_date"], "%Y-%m-%d").date()
-        except (ValueError, TypeError, KeyError):
-            # Hatalı veya eksik tarihli kuralları atla
-            continue 
-
-        # Kuralın analiz tarihinde geçerli olup olmadığını kontrol et
-        if analysis_date >= effective_date:
-            directive_to_add = change.get("directive")
-            if directive_to_add:
-                applicable_directives.append(f"- {directive_to_add} (Kaynak: {change.get('legal_source', 'N/A')}, Kural ID: {change.get('change_id', 'N/A')})")
-
-    if not applicable_directives:
+    body = _render_directives(store.rules_on(analysis_date))
+    if not body:
         return "Tarihsel analize göre uygulanacak özel bir direktif bulunamadı. Mevcut mevzuat kurallarını standart olarak uygula."
 
     header = f"DİKKAT: Analiz, {analysis_date.strftime('%d.%m.%Y')} tarihi mevzuatına göre yapılıyor. Aşağıdaki direktiflere kesinlikle uyulmalıdır:\n"
-    return header + "\n".join(applicable_directives)
\ No newline at end of file
+    return header + body
+
+def resolve_temporal_directives(extracted_details: Optional[ExtractedDetails]) -> str:
+    """
+    Kullanıcının sorgusundan çıkarılan hassas tarih bilgisini ve annotations.json dosyasını
+    kullanarak, analiz için bir direktif seti oluşturur.
+    """
+    return resolve_directives_for_date(get_primary_analysis_date(extracted_details))
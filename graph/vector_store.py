@@ -1,35 +1,166 @@
 # graph/vector_store.py
 """
-Bu modül, uygulama boyunca kullanılacak olan merkezi vektör veritabanı 
-retriever nesnesini başlatır ve yönetir.
+Bu modül, uygulama boyunca kullanılacak olan merkezi vektör veritabanını
+yönetir.
+
+Index ve docstore süreç başına yalnızca bir kez diskten yüklenir, bellekte
+sıcak tutulur ve tüm düğümlere aynı nesne verilir. Diskteki index dosyaları
+değiştiğinde (mtime/boyut imzası) yeni index arka planda yüklenir ve hazır
+olduğunda tek bir atama ile devreye alınır; o sırada çalışan sorgular eski
+nesneyi kullanmaya devam eder, hiçbir sorgu yeniden yükleme için beklemez.
+
+Index, pickle içermeyen yerel biçimde (bkz. graph/native_index.py) okunur.
+Eski `FAISS.save_local` çıktısı olan klasörler de yüklenebilir; bu durumda
+bir uyarı verilir.
 """
+import asyncio
+import logging
 import os
-from langchain_community.vectorstores.faiss import FAISS
-from langchain_openai import OpenAIEmbeddings
+import threading
+import time
+from typing import Optional, Tuple
+
+from graph.core.embedding_cache import get_embeddings
+from graph.native_index import INDEX_FILES, NativeVectorStore, is_native_index
 
 # Sabitler
 DB_FAISS_PATH = "mevzuat_veritabani"
+# Eski (FAISS.save_local) biçimdeki index dosyalarının adı
+INDEX_NAME = "index"
+# Diskteki index'in değişip değişmediği en fazla bu sıklıkta (saniye) kontrol edilir.
+RELOAD_CHECK_INTERVAL = 5.0
+
+
+class VectorStoreManager:
+    """
+    Vektör veritabanını süreç başına bir kez yükleyen ve diskteki
+    değişiklikleri izleyerek kendini güncelleyen yönetici.
+    """
+
+    def __init__(self, db_path: str = DB_FAISS_PATH, check_interval: float = RELOAD_CHECK_INTERVAL):
+        self.db_path = db_path
+        self.check_interval = check_interval
+        self._store = None
+        self._signature: Optional[Tuple] = None
+        self._last_check = 0.0
+        # Aynı anda yalnızca tek bir yükleme yapılmasını sağlar.
+        self._load_lock = threading.Lock()
+
+    def _read_signature(self) -> Tuple:
+        """Index dosyalarının (mtime, boyut) imzasını okur. Dosyalar yoksa hata fırlatır."""
+        if not os.path.exists(self.db_path):
+            raise FileNotFoundError(
+                f"'{self.db_path}' klasöründe vektör veritabanı bulunamadı. "
+                "Lütfen önce 'vector_db_builder.py' script'ini çalıştırarak veritabanını oluşturun."
+            )
+        if is_native_index(self.db_path):
+            file_names = INDEX_FILES
+        else:
+            file_names = (f"{INDEX_NAME}.faiss", f"{INDEX_NAME}.pkl")
+        signature = []
+        for file_name in file_names:
+            stat = os.stat(os.path.join(self.db_path, file_name))
+            signature.append((file_name, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def _load(self):
+        """Veritabanını diskten yükler."""
+        if is_native_index(self.db_path):
+            return NativeVectorStore(self.db_path, get_embeddings())
+
+        from langchain_community.vectorstores.faiss import FAISS
+
+        logging.warning(
+            f"   > '{self.db_path}' eski (pickle tabanlı) FAISS biçiminde. "
+            "Yerel biçime geçmek için 'vector_db_builder.py' script'ini çalıştırın."
+        )
+        return FAISS.load_local(
+            folder_path=self.db_path,
+            embeddings=get_embeddings(),
+            index_name=INDEX_NAME,
+            # pydantic v2 uyumluluğu için allow_dangerous_deserialization eklenmesi gerekiyor
+            allow_dangerous_deserialization=True
+        )
+
+    def get(self):
+        """
+        Yüklü vektör veritabanını döndürür. İlk çağrıda yüklemeyi yapar;
+        sonraki çağrılarda gerekirse arka planda yeniden yüklemeyi tetikler.
+        """
+        store = self._store
+        if store is not None:
+            self._maybe_reload()
+            return store
+
+        with self._load_lock:
+            if self._store is None:
+                signature = self._read_signature()
+                logging.info(f"   > Vektör veritabanı '{self.db_path}' yükleniyor...")
+                self._store = self._load()
+                self._signature = signature
+                self._last_check = time.monotonic()
+            return self._store
+
+    async def aget(self):
+        """
+        `get` metodunun asenkron karşılığı. İlk yükleme disk ve pickle işlemi
+        içerdiğinden olay döngüsünü bloklamamak için ayrı bir thread'de yapılır.
+        """
+        if self._store is not None:
+            return self.get()
+        return await asyncio.to_thread(self.get)
+
+    def _maybe_reload(self) -> None:
+        """İmza değiştiyse yeni index'i bloklamadan arka planda yükler."""
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return
+        self._last_check = now
+
+        try:
+            signature = self._read_signature()
+        except OSError:
+            # Index yeniden yazılıyor olabilir; eldeki sürümü kullanmaya devam et.
+            return
+        if signature == self._signature:
+            return
+
+        # Başka bir thread zaten yüklüyorsa bekleme, mevcut nesneyle devam et.
+        if not self._load_lock.acquire(blocking=False):
+            return
+        threading.Thread(target=self._reload, args=(signature,), daemon=True).start()
+
+    def _reload(self, signature: Tuple) -> None:
+        try:
+            logging.info(f"   > '{self.db_path}' diskte değişti. Vektör veritabanı arka planda yeniden yükleniyor...")
+            new_store = self._load()
+            self._store = new_store
+            self._signature = signature
+            logging.info("   > Vektör veritabanı yeniden yüklendi.")
+        except Exception as e:
+            # Yarım yazılmış bir index olabilir; eski nesne kullanılmaya devam eder,
+            # imza güncellenmediği için bir sonraki kontrolde tekrar denenir.
+            logging.error(f"   > HATA: Vektör veritabanı yeniden yüklenemedi, eski sürüm kullanılıyor: {e}")
+        finally:
+            self._load_lock.release()
+
+    def invalidate(self) -> None:
+        """Bir sonraki çağrıda index imzasının hemen kontrol edilmesini sağlar."""
+        self._last_check = 0.0
+
+
+# Singleton instance
+vector_store_manager = VectorStoreManager()
+
 
 def get_vector_store():
     """
-    FAISS vektör veritabanını diskten yükler ve bir FAISS nesnesi olarak döndürür.
+    Süreç genelinde paylaşılan vektör veritabanını döndürür.
     Veritabanı mevcut değilse bir hata fırlatır.
     """
-    if not os.path.exists(DB_FAISS_PATH):
-        raise FileNotFoundError(
-            f"'{DB_FAISS_PATH}' klasöründe vektör veritabanı bulunamadı. "
-            "Lütfen önce 'vector_db_builder.py' script'ini çalıştırarak veritabanını oluşturun."
-        )
-    
-    # Embedding modelini başlat
-    embeddings = OpenAIEmbeddings()
-    
-    # Veritabanını diskten yükle
-    db = FAISS.load_local(
-        folder_path=DB_FAISS_PATH, 
-        embeddings=embeddings, 
-        index_name="index",
-        # pydantic v2 uyumluluğu için allow_dangerous_deserialization eklenmesi gerekiyor
-        allow_dangerous_deserialization=True 
-    )
-    return db 
\ No newline at end of file
+    return vector_store_manager.get()
+
+
+async def aget_vector_store():
+    """`get_vector_store` fonksiyonunun asenkron karşılığı."""
+    return await vector_store_manager.aget()
@@ -1,8 +1,10 @@
+import argparse
 import asyncio
 import logging
+import threading
 from dotenv import load_dotenv
 import os
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator
 
 # --- 1. Adım: API Anahtarını ve Ortam Değişkenlerini Yükle ---
 # Diğer her şeyden önce bu çalışmalı.
@@ -28,23 +30,56 @@ console_handler.setFormatter(formatter)
 logging.getLogger().addHandler(console_handler)
 
 
-# --- 3. Adım: Graph ve Diğer Bağımlılıkları Import Et ---
-# Loglama ve dotenv ayarlandıktan sonra importları yap.
-from graph.graph import create_graph
-from langchain_core.runnables.graph import MermaidDrawMethod
+# --- 3. Adım: Graph ve Diğer Bağımlılıklar (İlk Kullanımda) ---
+# langgraph, langchain ve tüm zincir modülleri `main` import edilirken değil,
+# grafik ilk kez gerektiğinde yüklenir. Böylece Streamlit yeniden çalıştırmaları
+# ve yeni başlayan worker'lar bu maliyeti sadece ilk istekte öder.
+_app = None
+_app_lock = threading.Lock()
 
-# Uygulama grafiğini global olarak oluştur
-app = create_graph()
+def get_app():
+    """Derlenmiş uygulama grafiğini döndürür; ilk çağrıda (bir kez) oluşturur."""
+    global _app
+    if _app is None:
+        with _app_lock:
+            if _app is None:
+                from graph.graph import create_graph
+                _app = create_graph()
+    return _app
+
+async def aget_app():
+    """`get_app` fonksiyonunun asenkron karşılığı; ilk derleme olay döngüsünü bloklamaz."""
+    if _app is not None:
+        return _app
+    return await asyncio.to_thread(get_app)
+
+def __getattr__(name):
+    # Eski `from main import app` kullanımları için
+    if name == "app":
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# METRICS_PORT tanımlıysa düğüm metriklerini yerel bir HTTP uç noktasından sun
+if os.getenv("METRICS_PORT"):
+    from graph.core.instrumentation import start_metrics_server
+    start_metrics_server()
 
 async def get_investment_report(query: str, config: Dict = None) -> Dict[str, Any]:
     """
     Verilen bir sorgu için yatırım analizini çalıştırır ve nihai raporu döndürür.
     """
+    from graph.core.instrumentation import trace_request
+
     if config is None:
         config = {"recursion_limit": 50}
-        
+
+    app = await aget_app()
     logging.info("Grafik akışı başlatılıyor...")
-    final_state = await app.ainvoke({"query": query}, config=config)
+    # Her istek, düğüm bazında süre/token/maliyet içeren tek bir iz kaydı üretir (logs/traces.jsonl).
+    with trace_request(query) as trace:
+        final_state = await app.ainvoke({"query": query}, config=config)
+        if not final_state.get("final_response"):
+            trace.status = "error"
     
     # Analiz bittiğinde, state'in son halinden raporu çekiyoruz.
     # Pydantic modelinden dict'e dönüşüm olmuş olabilir, .get() güvenlidir.
@@ -65,6 +100,91 @@ async def get_investment_report(query: str, config: Dict = None) -> Dict[str, An
     return final_response_obj
 
 
+# Akış (streaming) modunda kullanıcıya gösterilecek düğüm açıklamaları
+NODE_LABELS = {
+    "query_extractor": "Yatırım konusu, tarih ve teşvik bölgesi çıkarılıyor",
+    "entity_extractor": "Yatırım konusu, bölge ve tutar çıkarılıyor",
+    "detail_extractor": "Tarih ve kritik detaylar çıkarılıyor",
+    "region_resolver": "Teşvik bölgesi belirleniyor",
+    "mevzuat_auditor": "Mevzuat uygunluk denetimi (EK-2B, EK-3, EK-4)",
+    "retrieve_documents": "İlgili mevzuat metinleri aranıyor",
+    "temporal_resolver": "Zamana bağlı direktifler çözümleniyor",
+    "investment_type_analyzer": "Yatırım türü analiz ediliyor",
+    "focused_retriever": "Destek oranları için odaklanmış arama yapılıyor",
+    "condition_analyzer": "Özel koşullar analiz ediliyor",
+    "support_analyzer": "Destek unsurları belirleniyor",
+    "final_response_synthesizer": "Nihai rapor yazılıyor",
+}
+
+# Raporun bölümleri, LLM'in JSON'u ürettiği sırayla
+REPORT_SECTIONS = ["title", "summary", "reasoning", "supports_section", "conditions_section", "legal_references"]
+
+async def stream_investment_report(query: str, config: Dict = None) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Analizi akış (streaming) modunda çalıştırır. Sırasıyla şu olayları üretir:
+
+    - {"type": "node_start" | "node_end", "node": ..., "label": ...}: Düğüm ilerlemesi.
+    - {"type": "report_partial", "report": {...}}: Nihai rapor token'ları geldikçe
+      ayrıştırılan, kısmen tamamlanmış rapor bölümleri.
+    - {"type": "final", "report": {...}} veya {"type": "error", "error": ...}: Sonuç.
+    """
+    from graph.core.instrumentation import trace_request
+    from langchain_core.utils.json import parse_partial_json
+
+    if config is None:
+        config = {"recursion_limit": 50}
+
+    app = await aget_app()
+    logging.info("Grafik akışı (streaming) başlatılıyor...")
+    buffer = ""
+    last_partial = None
+    final_report = None
+
+    with trace_request(query) as trace:
+        async for event in app.astream_events({"query": query}, config=config, version="v2"):
+            kind = event["event"]
+            node = event.get("metadata", {}).get("langgraph_node")
+
+            # Sadece düğümün kendi çalıştırması (alt zincirler değil) ilerleme olayı üretir.
+            if kind in ("on_chain_start", "on_chain_end") and node and event.get("name") == node:
+                yield {"type": "node_start" if kind == "on_chain_start" else "node_end", "node": node, "label": NODE_LABELS.get(node, node)}
+                if kind == "on_chain_end" and node == "final_response_synthesizer":
+                    output = event.get("data", {}).get("output") or {}
+                    final_report = output.get("final_response") if isinstance(output, dict) else None
+
+            elif kind == "on_chat_model_stream" and node == "final_response_synthesizer":
+                chunk = event["data"].get("chunk")
+                content = getattr(chunk, "content", "") or ""
+                if not isinstance(content, str) or not content:
+                    continue
+                buffer += content
+                partial = parse_partial_json(buffer)
+                if isinstance(partial, dict) and partial != last_partial:
+                    last_partial = partial
+                    yield {"type": "report_partial", "report": partial}
+        if not final_report:
+            trace.status = "error"
+
+    if not final_report:
+        logging.error("Akış tamamlandı ancak nihai rapor (final_response) oluşturulamadı.")
+        yield {"type": "error", "error": "Nihai rapor oluşturulamadı. Detaylar için logları kontrol edin."}
+        return
+
+    if hasattr(final_report, 'dict'):
+        final_report = final_report.dict()
+    yield {"type": "final", "report": final_report}
+
+def _print_section(name: str, value: Any) -> None:
+    """Rapor bölümünü konsola yazdırır."""
+    if name == "title":
+        print(f"\n## {value}")
+    elif name == "legal_references":
+        print("\nYasal Dayanaklar:")
+        for reference in value or []:
+            print(f"  - {reference}")
+    else:
+        print(f"\n{value}")
+
 async def main_cli():
     """
     Komut satırı arayüzünü çalıştırır.
@@ -80,19 +200,30 @@ async def main_cli():
             if not user_query.strip():
                 continue
 
-            # Raporu al
-            final_report = await get_investment_report(user_query)
-
-            # Raporu konsola yazdır
             print("\n" + "="*80)
             print(" ✨ YATIRIM TEŞVİK ANALİZ RAPORU ✨")
             print("="*80)
-            
-            if final_report.get("error"):
-                print(f"\n❌ HATA: {final_report.get('error')}")
-            else:
-                print(final_report.get("report", "Rapor içeriği bulunamadı."))
-                
+
+            # Raporu akış halinde al: düğüm ilerlemesini ve tamamlanan bölümleri hemen yazdır.
+            printed = set()
+            async for event in stream_investment_report(user_query):
+                if event["type"] == "node_start":
+                    print(f"  ⏳ {event['label']}...")
+                elif event["type"] == "report_partial":
+                    # Bir bölüm, JSON'da ondan sonraki anahtar görünmeye başladığında tamamlanmıştır.
+                    keys = [k for k in event["report"] if k in REPORT_SECTIONS]
+                    for section in keys[:-1]:
+                        if section not in printed:
+                            printed.add(section)
+                            _print_section(section, event["report"][section])
+                elif event["type"] == "final":
+                    for section in REPORT_SECTIONS:
+                        if section not in printed and event["report"].get(section):
+                            printed.add(section)
+                            _print_section(section, event["report"][section])
+                elif event["type"] == "error":
+                    print(f"\n❌ HATA: {event['error']}")
+
             print("\n" + "="*80)
 
         except KeyboardInterrupt:
@@ -111,7 +242,20 @@ if __name__ == "__main__":
     ana komut satırı arayüzü (CLI) fonksiyonunu çalıştırır.
     KeyboardInterrupt (Ctrl+C) gibi istisnaları yakalayarak programın
     temiz bir şekilde sonlanmasını sağlar.
+
+    `--draw-graph` ile sadece grafik şeması çizilir ('graph.png').
     """
+    parser = argparse.ArgumentParser(description="Yatırım Teşvik Asistanı komut satırı arayüzü.")
+    parser.add_argument("--draw-graph", nargs="?", const="graph.png", metavar="DOSYA",
+                        help="Grafik yapısını çizip kaydeder ve çıkar (varsayılan: graph.png).")
+    args = parser.parse_args()
+
+    if args.draw_graph:
+        from graph.graph import draw_graph
+        path = draw_graph(get_app(), args.draw_graph)
+        print(f"Grafik yapısı '{path}' dosyasına kaydedildi.")
+        raise SystemExit(0)
+
     # Windows'ta "Event loop is already running" hatasını önlemek için
     if os.name == 'nt':  # Sadece Windows için geçerli
         asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
@@ -126,12 +270,3 @@ if __name__ == "__main__":
         # Beklenmedik bir hata olursa logla ve kullanıcıya bildir
         logging.critical(f"Program ana döngüde beklenmedik bir hata ile çöktü: {e}")
         print(f"\nProgram kritik bir hata nedeniyle durduruldu. Detaylar için 'logs/debug.log' dosyasına bakın.")
-
-    # Grafik yapısını çizmek için (opsiyonel, debug için faydalı)
-    try:
-        graph_image = app.get_graph().draw_mermaid_png(draw_method=MermaidDrawMethod.PYPPETEER)
-        with open("graph.png", "wb") as f:
-            f.write(graph_image)
-        logging.info("Grafik yapısı 'graph.png' dosyasına kaydedildi.")
-    except Exception as e:
-        logging.warning(f"Grafik çizimi oluşturulamadı (pyppeteer/Chromium kurulu olmayabilir): {e}")
\ No newline at end of file
@@ -0,0 +1,94 @@
+# province_sweep.py
+"""
+"Bu yatırım en çok desteği hangi ilde alır?" sorusu için tarama aracı.
+
+Yatırım konusu ve tutarı, tüm iller ve verilen tarih aralığındaki tüm
+mevzuat versiyonları için LLM'e gitmeden değerlendirilir (graph/sweep.py) ve
+sıralı tablo yazdırılır. `--report` ile sadece ilk N aday için tam LLM
+analizi, toplu analiz moduyla (batch_runner.py) çalıştırılır.
+
+Kullanım:
+    python province_sweep.py "tekstil fabrikası" 50000000 --start 2014-01-01 --end 2018-12-31
+    python province_sweep.py "otel" 20000000 --top 10 --report 3 -o aday_raporlari.jsonl
+"""
+import argparse
+import asyncio
+import os
+import time
+from datetime import date, datetime
+from typing import List
+
+from graph.support_calculator import CashFlowAssumptions
+from graph.sweep import SweepRow, get_province_sweep
+
+
+def _parse_date(value: str) -> date:
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def _print_table(rows: List[SweepRow]) -> None:
+    print(f"{'#':>3}  {'İl':<16}{'Bölge':>6}  {'Tarih':<11} {'Tür':<18}{'EK-2B':>6}  "
+          f"{'Katkı (TL)':>15} {'Faiz limiti':>12} {'SGK yıl':>8} {'Toplam destek (TL)':>19}")
+    for row in rows:
+        eligible = "?" if row.regionally_eligible is None else ("evet" if row.regionally_eligible else "hayır")
+        print(f"{row.rank:>3}  {row.province:<16}{row.region:>6}  {row.analysis_date.isoformat():<11} "
+              f"{row.investment_type:<18}{eligible:>6}  {row.contribution:>15,.0f} {row.interest_cap:>12,.0f} "
+              f"{row.employer_premium_years:>8} {row.total_support:>19,.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bir yatırımı tüm iller ve mevzuat versiyonları için sıralar.")
+    parser.add_argument("topic", help="Yatırım konusu (örn: 'tekstil fabrikası').")
+    parser.add_argument("amount", type=float, help="Sabit yatırım tutarı (TL).")
+    parser.add_argument("--start", type=_parse_date, help="Tarih aralığının başı (YYYY-MM-DD); varsayılan bugün.")
+    parser.add_argument("--end", type=_parse_date, help="Tarih aralığının sonu (YYYY-MM-DD); varsayılan başlangıç.")
+    parser.add_argument("--sector-number", help="Konu yerine doğrudan kullanılacak EK-2A sıra numarası (EK-2B'deki numara).")
+    parser.add_argument("--type", dest="investment_type", help="Tüm iller için zorlanacak yatırım türü (örn: 'Öncelikli Yatırım').")
+    parser.add_argument("--all-versions", action="store_true", help="Her il için sadece en iyi versiyonu değil, tüm versiyonları listele.")
+    parser.add_argument("--top", type=int, default=20, help="Yazdırılacak satır sayısı.")
+    parser.add_argument("--employees", type=int, default=0, help="Sigorta primi desteği tutarı için istihdam.")
+    parser.add_argument("--annual-employer-premium", type=float, default=0.0, help="Çalışan başına yıllık SGK işveren hissesi (TL).")
+    parser.add_argument("--report", type=int, default=0, help="Tam LLM raporu üretilecek ilk aday sayısı.")
+    parser.add_argument("--concurrency", type=int, default=2, help="Aday raporları için eşzamanlılık.")
+    parser.add_argument("-o", "--output", default="sweep_reports.jsonl", help="Aday raporlarının yazılacağı JSONL dosyası.")
+    args = parser.parse_args()
+
+    assumptions = CashFlowAssumptions(employees=args.employees, annual_employer_premium=args.annual_employer_premium)
+    sweep = get_province_sweep()
+    start = time.perf_counter()
+    rows = sweep.sweep(
+        args.topic, args.amount, start=args.start, end=args.end, sector_number=args.sector_number,
+        investment_type=args.investment_type, assumptions=assumptions,
+        best_per_province=not args.all_versions, top=max(args.top, args.report),
+    )
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    print(f"'{args.topic}', {args.amount:,.0f} TL: {len(rows)} satır, {elapsed_ms:.1f} ms")
+    if not rows:
+        print("Konu için EK-2A'da bir sektör bulunamadı veya tarih aralığında yürürlükte bir versiyon yok.")
+        return
+    if rows[0].large_scale:
+        print("NOT: Tutar EK-3 büyük ölçekli yatırım eşiğini aşıyor; büyük ölçekli oranlar için tam rapor gereklidir.")
+    _print_table(rows[:args.top])
+
+    if args.report <= 0:
+        return
+
+    # Tam analiz sadece seçilen adaylar için çalıştırılır.
+    from batch_runner import run_batch
+
+    candidates = [
+        {"id": f"sweep-{row.rank}-{row.province}", "il": row.province, "sektor": args.topic,
+         "tutar": int(args.amount), "tarih": row.analysis_date.isoformat()}
+        for row in rows[:args.report]
+    ]
+    if os.name == 'nt':
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    summary = asyncio.run(run_batch(candidates, args.output, args.concurrency))
+    print(f"\n{summary['succeeded']}/{summary['scenarios']} aday raporu '{args.output}' dosyasına yazıldı "
+          f"({summary['wall_seconds']:.1f} sn).")
+    print(f"Token: {summary['total_tokens']:,}, tahmini maliyet ${summary['cost_usd']:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -27,37 +27,55 @@ sektorler = [
 
 # --- Fonksiyonlar ---
 
-def rastgele_tarih_uret(baslangic=date(2012, 6, 15), bitis=date(2017, 12, 31)):
+def rastgele_tarih_uret(baslangic=date(2012, 6, 15), bitis=date(2017, 12, 31), rng=random):
     gun_farki = (bitis - baslangic).days
-    rastgele_gun = random.randint(0, gun_farki)
+    rastgele_gun = rng.randint(0, gun_farki)
     return baslangic + timedelta(days=rastgele_gun)
 
+def senaryo_sorusu(il, sektor, tutar, tarih=None):
+    """Senaryo bilgilerinden asistana sorulacak soru metnini oluşturur."""
+    soru = f"{il}'de, yaklaşık {tutar:,} TL yatırım bedeli olan bir {sektor} kurmak istiyorum."
+    if tarih:
+        soru += f" teşvik belgemi {tarih.strftime('%Y yılının %B ayında')} tarihinde aldım."
+    return soru + " Bu şartlar altında devletten ne gibi teşvikler alabilirim?"
+
+def senaryo_uret(rng=random):
+    """Rastgele bir yatırım senaryosunu sözlük olarak döndürür (ekrana yazdırmaz)."""
+    secilen_tarih = rastgele_tarih_uret(rng=rng)
+    secilen_il = rng.choice(iller)
+    secilen_sektor = rng.choice(sektorler)
+    rastgele_tutar = rng.randrange(5_000_000, 500_000_000, 1_000_000)
+    return {
+        "tarih": secilen_tarih,
+        "il": secilen_il,
+        "sektor": secilen_sektor,
+        "tutar": rastgele_tutar,
+        "soru": senaryo_sorusu(secilen_il, secilen_sektor, rastgele_tutar, secilen_tarih),
+    }
+
+def senaryo_listesi(adet, seed=None):
+    """Toplu analizler için `adet` kadar senaryo üretir. Aynı seed aynı listeyi verir."""
+    rng = random.Random(seed)
+    return [senaryo_uret(rng) for _ in range(adet)]
+
 def senaryo_olustur():
     """Sunum için rastgele bir yatırım senaryosu oluşturur."""
     
-    secilen_tarih = rastgele_tarih_uret()
-    secilen_il = random.choice(iller)
-    secilen_sektor = random.choice(sektorler)
-    rastgele_tutar = random.randrange(5_000_000, 500_000_000, 1_000_000)
+    senaryo = senaryo_uret()
 
     # 2. Verileri ekrana yazdır
     print("--- SUNUM İÇİN RASTGELE SENARYO ---")
-    print(f"Tarih    : {secilen_tarih.strftime('%d.%m.%Y')}")
-    print(f"İl       : {secilen_il}")
-    print(f"Sektör   : {secilen_sektor}")
-    print(f"Tutar    : {rastgele_tutar:,} TL")
+    print(f"Tarih    : {senaryo['tarih'].strftime('%d.%m.%Y')}")
+    print(f"İl       : {senaryo['il']}")
+    print(f"Sektör   : {senaryo['sektor']}")
+    print(f"Tutar    : {senaryo['tutar']:,} TL")
     print("-" * 35)
 
     # 3. Streamlit için hazır soru metni oluştur
-    soru = (
-        f"{secilen_il}'de, yaklaşık {rastgele_tutar:,} TL yatırım bedeli olan bir "
-        f"{secilen_sektor} kurmak istiyorum. teşvik belgemi {secilen_tarih.strftime('%Y yılının %B ayında')} "
-        f"tarihinde aldım. Bu şartlar altında devletten ne gibi teşvikler alabilirim?"
-    )
-    
     print("📋 Kopyalanmaya Hazır Soru Metni:\n")
-    print(soru)
+    print(senaryo["soru"])
     print("\n" + "="*50 + "\n")
+    return senaryo
 
 
 if __name__ == "__main__":
@@ -0,0 +1,39 @@
+# tests/test_investment_classifier.py
+"""Kural tabanlı yatırım türü sınıflandırıcısı (graph/investment_classifier.py)."""
+from datetime import date
+from types import SimpleNamespace
+
+from graph.investment_classifier import active_rule_ids_on, get_investment_type_classifier
+from graph.mevzuat_denetcisi import get_mevzuat_denetcisi
+
+# ONCELIKLI_YATIRIM_OTOMOTIV_GENISLEMESI bu tarihte yürürlüktedir (2013-02-15).
+POST_2013 = date(2020, 1, 1)
+
+
+def _classify(topic: str, region: str, amount: float, on_date: date):
+    denetci = get_mevzuat_denetcisi()
+    sector = denetci.match_sector(topic)
+    entities = SimpleNamespace(investment_topic=topic, investment_region=region,
+                               investment_amount=amount, investment_sector_code=sector.code)
+    flags = {
+        "is_prohibited": denetci.check_prohibited_list(sector.code),
+        "is_large_scale": denetci.check_large_scale_eligibility(sector.code, amount),
+        "is_regionally_eligible": denetci.check_regional_eligibility(sector.row, region),
+    }
+    return get_investment_type_classifier().classify(
+        entities, flags, active_rule_ids=active_rule_ids_on(on_date), sector_number=sector.row,
+    )
+
+
+def test_active_priority_rule_does_not_apply_to_unrelated_topic():
+    assert "ONCELIKLI_YATIRIM_OTOMOTIV_GENISLEMESI" in active_rule_ids_on(POST_2013)
+    decision = _classify("mobilya fabrikası", "Konya", 10_000_000, POST_2013)
+    assert decision.rule != "priority_candidate"
+    assert decision.analysis is not None
+    assert decision.analysis.investment_type != "Öncelikli Yatırım"
+
+
+def test_active_priority_rule_applies_to_its_topic():
+    decision = _classify("otomotiv yan sanayi fabrikası", "Konya", 10_000_000, POST_2013)
+    assert decision.analysis is None
+    assert decision.rule == "priority_candidate"
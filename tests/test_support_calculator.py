@@ -0,0 +1,56 @@
+# tests/test_support_calculator.py
+"""Oran tablolarından destek hesaplama motoru (graph/support_calculator.py)."""
+from datetime import date
+
+import numpy as np
+import pytest
+
+from graph.support_calculator import (
+    EMPLOYER_PREMIUM, INTEREST_SUPPORT, TAX_REDUCTION, CashFlowAssumptions, calculate_supports, evaluate, plan_for,
+)
+
+ANALYSIS_DATE = date(2016, 1, 1)
+# Bilgi bankasındaki ilk anlık görüntüden (2012/3305) önce
+BEFORE_FIRST_SNAPSHOT = date(2000, 1, 1)
+
+
+@pytest.mark.parametrize("investment_type", ["Bölgesel Teşvik", "Öncelikli Yatırım"])
+def test_plan_for_regional_types_without_snapshot(investment_type):
+    assert plan_for(investment_type, "6", BEFORE_FIRST_SNAPSHOT) is None
+
+
+@pytest.mark.parametrize("region", [None, "", "Bölge yok", "7"])
+def test_plan_for_regional_type_without_region(region):
+    assert plan_for("Bölgesel Teşvik", region, ANALYSIS_DATE) is None
+
+
+def test_plan_for_priority_type_defaults_to_region_5():
+    assert plan_for("Öncelikli Yatırım", None, ANALYSIS_DATE).support_region == 5
+
+
+def test_plan_for_parses_region_text():
+    assert plan_for("Bölgesel Teşvik", "6. Bölge", ANALYSIS_DATE) == plan_for("Bölgesel Teşvik", 6, ANALYSIS_DATE)
+
+
+def test_plan_for_type_without_rate_tables():
+    assert plan_for("Büyük Ölçekli Yatırım", "6", ANALYSIS_DATE) is None
+
+
+def test_calculate_supports_region_6():
+    amount = 100e6
+    analysis = calculate_supports(amount, "6", "Bölgesel Teşvik", ANALYSIS_DATE)
+    items = {item.support_name: item for item in analysis.supports}
+    assert {TAX_REDUCTION, EMPLOYER_PREMIUM, INTEREST_SUPPORT} <= set(items)
+    assert items[TAX_REDUCTION].yatirima_katki_tutari == pytest.approx(0.50 * amount)
+    assert items[INTEREST_SUPPORT].faiz_destegi_ust_limiti_tl == pytest.approx(900_000)
+
+
+def test_evaluate_vector_matches_scalar():
+    plan = plan_for("Bölgesel Teşvik", "4", ANALYSIS_DATE)
+    assumptions = CashFlowAssumptions(employees=50, annual_employer_premium=12_000)
+    amounts = np.linspace(1e6, 500e6, 1000)
+    vectorized = evaluate(amounts, plan, assumptions)
+    for index in (0, 1, 499, 998, 999):
+        scalar = evaluate(amounts[index], plan, assumptions)
+        for field in vectorized._fields:
+            np.testing.assert_allclose(getattr(vectorized, field)[index], getattr(scalar, field)[0])
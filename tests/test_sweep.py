@@ -0,0 +1,38 @@
+# tests/test_sweep.py
+"""İl x mevzuat versiyonu destek taraması (graph/sweep.py)."""
+from datetime import date
+
+from graph.sweep import get_province_sweep
+
+ANALYSIS_DATE = date(2016, 1, 1)
+
+
+def _rows_by_province(topic: str, **kwargs):
+    rows = get_province_sweep().sweep(topic, 50e6, start=ANALYSIS_DATE, **kwargs)
+    return {row.province: row for row in rows}
+
+
+def test_textile_uses_ek2a_row_number():
+    sweep = get_province_sweep()
+    sector = sweep.denetci.match_sector("tekstil fabrikası")
+    # EK-2B sektörleri EK-2A sıra numarasıyla listeler: tekstil 4. satır, US-97 kodu 17.
+    assert (sector.row, sector.code) == ("4", "17")
+    adana = _rows_by_province("tekstil fabrikası")["Adana"]
+    assert adana.regionally_eligible is True
+    assert adana.investment_type == "Bölgesel Teşvik"
+    assert adana.total_support > 0
+
+
+def test_sector_number_matches_topic():
+    assert _rows_by_province("tekstil fabrikası") == _rows_by_province("bilinmeyen konu", sector_number="4")
+
+
+def test_unknown_topic_returns_no_rows():
+    assert get_province_sweep().sweep("qwzx", 50e6, start=ANALYSIS_DATE) == []
+
+
+def test_best_per_province_returns_each_province_once():
+    rows = get_province_sweep().sweep("mobilya fabrikası", 50e6, start=date(2013, 1, 1), end=date(2023, 1, 1))
+    assert len(rows) == len({row.province for row in rows}) == len(get_province_sweep().provinces)
+    assert [row.rank for row in rows] == list(range(1, len(rows) + 1))
+    assert all(a.total_support >= b.total_support for a, b in zip(rows, rows[1:]))
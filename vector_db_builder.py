@@ -1,123 +1,397 @@
+import argparse
+import hashlib
 import json
+import re
+from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Any, Iterator
+from typing import List, Dict, Any, Iterable, Iterator, NamedTuple, Optional, Tuple
 import shutil
 
 from langchain.schema import Document
-from langchain_community.vectorstores import FAISS
-from langchain_openai import OpenAIEmbeddings
 from dotenv import load_dotenv
 import os
 
+from graph.core.embedding_cache import get_embeddings
+from graph.knowledge import VERSION_DATES
+from graph.native_index import NativeVectorStore, is_native_index, write_native_index
+
 # Sabitler
 DATA_PATH = Path("data")
-DB_PATH = "mevzuat_veritabani" # FAISS klasör olarak kaydeder
+DB_PATH = "mevzuat_veritabani" # Index klasör olarak kaydedilir (bkz. graph/native_index.py)
 MEVZUAT_DOSYASI = "karar_2012_3305_son_versiyon.json"
+# Embedding modeline tek seferde gönderilecek parça sayısı
+EMBED_BATCH_SIZE = 256
+# Index klasöründe, parça kimliği -> içerik özeti eşlemesini tutan dosya
+MANIFEST_FILE = "manifest.json"
+MANIFEST_FORMAT = 1
+
+# Dosya adı -> yürürlük tarihi. Karar ve ekleri (ek-*.json) 2012/3305'in yürürlük
+# tarihini alır; listede olmayan değişiklik kararları için giriş metnindeki karar tarihi kullanılır.
+SOURCE_EFFECTIVE_DATES = {
+    "karar_2012_3305_son_versiyon.json": VERSION_DATES["2012/3305"],
+    "teblig_2012_1.json": "2012-06-20",
+}
+# Ek içeriğinde, elemanları tek tek parça olacak kadar uzun metin listeleri (EK-4 konuları gibi)
+# bu uzunluktan (karakter) ayırt edilir; daha kısa listeler (il adları, GTIP kodları) tek satırda birleştirilir.
+LONG_ITEM_CHARS = 80
+# Ek satırlarındaki, parçanın başlığı/bağlamı olarak kullanılan alanlar
+CONTEXT_KEYS = ("bölümNo", "kategoriNo", "başlık", "bölgeNo")
+
+US97_PATTERN = re.compile(r"US-97[^:\n]*:\s*(\d+(?:\.\d+)*)")
+_DECISION_DATE_PATTERN = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4}) tarihinde kararlaştırılmıştır")
+
+
+def _effective_date(file_path: Path, data: Dict[str, Any]) -> Optional[str]:
+    """Kaynağın yürürlük tarihini (YYYY-MM-DD) belirler; bulunamazsa None."""
+    if file_path.name in SOURCE_EFFECTIVE_DATES:
+        return SOURCE_EFFECTIVE_DATES[file_path.name]
+    if file_path.name.startswith("ek-"):
+        return VERSION_DATES["2012/3305"]
+    match = _DECISION_DATE_PATTERN.search(data.get("giriş_metni") or "")
+    if match:
+        day, month, year = map(int, match.groups())
+        return datetime(year, month, day).date().isoformat()
+    return None
+
+
+def _us97_codes(text: str, row: Optional[Dict[str, Any]] = None) -> List[str]:
+    """Parça metninde veya tablo satırında geçen US-97 kodlarını döndürür."""
+    codes = US97_PATTERN.findall(text)
+    for key, value in (row or {}).items():
+        if "US-97" in key and value:
+            codes.extend(str(value).replace(",", " ").split())
+    return sorted(set(codes))
+
+
+def _format_value(value: Any) -> str:
+    if isinstance(value, list):
+        return ", ".join(str(item) for item in value if item is not None)
+    return str(value).strip()
+
+
+def _format_row(row: Dict[str, Any]) -> str:
+    """Tablo satırını 'Sütun: değer; ...' biçiminde tek satır metne dönüştürür."""
+    return "; ".join(f"{key}: {_format_value(value)}" for key, value in row.items() if value not in (None, "", []))
+
+
+def _make_document(text: str, source: str, effective_date: Optional[str], chunk_id: str, detay: str,
+                   kategori: str, row: Optional[Dict[str, Any]] = None, **metadata: Any) -> Document:
+    return Document(
+        page_content=text,
+        id=chunk_id,
+        metadata={
+            "id": chunk_id,
+            "source": source,
+            "kategori": kategori,
+            "detay": detay,
+            "effective_date": effective_date,
+            "us97_codes": _us97_codes(text, row),
+            **metadata,
+        },
+    )
+
+
+def _fikra_list(madde: Dict[str, Any]) -> List[Dict[str, Any]]:
+    # Değişiklik kararında bazı maddelerde anahtar 'fıkral' olarak yazılmış.
+    return madde.get("fıkralar") or madde.get("fıkral") or []
+
+
+def _iter_madde_chunks(madde: Dict[str, Any], source: str, stem: str,
+                       effective_date: Optional[str]) -> Iterator[Document]:
+    """Bir maddeyi fıkra, bent ve tablo satırı düzeyinde parçalara ayırır."""
+    madde_no = madde.get("maddeNo") or ""
+    baslik = madde.get("başlık")
+    heading = f"Madde {madde_no}" + (f" - {baslik}" if baslik else "")
 
-def _serialize_recursive(data: Any) -> Iterator[str]:
+    for f_index, fikra in enumerate(_fikra_list(madde), 1):
+        fikra_no = fikra.get("fıkraNo") or str(f_index)
+        lead = (fikra.get("metin") or "").strip()
+        base_id = f"{stem}:madde-{madde_no}:fikra-{fikra_no}"
+        detay = f"Madde {madde_no}/{fikra_no}"
+        common = dict(source=source, effective_date=effective_date, kategori="Madde",
+                      madde_no=madde_no, fikra_no=fikra_no)
+        bentler = fikra.get("altBentler") or []
+        tablo = fikra.get("tablo") or {}
+
+        # Bentli fıkralarda fıkranın giriş cümlesi her bendin bağlamı olarak tekrar edilir.
+        if lead and not bentler:
+            yield _make_document(f"{heading} (fıkra {fikra_no})\n{lead}", chunk_id=base_id, detay=detay, **common)
+        for b_index, bent in enumerate(bentler, 1):
+            bent_no = bent.get("bentNo") or str(b_index)
+            text = f"{heading} (fıkra {fikra_no}, bent {bent_no})\n{lead}\n{bent_no}) {(bent.get('metin') or '').strip()}"
+            yield _make_document(text, chunk_id=f"{base_id}:bent-{bent_no}", detay=f"{detay}-{bent_no}",
+                                 bent_no=bent_no, **common)
+        for r_index, row in enumerate(tablo.get("satirlar") or [], 1):
+            text = f"{heading} (fıkra {fikra_no}, tablo satırı {r_index})\n{_format_row(row)}"
+            yield _make_document(text, chunk_id=f"{base_id}:satir-{r_index}", detay=f"{detay} tablo",
+                                 row=row, **common)
+
+
+def _iter_ek_rows(node: Any, context: Tuple[str, ...], path: Tuple[str, ...]):
     """
-    Karmaşık ve iç içe geçmiş JSON yapılarından (sözlükler, listeler)
-    anlamlı metin parçaları üreten yardımcı bir generator fonksiyonu.
+    Ek içeriğini gezerek (bağlam, yol, metin, satır) dörtlüleri üretir. Alt
+    yapı içermeyen her sözlük bir tablo satırı, uzun metin listelerinin her
+    elemanı ayrı bir satırdır; kısa listeler satırın içinde birleştirilir.
     """
-    if isinstance(data, dict):
-        for key, value in data.items():
-            # Anahtarları başlık gibi kullanarak okunabilirliği artır
-            processed_key = key.replace("_", " ").replace("-", " ").title()
-            # Değeri de özyineli olarak işle
-            for sub_value in _serialize_recursive(value):
-                # Sadece metin içeren anahtarları değil, tüm yapıyı metne dök
-                # Örn: "İl Adı: Adana", "Sektör Numaraları: 1 2 3"
-                if sub_value and not sub_value.isspace():
-                     # Basit anahtar-değer çiftleri için daha temiz format
-                    if not any(isinstance(v, (dict, list)) for v in data.values()):
-                         yield f"{processed_key}: {sub_value}"
-                         break # Aynı seviyedeki diğer anahtarlara geç
-                    else:
-                         yield sub_value
-
-    elif isinstance(data, list):
-        for item in data:
-            yield from _serialize_recursive(item)
-    elif data is not None:
-        yield str(data).strip()
+    if isinstance(node, list):
+        for index, item in enumerate(node, 1):
+            if isinstance(item, (dict, list)):
+                yield from _iter_ek_rows(item, context, path + (str(index),))
+            elif item not in (None, ""):
+                yield context, path + (str(index),), str(item).strip(), None
+        return
+    if not isinstance(node, dict):
+        return
 
-def load_documents_from_decision(file_path: Path) -> List[Document]:
+    def is_nested(value: Any) -> bool:
+        if isinstance(value, dict):
+            return True
+        if isinstance(value, list):
+            return any(isinstance(v, (dict, list)) or len(str(v)) > LONG_ITEM_CHARS for v in value)
+        return False
+
+    nested = {key: value for key, value in node.items() if is_nested(value)}
+    if not nested:
+        yield context, path, _format_row(node), node
+        return
+    scalars = [f"{_format_value(node[key])}" for key in CONTEXT_KEYS if node.get(key) not in (None, "")]
+    child_context = context + (" ".join(scalars),) if scalars else context
+    for key, value in nested.items():
+        # Tablo sütun başlıkları ayrıca parça olmaz; her satır zaten sütun adlarını taşır.
+        if key == "tablo":
+            value = value.get("satirlar") or []
+        # Aynı düzeyde birden fazla liste varsa (tablo + dipnotlar) yollar anahtar adıyla ayrışır.
+        child_path = path + (key,) if len(nested) > 1 and key != "tablo" else path
+        yield from _iter_ek_rows(value, child_context, child_path)
+
+
+def _iter_ek_chunks(ek: Dict[str, Any], source: str, stem: str,
+                    effective_date: Optional[str]) -> Iterator[Document]:
+    """Bir eki tablo satırı / liste elemanı düzeyinde parçalara ayırır."""
+    ek_no = ek.get("ekNo") or ""
+    baslik = ek.get("başlık") or ek.get("baslik") or ""
+    content = {key: value for key, value in ek.items() if key not in ("ekNo", "başlık", "baslik")}
+    for context, path, text, row in _iter_ek_rows(content, (), ()):
+        if not text:
+            continue
+        location = " / ".join(context)
+        header = f"{ek_no} - {baslik}" + (f" - {location}" if location else "")
+        row_ref = ".".join(path) or "1"
+        # Tek başına ek dosyalarında (ek-2b.json) ek numarası zaten dosya adındadır.
+        prefix = stem if stem == ek_no.lower() else f"{stem}:{ek_no.lower()}"
+        yield _make_document(f"{header}\n{text}", source=source, effective_date=effective_date,
+                             chunk_id=f"{prefix}:satir-{row_ref}", detay=f"{ek_no} satır {row_ref}",
+                             kategori="Ek", row=row, ek_no=ek_no)
+
+
+def iter_file_chunks(file_path: Path) -> Iterator[Document]:
     """
-    Belirtilen Karar JSON dosyasını yükler. Hem 'maddeler'i hem de 'ekler'i
-    kendi yapılarına uygun, bütüncül ve ayrı Document nesneleri olarak işler.
+    Tek bir mevzuat JSON dosyasını (karar, tebliğ, değişiklik kararı veya
+    tek bir ek) fıkra/bent/tablo satırı düzeyinde parçalara ayırarak üretir.
     """
-    all_documents = []
-    print(f"-> Nihai İşleme: {file_path.name}")
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"  - HATA: '{file_path.name}' okunamadı veya JSON formatı bozuk. {e}")
+        return
 
-        # 1. Maddeleri İşle
-        maddeler_listesi = data.get("maddeler", [])
-        if maddeler_listesi:
-            for madde in maddeler_listesi:
-                baslik = madde.get("başlık", "Başlıksız Madde")
-                madde_no = madde.get("maddeNo", "")
-                
-                # Fıkra ve bentlerden tam metni birleştir
-                content_parts = list(_serialize_recursive(madde.get("fıkralar", [])))
-                if not content_parts:
-                    continue
-                
-                page_content = f"Madde No: {madde_no} - Başlık: {baslik}\n\n" + "\n".join(content_parts)
-                doc = Document(page_content=page_content, metadata={"source": file_path.name, "kategori": "Madde", "detay": f"Madde {madde_no}"})
-                all_documents.append(doc)
-            print(f"  + {len(maddeler_listesi)} madde başarıyla ayrıştırıldı.")
-
-        # 2. Ekleri İşle
-        ekler_listesi = data.get("ekler", [])
-        if ekler_listesi:
-            for ek in ekler_listesi:
-                baslik = ek.get("baslik", "Başlıksız Ek")
-                ek_no = ek.get("ekNo", "")
-
-                # Karmaşık ek içeriğini okunabilir bir metne dönüştür
-                content_parts = list(_serialize_recursive(ek.get("icerik", ek)))
-                if not content_parts:
-                    continue
-
-                page_content = f"Ek No: {ek_no} - Başlık: {baslik}\n\n" + "\n".join(content_parts)
-                doc = Document(page_content=page_content, metadata={"source": file_path.name, "kategori": "Ek", "detay": f"Ek {ek_no}"})
-                all_documents.append(doc)
-            print(f"  + {len(ekler_listesi)} ek başarıyla ayrıştırıldı.")
+    source, stem = file_path.name, file_path.stem
+    effective_date = _effective_date(file_path, data)
+    seen_ids = set()
+    count = 0
+
+    if "ekNo" in data:
+        chunks = _iter_ek_chunks(data, source, stem, effective_date)
+    else:
+        def chunks():
+            for madde in data.get("maddeler", []):
+                yield from _iter_madde_chunks(madde, source, stem, effective_date)
+            for ek in data.get("ekler", []):
+                yield from _iter_ek_chunks(ek, source, stem, effective_date)
+        chunks = chunks()
+
+    for doc in chunks:
+        # Numarası olmayan (None) fıkralarda aynı kimlik tekrar edebilir; sıra eki ile tekilleştir.
+        chunk_id, suffix = doc.id, 2
+        while chunk_id in seen_ids:
+            chunk_id, suffix = f"{doc.id}~{suffix}", suffix + 1
+        seen_ids.add(chunk_id)
+        doc.id = doc.metadata["id"] = chunk_id
+        count += 1
+        yield doc
+    print(f"  + {source}: {count} parça")
 
-    except (FileNotFoundError, json.JSONDecodeError) as e:
-        print(f"  - HATA: Dosya okunamadı veya JSON formatı bozuk. {e}")
-            
-    return all_documents
 
-def build_vector_db():
+def iter_corpus_chunks(data_path: Path = DATA_PATH) -> Iterator[Document]:
+    """data/ klasöründeki tüm JSON dosyalarını sırayla ve akış halinde parçalara ayırır."""
+    for file_path in sorted(data_path.glob("*.json")):
+        yield from iter_file_chunks(file_path)
+
+
+def batched(items: Iterable[Document], size: int) -> Iterator[List[Document]]:
+    """Akışı en fazla `size` elemanlık listeler halinde döndürür."""
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def load_documents_from_decision(file_path: Path) -> List[Document]:
+    """Belirtilen mevzuat dosyasının tüm parçalarını liste olarak döndürür."""
+    return list(iter_file_chunks(file_path))
+
+
+class IndexPlan(NamedTuple):
+    """Mevcut index ile data/ arasındaki farklar."""
+    to_embed: List[Document]
+    changed_ids: List[str]
+    deleted_ids: List[str]
+    unchanged: int
+    # Güncelleme sonrası manifest: parça kimliği -> içerik özeti
+    chunks: Dict[str, str]
+    full_rebuild: bool
+
+
+def chunk_hash(doc: Document) -> str:
+    """Parçanın metni ve metadata'sından içerik özeti üretir."""
+    payload = json.dumps({"text": doc.page_content, "metadata": doc.metadata}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_manifest(db_path: str = DB_PATH) -> Optional[Dict[str, Any]]:
+    """Index klasöründeki manifest'i okur; yoksa veya bozuksa None döner."""
+    try:
+        with open(Path(db_path) / MANIFEST_FILE, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    return manifest if manifest.get("format") == MANIFEST_FORMAT else None
+
+
+def plan_update(chunks: Iterable[Document], manifest: Optional[Dict[str, Any]], model_name: str) -> IndexPlan:
     """
-    Mevzuat metinlerini işleyerek bir FAISS vektör veritabanı oluşturur ve kaydeder.
+    Parça akışını manifest ile karşılaştırır. Manifest yoksa veya farklı bir
+    embedding modeliyle oluşturulmuşsa tüm parçalar yeniden embed edilir.
     """
-    print("\n--- Vektör Veritabanı Oluşturma (FAISS Standardı) ---")
-    db_path_obj = Path(DB_PATH)
-    if db_path_obj.exists():
-        print(f"\n🧹 Mevcut veritabanı '{DB_PATH}' temizleniyor...")
-        shutil.rmtree(db_path_obj)
-
-    documents = load_documents_from_decision(DATA_PATH / MEVZUAT_DOSYASI)
-    
-    if not documents:
+    full_rebuild = manifest is None or manifest.get("embedding_model") != model_name
+    previous: Dict[str, str] = {} if full_rebuild else manifest["chunks"]
+    to_embed, changed_ids, current = [], [], {}
+    unchanged = 0
+    for doc in chunks:
+        digest = chunk_hash(doc)
+        current[doc.id] = digest
+        old = previous.get(doc.id)
+        if old == digest:
+            unchanged += 1
+            continue
+        if old is not None:
+            changed_ids.append(doc.id)
+        to_embed.append(doc)
+    deleted_ids = sorted(set(previous) - set(current))
+    return IndexPlan(to_embed, changed_ids, deleted_ids, unchanged, current, full_rebuild)
+
+
+def _print_plan(plan: IndexPlan, verbose: bool) -> None:
+    new_count = len(plan.to_embed) - len(plan.changed_ids)
+    if plan.full_rebuild:
+        print("\nManifest bulunamadı veya embedding modeli değişti: index sıfırdan oluşturulacak.")
+    print(f"\nDeğişmeyen: {plan.unchanged} | Yeni: {new_count} | Değişen: {len(plan.changed_ids)} | Silinen: {len(plan.deleted_ids)}")
+    if verbose:
+        changed = set(plan.changed_ids)
+        for doc in plan.to_embed:
+            print(f"  {'~' if doc.id in changed else '+'} {doc.id}")
+        for chunk_id in plan.deleted_ids:
+            print(f"  - {chunk_id}")
+
+
+def _swap_in(tmp_path: Path, db_path: Path) -> None:
+    """
+    Geçici klasörde hazırlanan index'i yerine koyar. Dolu bir klasörün üzerine
+    tek adımda rename yapılamadığı için eski klasör önce kenara alınır; aradaki
+    kısa anda çalışan sunucular (VectorStoreManager) eldeki index'i kullanmaya devam eder.
+    """
+    old_path = db_path.with_name(db_path.name + ".old")
+    if old_path.exists():
+        shutil.rmtree(old_path)
+    if db_path.exists():
+        os.replace(db_path, old_path)
+    os.replace(tmp_path, db_path)
+    if old_path.exists():
+        shutil.rmtree(old_path)
+
+
+def _previous_vectors(db_path: Path, plan: IndexPlan) -> Dict[str, Any]:
+    """Değişmeyen parçaların vektörlerini mevcut (yerel biçimdeki) index'ten okur."""
+    if plan.full_rebuild or not plan.unchanged:
+        return {}
+    previous = NativeVectorStore(str(db_path), embeddings=None)
+    positions = previous.id_positions()
+    changed = {doc.id for doc in plan.to_embed}
+    return {chunk_id: previous.vector_at(position) for chunk_id, position in positions.items()
+            if chunk_id in plan.chunks and chunk_id not in changed}
+
+
+def build_vector_db(dry_run: bool = False, full: bool = False) -> Optional[IndexPlan]:
+    """
+    data/ klasöründeki mevzuat metinlerini parçalara ayırarak vektör
+    veritabanını artımlı olarak günceller: sadece yeni ve değişen parçalar
+    embed edilir, değişmeyenlerin vektörleri mevcut index'ten kopyalanır,
+    silinen parçalar yeni index'e alınmaz. Index yerel biçimde (bkz.
+    graph/native_index.py) geçici bir klasöre yazılıp tek hamlede yerine
+    konur; yarım yazılmış index görülmez.
+    """
+    print("\n--- Vektör Veritabanı Oluşturma (yerel biçim, artımlı) ---")
+    db_path = Path(DB_PATH)
+    embeddings = get_embeddings()
+    # Eski FAISS (pickle) biçimindeki index'ten vektör okunmaz; yerel biçime geçişte
+    # tüm parçalar yeniden embed edilir (embedding önbelleği sayesinde ağa gitmeden).
+    manifest = None if full or not is_native_index(DB_PATH) else load_manifest(DB_PATH)
+
+    print("\n🔎 Metinler parçalanıyor ve mevcut index ile karşılaştırılıyor...")
+    chunks = list(iter_corpus_chunks(DATA_PATH))
+    plan = plan_update(chunks, manifest, embeddings.model_name)
+    _print_plan(plan, verbose=dry_run)
+
+    if dry_run:
+        print(f"\n(--dry-run) {len(plan.to_embed)} parça embed edilecekti; hiçbir değişiklik yapılmadı.")
+        return plan
+    if not plan.chunks:
         print("\n❌ İşlenecek doküman bulunamadı. Lütfen JSON yapısını kontrol edin.")
-        return
+        return plan
+    if not plan.full_rebuild and not plan.to_embed and not plan.deleted_ids:
+        print(f"\n✅ Index güncel: '{DB_PATH}'")
+        return plan
+
+    vectors = _previous_vectors(db_path, plan)
+    # Manifest'te olup index'te bulunamayan parçalar da (tutarsız bir index) yeniden embed edilir.
+    to_embed = [doc for doc in chunks if doc.id not in vectors]
+    print(f"\n🧠 {len(to_embed)} parça vektörlere dönüştürülüyor...")
+    # Önbellekli embedding modeli sayesinde daha önce embed edilmiş metinler ağa gitmez.
+    for batch in batched(to_embed, EMBED_BATCH_SIZE):
+        new_vectors = embeddings.embed_documents([doc.page_content for doc in batch])
+        vectors.update((doc.id, vector) for doc, vector in zip(batch, new_vectors))
+    print(f"   Embedding önbelleği: {embeddings.cache.stats()}")
+
+    tmp_path = db_path.with_name(db_path.name + ".tmp")
+    if tmp_path.exists():
+        shutil.rmtree(tmp_path)
+    write_native_index(str(tmp_path), chunks, (vectors[doc.id] for doc in chunks), embeddings.model_name)
+    with open(tmp_path / MANIFEST_FILE, "w", encoding="utf-8") as f:
+        json.dump({"format": MANIFEST_FORMAT, "embedding_model": embeddings.model_name, "chunks": plan.chunks}, f)
+    _swap_in(tmp_path, db_path)
+
+    print(f"\n✨ Vektör veritabanı güncellendi: '{DB_PATH}' ({len(plan.chunks)} parça)")
+    return plan
 
-    print(f"\nToplam {len(documents)} adet bütüncül doküman (madde/ek) yüklendi.")
-    
-    print("\n🧠 Metinler vektörlere dönüştürülüyor ve FAISS indexi oluşturuluyor...")
-    embeddings = OpenAIEmbeddings()
-    vector_db = FAISS.from_documents(documents, embeddings)
-    
-    vector_db.save_local(DB_PATH)
-    print(f"\n✨ FAISS veritabanı başarıyla oluşturuldu: '{DB_PATH}'")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mevzuat vektör veritabanını artımlı olarak oluşturur/günceller.")
+    parser.add_argument("--dry-run", action="store_true", help="Sadece hangi parçaların yeniden embed edileceğini raporla.")
+    parser.add_argument("--full", action="store_true", help="Manifest'i yok sayarak index'i sıfırdan oluştur.")
+    args = parser.parse_args()
+
     load_dotenv()
     if not os.getenv("OPENAI_API_KEY"):
         raise ValueError("Lütfen projenin kök dizininde OPENAI_API_KEY'i içeren bir .env dosyası oluşturun.")
-    build_vector_db()
\ No newline at end of file
+    build_vector_db(dry_run=args.dry_run, full=args.full)